@@ -1,56 +1,22 @@
-import os
 import re
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+import sys
 from openai import OpenAI  # OpenAI GPT API import
 from settings import OPENAI_API_KEY  # Importiere den OpenAI API Key
+from date_parser import convert_dates
+from caselist_parser import iter_caselist_rows, add_child_cases_column, DEFAULT_BACKEND
+from caselist_store import write_snapshot, C2_SNAPSHOT_DIRECTORY
+from caselist_delta import (
+    load_state, save_state, conditional_get, remember_validators, content_hash, changed_rows, write_delta
+)
 
 # OpenAI Client konfigurieren
 client = OpenAI(api_key=OPENAI_API_KEY)
 
-# Funktion, um GPT-4o-mini zur Datumsumwandlung zu verwenden
-def ask_gpt_for_date(date_str):
-    prompt = f"Please convert the following date to the format YYYY-MM-DD: {date_str}"
-    
-    try:
-        # OpenAI API-Aufruf mit GPT-4o-mini
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # GPT-4o-mini verwenden
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        
-        # Extrahiere die Antwort aus der API
-        if response.choices:
-            answer = response.choices[0].message.content.strip()
-            # Suche nach einem Datum im Format YYYY-MM-DD
-            match = re.search(r"\b\d{4}-\d{2}-\d{2}\b", answer)
-            if match:
-                found_date = match.group(0)
-                print(f"Found date: {found_date}")  # Ausgabe des gefundenen Datums
-                return found_date  # Rückgabe des gefundenen Datums
-        return ""  # Rückgabe eines leeren Wertes, wenn kein Datum gefunden wurde
-    except Exception as e:
-        print(f"Error calling GPT-4 API: {e}")
-        return ""
-
 # Funktion zur Bereinigung des Urteiltitels
 def clean_judgment_title(title):
     return re.sub(r"\((C-|T-)\d+.*", "", title).strip()
 
-# Funktion zur Umwandlung des Datumsformats in YYYY-MM-DD
-def convert_date_format(date_str):
-    try:
-        date_str = str(date_str)
-        return datetime.strptime(date_str, "%d %B %Y").strftime("%Y-%m-%d")
-    except ValueError:
-        print(f"Date parsing failed for {date_str}, asking GPT-4 for help.")
-        return ask_gpt_for_date(date_str)
-
 # Funktion zum Extrahieren der URL aus einem javascript:window.open(...) Link
 def extract_url_from_javascript(js_link):
     match = re.search(r"window\.open\('([^']+)'", js_link)
@@ -59,13 +25,24 @@ def extract_url_from_javascript(js_link):
     return js_link
 
 # Hauptfunktion zum Laden von HTML von einer URL und Erstellen der CSV-Datei
-def parse_html_to_csv_from_url(url):
-    response = requests.get(url)
+def parse_html_to_csv_from_url(url, parser_backend=DEFAULT_BACKEND):
+    # Bedingter Abruf: bei 304 oder identischem Inhalt wird der Lauf komplett übersprungen
+    state = load_state()
+    response = conditional_get(url, state)
+    if response.status_code == 304:
+        print("Caselist unchanged since last run (304 Not Modified). Nothing to do.")
+        return
     if response.status_code != 200:
         print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
         return
 
-    soup = BeautifulSoup(response.content, "html.parser")
+    page_hash = content_hash(response.content)
+    remember_validators(state, response)
+    if page_hash == state.get("content_hash"):
+        print("Caselist content identical to last run. Nothing to do.")
+        save_state(state)
+        return
+
     case_numbers = []
     judgment_dates = []
     judgment_titles = []
@@ -75,20 +52,15 @@ def parse_html_to_csv_from_url(url):
 
     see_case_pattern = re.compile(r"see Case (C-|T-)\d+/\d+(?: [A-Z])?")
 
-    rows = soup.find_all("tr")
-
-    for row in rows:
-        columns = row.find_all("td")
-
+    # Nur die <tr>-Zeilen werden materialisiert (Backend über parser_backend wählbar)
+    for columns in iter_caselist_rows(response.content, parser_backend, response.encoding):
         if len(columns) < 2:
             continue
 
-        case_number = columns[0].get_text(strip=True)
+        case_number = columns[0].stripped_text
 
-        links = columns[0].find_all("a")
         href_list = []
-        for link in links:
-            href = link.get("href")
+        for href, _ in columns[0].links:
             if href:
                 clean_href = extract_url_from_javascript(href)
                 href_list.append(clean_href)
@@ -110,7 +82,6 @@ def parse_html_to_csv_from_url(url):
 
             if "Judgment of" in split_info[0]:
                 judgment_date = split_info[0].split(",")[0].replace("Judgment of", "").strip()
-                judgment_date = convert_date_format(judgment_date)
 
         cleaned_judgment_title = clean_judgment_title(judgment_title)
 
@@ -119,9 +90,9 @@ def parse_html_to_csv_from_url(url):
             root_case = match.group().split("see Case ")[1]
             child_case_root.append(root_case)
         else:
-            ref_links = columns[1].find_all("a")
+            ref_links = columns[1].links
             if ref_links:
-                href_text = ref_links[-1].get_text(strip=True)
+                href_text = ref_links[-1][1]
                 if see_case_pattern.match("see Case " + href_text):
                     child_case_root.append(href_text)
                 else:
@@ -135,6 +106,10 @@ def parse_html_to_csv_from_url(url):
         ecli_ids.append(ecli)
         judgment_links.append(case_link)
 
+    # Wandle alle Datumsangaben gesammelt um (lokal, nur die Reste in einer GPT-Anfrage)
+    converted_dates = convert_dates(judgment_dates, client)
+    judgment_dates = [converted_dates[d] for d in judgment_dates]
+
     # Erstelle ein DataFrame mit bereinigten Daten
     df = pd.DataFrame({
         "Aktenzeichen": case_numbers,
@@ -145,40 +120,27 @@ def parse_html_to_csv_from_url(url):
         "Referenziertes Root Case": child_case_root
     })
 
-    # Erstelle eine Spalte für Child-Cases durch Mapping von Wurzelfällen zu ihren Unterfällen
-    root_to_child_cases = {}
-
-    # Erster Durchgang: Erstelle ein Dictionary, wo Wurzelfälle auf ihre Unterfälle abgebildet werden
-    for idx, row in df.iterrows():
-        if row["Referenziertes Root Case"]:
-            root_case = row["Referenziertes Root Case"]
-            child_case = row["Aktenzeichen"]
-            if root_case not in root_to_child_cases:
-                root_to_child_cases[root_case] = []
-            root_to_child_cases[root_case].append(child_case)
-
-    # Zweiter Durchgang: Liste alle Unterfälle für den jeweiligen Wurzelfall auf
-    child_cases_column = []
-    for idx, row in df.iterrows():
-        root_case = row["Aktenzeichen"]
-        if root_case in root_to_child_cases:
-            child_cases_column.append(", ".join(root_to_child_cases[root_case]))
-        else:
-            child_cases_column.append("")
-
-    # Füge die Unterfälle als neue Spalte hinzu
-    df["Child-Cases"] = child_cases_column
+    # Erstelle die Spalte "Child-Cases" durch Mapping von Wurzelfällen zu ihren Unterfällen (vektorisiert)
+    add_child_cases_column(df, "Aktenzeichen")
 
-    # Stelle sicher, dass der Ordner "caselist_csv" existiert
-    os.makedirs("caselist_csv", exist_ok=True)
+    # Speichere den Scrape als typisierten Parquet-Snapshot (Manifest und Aufbewahrung übernimmt der Store)
+    write_snapshot(C2_SNAPSHOT_DIRECTORY, df, date_columns=["Datum des Urteils"])
 
-    # Generiere den Dateinamen mit dem aktuellen Datum
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    output_csv_file = f"caselist_csv/{current_date}_ecj-caselist.csv"
+    # Nur neue oder geänderte Zeilen als Delta für den Import speichern
+    delta_df, hashes = changed_rows(df, state.get("row_hashes"))
+    if delta_df.empty:
+        # Seite geändert, aber keine Zeile neu oder geändert (z. B. nur Layout): keine leere Delta-Datei anlegen
+        print("No new or changed rows. No delta written.")
+    else:
+        delta_file = write_delta(delta_df)
+        print(f"Delta with {len(delta_df)} new or changed row(s) saved to: {delta_file}")
 
-    # Speichere die Daten in eine CSV-Datei (überschreiben, falls bereits vorhanden)
-    df.to_csv(output_csv_file, index=False)
-    print(f"CSV file saved to: {output_csv_file}")
+    # Zustand erst nach erfolgreichem Schreiben aktualisieren
+    state["content_hash"] = page_hash
+    state["row_hashes"] = hashes
+    save_state(state)
 
 url = "https://curia.europa.eu/en/content/juris/c2_juris.htm"
-parse_html_to_csv_from_url(url)
+# Optional: Parser als erstes Argument wählen ("lxml", "strainer" oder "html.parser")
+parser_backend = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BACKEND
+parse_html_to_csv_from_url(url, parser_backend)
@@ -1,38 +1,13 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+import sys
 from settings import get_mysql_connection
+from caselist_parser import build_case_families, case_no_with_children
+from caselist_store import read_snapshot, C1_SNAPSHOT_DIRECTORY
+from case_numbers import ensure_case_number_table, sync_case_numbers
+from presence_index import PresenceIndex
+from ecli_resolver import resolve_eclis
 import re
 
-# Funktion, um die ECLI aus dem HTML zu extrahieren
-def fetch_ecli_from_url(url):
-    try:
-        response = requests.get(url, allow_redirects=True, timeout=10)
-        if response.status_code != 200:
-            print(f"Fehler beim Abrufen der Seite {url}. Statuscode: {response.status_code}")
-            return None
-
-        if response.history:
-            print(f"Redirects: {[r.url for r in response.history]}")
-        print(f"Endgültige URL: {response.url}")
-
-        soup = BeautifulSoup(response.content, "html.parser")
-        ecli_paragraph = soup.find("p", string=lambda s: s and "ECLI identifier: " in s)
-        if ecli_paragraph:
-            ecli_text = ecli_paragraph.string
-            ecli = ecli_text.replace("ECLI identifier: ", "").strip()
-            print(f"ECLI abgerufen: {ecli}")
-            return ecli
-        else:
-            print(f"ECLI nicht gefunden auf Seite: {url}")
-            return None
-    except requests.exceptions.RequestException as e:
-        print(f"HTTP-Fehler beim Abrufen der URL {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Allgemeiner Fehler beim Abrufen der ECLI von {url}: {e}")
-        return None
-
 # Funktion zur Erstellung des docid
 def generate_docid(ecli):
     ecli_numbers = re.sub(r'\D', '', ecli)
@@ -54,70 +29,80 @@ def insert_new_record(cursor, docid, case_no, ecli, date_decided, caselist_url):
         VALUES (%s, %s, %s, %s, %s, NOW())
     """
     cursor.execute(insert_query, (docid, case_no, ecli, date_decided, caselist_url))
+    sync_case_numbers(cursor, [(cursor.lastrowid, case_no)])
+    return cursor.lastrowid
 
 # Funktion zur Verarbeitung der CSV-Datei und zum Hinzufügen neuer Einträge in die Datenbank
-def process_csv_and_add_to_db(csv_file):
-    # CSV laden
-    df = pd.read_csv(csv_file)
+def process_csv_and_add_to_db(csv_file=None):
+    # Neuesten Snapshot laden (oder eine explizit angegebene CSV-Datei)
+    df = pd.read_csv(csv_file) if csv_file else read_snapshot(C1_SNAPSHOT_DIRECTORY)
+    if df is None:
+        print(f"Kein Snapshot in {C1_SNAPSHOT_DIRECTORY} gefunden.")
+        return
+
+    # Zuordnung Wurzelfall -> Unterfälle vor dem Filtern bilden
+    case_families = build_case_families(df, 'Case Number')
 
     # Filter: Zeilen ohne 'Case Link' ignorieren und nur Fälle ohne 'Referenziertes Root Case'
-    df = df[df['Case Link'].notna() & df['Referenziertes Root Case'].isna()]
+    df = df[df['Case Link'].notna() & (df['Referenziertes Root Case'].fillna("") == "")]
 
     # Verbindung zur MySQL-Datenbank herstellen
     conn = get_mysql_connection()
+    ensure_case_number_table(conn)
+
+    # Alle vorhandenen Urteile einmal laden; Existenzprüfungen laufen danach lokal
+    presence_index = PresenceIndex.load(conn)
+    presence_index.report()
+
+    # Erster Durchgang: alle fehlenden Fälle sammeln
+    missing_cases = []
+    pending_case_numbers = set()
+    for _, row in df.iterrows():
+        case_no = row['Case Number']
+        date_decided = row['Judgment Date']
+        caselist_url = row['Case Link']
+
+        # Sicherstellen, dass Judgment Date validiert wird
+        if pd.isna(date_decided) or str(date_decided).strip() in ("", "nan"):
+            print(f"Ungültiges Datum für Fall {case_no}. Überspringe...")
+            continue
+
+        # Überprüfen, ob Fall bereits in der Datenbank existiert (oder in diesem Lauf schon vorgemerkt ist)
+        if presence_index.exists(f"C-{case_no}") or case_no in pending_case_numbers:
+            print(f"Fall {case_no} bereits in der Datenbank vorhanden. Überspringe...")
+            continue
+        pending_case_numbers.add(case_no)
+        missing_cases.append((case_no, str(date_decided).strip(), caselist_url.strip()))
+
+    # ECLIs aller fehlenden Fälle gleichzeitig abrufen (Ergebnisse in Eingabereihenfolge)
+    eclis = resolve_eclis([caselist_url for _, _, caselist_url in missing_cases])
+
+    # Zweiter Durchgang: alle neuen Einträge in einem Batch einfügen
     with conn.cursor() as cursor:
-        for _, row in df.iterrows():
-            case_no = row['Case Number']
-            date_decided = row['Judgment Date']
-            caselist_url = row['Case Link']
-            child_cases = row['Child-Cases']
-
-            # Sicherstellen, dass Judgment Date validiert wird
-            if pd.isna(date_decided) or date_decided.strip() == "" or date_decided == "nan":
-                print(f"Ungültiges Datum für Fall {case_no}. Überspringe...")
+        for (case_no, date_decided, caselist_url), ecli in zip(missing_cases, eclis):
+            if not ecli:
+                print(f"ECLI konnte für {case_no} nicht abgerufen werden. Überspringe...")
                 continue
 
-            # Überprüfen, ob Fall bereits in der Datenbank existiert
-            search_query = "SELECT COUNT(*) FROM Judgments WHERE case_no LIKE %s"
-            cursor.execute(search_query, (f"%{case_no}%",))
-            result = cursor.fetchone()
-
-            if result[0] == 0:
-                # ECLI abrufen
-                ecli = fetch_ecli_from_url(caselist_url)
-                if not ecli:
-                    print(f"ECLI konnte für {case_no} nicht abgerufen werden. Überspringe...")
-                    continue
-
-                # docid generieren
-                docid = generate_docid(ecli)
-
-                # Fallnummer mit Child-Cases erstellen
-                if pd.notna(child_cases) and child_cases:
-                    case_no_with_children = f"{case_no}, {child_cases}"
-                else:
-                    case_no_with_children = case_no
-
-                # "C-" vor alle Aktenzeichen setzen
-                case_no_with_children = add_c_prefix(case_no_with_children)
+            # docid generieren
+            docid = generate_docid(ecli)
 
-                # Sicherstellen, dass alle Felder korrekt typisiert sind
-                date_decided = str(date_decided).strip()
-                caselist_url = caselist_url.strip()
+            # Fallnummer mit Child-Cases erstellen und "C-" vor alle Aktenzeichen setzen
+            full_case_no = add_c_prefix(case_no_with_children(case_no, case_families))
 
-                # Neuen Eintrag einfügen
-                print(f"Einfügen: {docid}, {case_no_with_children}, {ecli}, {date_decided}, {caselist_url}")
-                insert_new_record(cursor, docid, case_no_with_children, ecli, date_decided, caselist_url)
+            # Neuen Eintrag einfügen
+            print(f"Einfügen: {docid}, {full_case_no}, {ecli}, {date_decided}, {caselist_url}")
+            judgment_id = insert_new_record(cursor, docid, full_case_no, ecli, date_decided, caselist_url)
+            presence_index.upsert(judgment_id, full_case_no, ecli, docid, date_decided, caselist_url)
 
-                # Änderungen direkt in der Datenbank speichern
-                conn.commit()
-            else:
-                print(f"Fall {case_no} bereits in der Datenbank vorhanden. Überspringe...")
+        # Änderungen gesammelt in der Datenbank speichern
+        conn.commit()
 
     conn.close()
 
 # Hauptprogramm
 if __name__ == "__main__":
-    csv_file_path = "caselist_csv_c1/2024-11-28_c1_cases.csv"  # Pfad zur CSV-Datei
-    print(f"Verarbeite CSV-Datei: {csv_file_path}")
+    # Optional: Pfad zu einer älteren CSV-Datei, sonst wird der neueste Snapshot verwendet
+    csv_file_path = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"Verarbeite: {csv_file_path or 'neuester Snapshot'}")
     process_csv_and_add_to_db(csv_file_path)
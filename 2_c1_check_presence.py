@@ -1,46 +1,17 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+import sys
 from settings import get_mysql_connection
-
-# Funktion, um die ECLI aus dem HTML zu extrahieren
-def fetch_ecli_from_url(url):
-    try:
-        # HTTP-Anfrage mit Unterstützung für Redirects
-        response = requests.get(url, allow_redirects=True, timeout=10)
-        if response.status_code != 200:
-            print(f"Fehler beim Abrufen der Seite {url}. Statuscode: {response.status_code}")
-            return None
-        
-        # Umleiten-URL ausgeben (falls Redirect erfolgt)
-        if response.history:
-            print(f"Redirects: {[r.url for r in response.history]}")
-        print(f"Endgültige URL: {response.url}")
-
-        # BeautifulSoup zur HTML-Verarbeitung
-        soup = BeautifulSoup(response.content, "html.parser")
-        ecli_paragraph = soup.find("p", string=lambda s: s and "ECLI identifier: " in s)
-        
-        if ecli_paragraph:
-            ecli_text = ecli_paragraph.string
-            ecli = ecli_text.replace("ECLI identifier: ", "").strip()
-            print(f"ECLI abgerufen: {ecli}")
-            return ecli
-        else:
-            print(f"ECLI nicht gefunden auf Seite: {url}")
-            return None
-    except requests.exceptions.RequestException as e:
-        print(f"HTTP-Fehler beim Abrufen der URL {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Allgemeiner Fehler beim Abrufen der ECLI von {url}: {e}")
-        return None
-
+from caselist_store import read_snapshot, C1_SNAPSHOT_DIRECTORY
+from presence_index import PresenceIndex
+from ecli_resolver import resolve_eclis
 
 # Funktion zur Überprüfung und Ergänzung der ECLI
-def check_cases_and_fetch_ecli(csv_file):
-    # CSV-Datei laden
-    df = pd.read_csv(csv_file)
+def check_cases_and_fetch_ecli(csv_file=None):
+    # Neuesten Snapshot laden (oder eine explizit angegebene CSV-Datei)
+    df = pd.read_csv(csv_file) if csv_file else read_snapshot(C1_SNAPSHOT_DIRECTORY)
+    if df is None:
+        print(f"Kein Snapshot in {C1_SNAPSHOT_DIRECTORY} gefunden.")
+        return
     
     # Filtere nur Fälle mit gesetztem Datum
     df = df[df["Judgment Date"].notna()]
@@ -48,42 +19,38 @@ def check_cases_and_fetch_ecli(csv_file):
     # Neue Spalte für ECLI initialisieren
     df["ECLI"] = None
 
-    # Verbindung zur Datenbank herstellen
+    # Verbindung zur Datenbank herstellen und alle vorhandenen Urteile einmal laden;
+    # Existenzprüfungen laufen danach lokal, die Verbindung wird nicht mehr gebraucht
     conn = get_mysql_connection()
-    not_found_cases = []
-
     try:
-        with conn.cursor() as cursor:
-            for idx, row in df.iterrows():
-                case_no = row["Case Number"]
-                case_link = row["Case Link"]
-
-                # Überprüfe, ob der Fall in der Datenbank existiert
-                query = """
-                    SELECT COUNT(*)
-                    FROM Judgments
-                    WHERE case_no LIKE %s
-                """
-                cursor.execute(query, (f"%{case_no}%",))
-                result = cursor.fetchone()
-
-                # Falls der Fall nicht gefunden wurde, füge ihn der Liste hinzu
-                if result[0] == 0:
-                    ecli = None
-                    if case_link and case_link != "None":
-                        ecli = fetch_ecli_from_url(case_link)
-
-                    not_found_cases.append({
-                        "Case Number": case_no,
-                        "Judgment Date": row["Judgment Date"],
-                        "Judgment Title": row["Judgment Title"],
-                        "Case Link": case_link,
-                        "ECLI": ecli
-                    })
+        presence_index = PresenceIndex.load(conn)
     except Exception as e:
         print(f"Fehler bei der Datenbankabfrage: {e}")
+        return
     finally:
         conn.close()
+    presence_index.report()
+
+    not_found_cases = []
+    for idx, row in df.iterrows():
+        case_no = row["Case Number"]
+        case_link = row["Case Link"]
+
+        # Überprüfe, ob der Fall in der Datenbank existiert
+        # Falls der Fall nicht gefunden wurde, füge ihn der Liste hinzu
+        if not presence_index.exists(f"C-{case_no}"):
+            not_found_cases.append({
+                "Case Number": case_no,
+                "Judgment Date": row["Judgment Date"],
+                "Judgment Title": row["Judgment Title"],
+                "Case Link": case_link,
+                "ECLI": None
+            })
+
+    # ECLIs aller nicht gefundenen Fälle gleichzeitig abrufen (Ergebnisse in Eingabereihenfolge)
+    eclis = resolve_eclis([case["Case Link"] for case in not_found_cases])
+    for case, ecli in zip(not_found_cases, eclis):
+        case["ECLI"] = ecli
 
     # Ergebnisse als DataFrame speichern
     not_found_df = pd.DataFrame(not_found_cases)
@@ -95,5 +62,6 @@ def check_cases_and_fetch_ecli(csv_file):
 
 # Hauptprogramm
 if __name__ == "__main__":
-    csv_file_path = "caselist_csv_c1/2024-11-28_c1_cases.csv"  # Pfad zur CSV-Datei
+    # Optional: Pfad zu einer älteren CSV-Datei, sonst wird der neueste Snapshot verwendet
+    csv_file_path = sys.argv[1] if len(sys.argv) > 1 else None
     check_cases_and_fetch_ecli(csv_file_path)
@@ -1,6 +1,12 @@
 import os
+import sys
 import pandas as pd
 from settings import get_mysql_connection
+from caselist_parser import build_case_families, case_no_with_children
+from caselist_delta import get_pending_deltas, mark_delta_imported
+from caselist_store import read_snapshot, C2_SNAPSHOT_DIRECTORY
+from case_numbers import ensure_case_number_table, normalize_case_no, sync_case_numbers
+from presence_index import PresenceIndex
 import re
 from datetime import datetime
 
@@ -24,9 +30,11 @@ def insert_new_record(cursor, docid, case_no, ecli, date_decided, caselist_url):
         VALUES (%s, %s, %s, %s, %s, NOW())
     """
     cursor.execute(insert_query, (docid, case_no, ecli, date_decided, caselist_url))
+    sync_case_numbers(cursor, [(cursor.lastrowid, case_no)])
+    return cursor.lastrowid
 
 # Update an existing record in the MySQL database if necessary and log the changes
-def update_existing_record(cursor, db_case_no, db_ecli, db_date_decided, db_caselist_url, case_no_with_children, ecli, date_decided, caselist_url):
+def update_existing_record(cursor, judgment_id, db_case_no, db_ecli, db_date_decided, db_caselist_url, case_no_with_children, ecli, date_decided, caselist_url):
     updates = []
     values = []
     changes_log = []
@@ -57,22 +65,171 @@ def update_existing_record(cursor, db_case_no, db_ecli, db_date_decided, db_case
 
     # If there are updates to make, execute the query and log changes
     if updates:
-        update_query = "UPDATE Judgments SET " + ", ".join(updates) + " WHERE case_no = %s"
-        values.append(db_case_no)  # Append the original case_no to use in the WHERE clause
+        update_query = "UPDATE Judgments SET " + ", ".join(updates) + " WHERE id = %s"
+        values.append(judgment_id)
         cursor.execute(update_query, tuple(values))
+        if db_case_no != case_no_with_children:
+            sync_case_numbers(cursor, [(judgment_id, case_no_with_children)])
         print(f"Updated record for case_no: {db_case_no}")
         for change in changes_log:
             print(f" - {change}")
 
-def process_csv_and_import_to_mysql(csv_file):
+    # Return the values the record holds now
+    return (
+        case_no_with_children,
+        db_ecli if db_ecli or not ecli else ecli,
+        db_date_decided if db_date_decided or not date_decided else date_decided,
+        db_caselist_url if db_caselist_url or not caselist_url else caselist_url,
+    )
+
+# Load the latest caselist snapshot (typed Parquet); falls back to the newest legacy CSV
+def load_latest_caselist(directory):
+    df = read_snapshot(C2_SNAPSHOT_DIRECTORY)
+    if df is not None:
+        print(f"Loaded latest caselist snapshot from: {C2_SNAPSHOT_DIRECTORY}")
+        return df
+    latest_csv = get_latest_csv(directory)
+    if latest_csv:
+        print(f"No snapshot found, loading latest CSV: {latest_csv}")
+        return pd.read_csv(latest_csv)
+    return None
+
+# Staging table for the bulk mode; one row per caselist entry
+CREATE_STAGING_TABLE = """
+    CREATE TEMPORARY TABLE caselist_staging (
+        row_no INT PRIMARY KEY,
+        case_no VARCHAR(255) NOT NULL,
+        case_no_full TEXT NOT NULL,
+        ecli VARCHAR(255),
+        date_decided DATE,
+        caselist_url TEXT,
+        docid VARCHAR(255),
+        judgment_id BIGINT NULL,
+        KEY (case_no)
+    )
+"""
+
+# Convert missing values (NaN/NaT) to None so they end up as NULL in MySQL
+def _none_if_missing(value):
+    return None if pd.isna(value) else value
+
+# Bulk mode: load the whole caselist into a staging table and reconcile it with a few set-based statements
+def bulk_import_caselist(cursor, df, case_families):
+    staging_rows = []
+    seen_case_numbers = set()
+    for case_no, ecli, date_decided, caselist_url in df[
+        ['Aktenzeichen', 'ECLI', 'Datum des Urteils', 'Website des Urteils']
+    ].itertuples(index=False):
+        # Only the first row per case number, as the row-by-row import would update the just inserted record
+        if case_no in seen_case_numbers:
+            continue
+        seen_case_numbers.add(case_no)
+        ecli = _none_if_missing(ecli)
+        staging_rows.append((
+            len(staging_rows), normalize_case_no(case_no), case_no_with_children(case_no, case_families), ecli,
+            _none_if_missing(date_decided), _none_if_missing(caselist_url),
+            generate_docid(ecli) if ecli else None,
+        ))
+
+    cursor.execute("DROP TEMPORARY TABLE IF EXISTS caselist_staging")
+    cursor.execute(CREATE_STAGING_TABLE)
+    cursor.executemany(
+        "INSERT INTO caselist_staging (row_no, case_no, case_no_full, ecli, date_decided, caselist_url, docid) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+        staging_rows,
+    )
+    print(f"Loaded {len(staging_rows)} rows into the staging table.")
+
+    # Resolve the existing record for every staged case (record whose case_no starts with the case number)
+    cursor.execute("""
+        UPDATE caselist_staging s
+        SET s.judgment_id = (
+            SELECT MIN(n.judgment_id) FROM judgment_case_numbers n
+            WHERE n.case_no_normalized = s.case_no AND n.position = 0
+        )
+    """)
+
+    # Change log from the staging diff, computed before the update
+    cursor.execute("""
+        SELECT j.case_no, j.ecli, j.date_decided, j.caselist_url, s.case_no_full, s.ecli, s.date_decided, s.caselist_url
+        FROM caselist_staging s
+        JOIN Judgments j ON j.id = s.judgment_id
+        WHERE NOT (j.case_no <=> s.case_no_full)
+           OR ((j.ecli IS NULL OR j.ecli = '') AND s.ecli <> '')
+           OR (j.date_decided IS NULL AND s.date_decided IS NOT NULL)
+           OR ((j.caselist_url IS NULL OR j.caselist_url = '') AND s.caselist_url <> '')
+    """)
+    for db_case_no, db_ecli, db_date_decided, db_caselist_url, case_no, ecli, date_decided, caselist_url in cursor.fetchall():
+        print(f"Updated record for case_no: {db_case_no}")
+        if db_case_no != case_no:
+            print(f" - case_no: '{db_case_no}' -> '{case_no}'")
+        if not db_ecli and ecli:
+            print(f" - ecli: '{db_ecli}' -> '{ecli}'")
+        if not db_date_decided and date_decided:
+            print(f" - date_decided: '{db_date_decided}' -> '{date_decided}'")
+        if not db_caselist_url and caselist_url:
+            print(f" - caselist_url: '{db_caselist_url}' -> '{caselist_url}'")
+
+    # Fill empty ecli/date_decided/caselist_url and update case_no in one statement
+    cursor.execute("""
+        UPDATE Judgments j
+        JOIN caselist_staging s ON s.judgment_id = j.id
+        SET j.ecli = IF((j.ecli IS NULL OR j.ecli = '') AND s.ecli <> '', s.ecli, j.ecli),
+            j.date_decided = IFNULL(j.date_decided, s.date_decided),
+            j.caselist_url = IF((j.caselist_url IS NULL OR j.caselist_url = '') AND s.caselist_url <> '', s.caselist_url, j.caselist_url),
+            j.case_no = s.case_no_full
+    """)
+    print(f"Updated {cursor.rowcount} existing record(s).")
+
+    # Insert all cases that have no record yet
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM Judgments")
+    max_id_before_insert = cursor.fetchone()[0]
+    cursor.execute("""
+        INSERT INTO Judgments (docid, case_no, ecli, date_decided, caselist_url, datetime_added)
+        SELECT docid, case_no_full, ecli, date_decided, caselist_url, NOW()
+        FROM caselist_staging
+        WHERE judgment_id IS NULL
+        ORDER BY row_no
+    """)
+    print(f"Inserted {cursor.rowcount} new record(s).")
+
+    # Keep the case number index in sync for all updated and inserted records
+    cursor.execute("""
+        SELECT j.id, j.case_no FROM Judgments j JOIN caselist_staging s ON s.judgment_id = j.id
+        UNION
+        SELECT id, case_no FROM Judgments WHERE id > %s
+    """, (max_id_before_insert,))
+    sync_case_numbers(cursor, cursor.fetchall())
+
+    cursor.execute("DROP TEMPORARY TABLE caselist_staging")
+
+def process_csv_and_import_to_mysql(csv_file, case_families=None, bulk=False):
     # Load the CSV file
-    df = pd.read_csv(csv_file)
+    import_caselist_to_mysql(pd.read_csv(csv_file), case_families, bulk)
+
+def import_caselist_to_mysql(df, case_families=None, bulk=False):
+    # Map root cases to their child cases before filtering (child rows usually have no date).
+    # Delta files only hold changed rows, so their caller passes the mapping of the full caselist.
+    if case_families is None:
+        case_families = build_case_families(df, 'Aktenzeichen')
 
     # Filter out rows where "Datum des Urteils" or "Website des Urteils" is empty
     df = df[df['Datum des Urteils'].notna() & df['Website des Urteils'].notna()]
 
     # Connect to the MySQL database
     conn = get_mysql_connection()
+    ensure_case_number_table(conn)
+
+    if bulk:
+        with conn.cursor() as cursor:
+            bulk_import_caselist(cursor, df, case_families)
+            conn.commit()
+        conn.close()
+        return
+
+    # Load all existing records once; presence and diff checks are answered locally, only writes hit MySQL
+    presence_index = PresenceIndex.load(conn)
+    presence_index.report()
 
     with conn.cursor() as cursor:
         for _, row in df.iterrows():
@@ -80,48 +237,65 @@ def process_csv_and_import_to_mysql(csv_file):
             ecli = row['ECLI']
             date_decided = row['Datum des Urteils']
             caselist_url = row['Website des Urteils']
-            child_cases = row['Child-Cases']
 
             # Generate the docid based on ECLI
             docid = generate_docid(ecli)
 
-            # Search for case_no in the database using LIKE %...%
-            search_query = "SELECT case_no, ecli, date_decided, caselist_url FROM Judgments WHERE case_no LIKE %s"
-            cursor.execute(search_query, (case_no + '%',))
-            result = cursor.fetchone()
+            # Find the record whose case_no starts with this case number
+            result = presence_index.find_primary(case_no)
+
+            # Case number including all child cases, e.g. "C-1/20, C-2/20"
+            full_case_no = case_no_with_children(case_no, case_families)
 
             # If case_no is not found, insert a new record
             if result is None:
-                if pd.notna(child_cases) and child_cases:
-                    case_no_with_children = f"{case_no}, {child_cases}"
-                else:
-                    case_no_with_children = case_no
-                print(f"Inserting new record: {docid}, {case_no_with_children}, {ecli}, {date_decided}, {caselist_url}")
-                insert_new_record(cursor, docid, case_no_with_children, ecli, date_decided, caselist_url)
+                print(f"Inserting new record: {docid}, {full_case_no}, {ecli}, {date_decided}, {caselist_url}")
+                judgment_id = insert_new_record(cursor, docid, full_case_no, ecli, date_decided, caselist_url)
+                presence_index.upsert(judgment_id, full_case_no, ecli, docid, date_decided, caselist_url)
             else:
                 # Existing record found, perform updates if necessary
-                db_case_no, db_ecli, db_date_decided, db_caselist_url = result
-                # Create a virtual case_no with child cases for comparison
-                if pd.notna(child_cases) and child_cases:
-                    case_no_with_children = f"{case_no}, {child_cases}"
-                else:
-                    case_no_with_children = case_no
-
-                update_existing_record(cursor, db_case_no, db_ecli, db_date_decided, db_caselist_url, case_no_with_children, ecli, date_decided, caselist_url)
+                judgment_id, db_case_no, db_ecli, db_docid, db_date_decided, db_caselist_url = result
+                new_values = update_existing_record(cursor, judgment_id, db_case_no, db_ecli, db_date_decided, db_caselist_url, full_case_no, ecli, date_decided, caselist_url)
+                presence_index.upsert(judgment_id, new_values[0], new_values[1], db_docid, new_values[2], new_values[3])
 
         # Commit the changes
         conn.commit()
 
     conn.close()
 
+# Import only the new or changed rows written by the scraper since the last import
+def import_pending_deltas(directory, bulk=False):
+    deltas = get_pending_deltas()
+    if not deltas:
+        print("No pending delta files. Nothing to import.")
+        return
+
+    caselist = load_latest_caselist(directory)
+    if caselist is None:
+        print("No full caselist found to resolve child cases for the delta files.")
+        return
+    case_families = build_case_families(caselist, 'Aktenzeichen')
+
+    for delta_csv in deltas:
+        print(f"Processing delta CSV: {delta_csv}")
+        process_csv_and_import_to_mysql(delta_csv, case_families, bulk)
+        mark_delta_imported(delta_csv)
+
 def main():
     directory = "caselist_csv"
-    latest_csv = get_latest_csv(directory)
-    if latest_csv:
-        print(f"Processing latest CSV: {latest_csv}")
-        process_csv_and_import_to_mysql(latest_csv)
+    # "--bulk" reconciles the rows via a staging table instead of one query per row
+    bulk = "--bulk" in sys.argv
+
+    # "--full" re-imports the complete latest caselist instead of the pending delta files
+    if "--full" not in sys.argv:
+        import_pending_deltas(directory, bulk)
+        return
+
+    caselist = load_latest_caselist(directory)
+    if caselist is not None:
+        import_caselist_to_mysql(caselist, bulk=bulk)
     else:
-        print("No valid CSV file to process.")
+        print("No caselist snapshot or CSV file to process.")
 
 if __name__ == "__main__":
     main()
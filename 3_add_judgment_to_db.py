@@ -1,179 +1,395 @@
+import argparse
+import hashlib
 import os
-import subprocess
-from settings import get_mysql_connection
-import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from db_pool import get_connection_pool
+from judgment_queue import (ensure_lease_columns, ensure_judgment_texts_table, worker_name, claim_judgments,
+                            pending_condition, CLAIM_BATCH_SIZE, LEASE_SECONDS, DONE_LANGUAGES_COLUMN, TEXT_DE_LANGUAGE)
+from judgment_fetcher import fetch_judgments, reconvert_page, report_table_fetch_stats, FOUND, TOO_SHORT, NO_LINK, TRANSIENT, ERROR, LANGUAGE_CODES
+from request_policy import get_request_policy
+from html_archive import latest_entries
 
 # Sicherstellen, dass der Ordner 'judgment_files' existiert
 os.makedirs('judgment_files', exist_ok=True)
 
-# Funktion zur Abfrage der Urteile mit leerem 'text_de' und gefülltem 'caselist_url', aber ohne no_valid_text_de = true
-def fetch_judgments_without_text(cursor, limit=200):
+# Urteile je Seite bei der Abfrage der offenen Urteile (Keyset-Pagination über die id)
+PAGE_SIZE = 200
+
+# Standardmäßig abgerufene Sprachen (Namen wie in LANGUAGE_CODES); German landet in text_de, alle weiteren
+# in judgment_texts
+DEFAULT_LANGUAGES = ["German"]
+
+# Funktion zur Abfrage der Urteile mit leerem 'text_de' und gefülltem 'caselist_url', aber ohne no_valid_text_de = true.
+# Mit weiteren Sprachen auch Urteile, denen eine dieser Sprachen in judgment_texts fehlt (siehe pending_condition).
+# Nur Metadaten und die bereits erledigten Sprachen, seitenweise ab after_id, damit nie der ganze Rückstand im Speicher liegt.
+def fetch_judgments_without_text(cursor, after_id=0, limit=PAGE_SIZE, language_codes=(TEXT_DE_LANGUAGE,)):
+    condition, params = pending_condition(language_codes)
+    query = f"""
+        SELECT id, caselist_url, ecli, case_no, {DONE_LANGUAGES_COLUMN}
+        FROM Judgments
+        WHERE {condition}
+          AND id > %s
+        ORDER BY id
+        LIMIT %s
+    """
+    cursor.execute(query, params + [after_id, limit])
+    return cursor.fetchall()
+
+# Urteile mit vorhandenem Text für --reconvert; statt des Texts nur dessen SHA-256 zum Vergleich
+def fetch_judgments_with_text(cursor, after_id=0, limit=PAGE_SIZE):
     query = """
-        SELECT id, caselist_url
+        SELECT id, caselist_url, ecli, SHA2(text_de, 256)
         FROM Judgments
-        WHERE text_de IS NULL
-          AND caselist_url IS NOT NULL
-          AND (no_valid_text_de IS NULL OR no_valid_text_de = FALSE)
+        WHERE text_de IS NOT NULL
+          AND id > %s
+        ORDER BY id
         LIMIT %s
     """
-    cursor.execute(query, (limit,))
+    cursor.execute(query, (after_id, limit))
     return cursor.fetchall()
 
-# Funktion zum Aktualisieren des Urteilstextes in der Datenbank
-def update_judgment_text(judgment_id, judgment_text):
-    try:
-        # Jede Aufgabe erhält ihre eigene Verbindung
-        conn = get_mysql_connection()
-        with conn.cursor() as cursor:
-            update_query = """
-                UPDATE Judgments
-                SET text_de = %s
-                WHERE id = %s
-            """
-            print(f"Versuche, Urteil mit ID {judgment_id} zu aktualisieren. Textlänge: {len(judgment_text)} Zeichen.")
-
-            # Ausgabe der ersten drei Zeilen des Textes
-            lines = judgment_text.split('\n')
-            print("Erste drei Zeilen des Textes:")
-            for i, line in enumerate(lines[:3], start=1):
-                print(f"Zeile {i}: {line}")
-
-            cursor.execute(update_query, (judgment_text, judgment_id))
-            print(f"Rows affected: {cursor.rowcount}")
-
-            # Commit der Änderung
-            conn.commit()
-            print("Änderung erfolgreich committet.\n")
-
-            # Lesen Sie den aktualisierten Text und geben Sie die ersten drei Zeilen aus
-            select_query = """
-                SELECT text_de
-                FROM Judgments
-                WHERE id = %s
-            """
-            cursor.execute(select_query, (judgment_id,))
-            result = cursor.fetchone()
-            if result and result[0]:
-                updated_text = result[0]
-                updated_lines = updated_text.split('\n')
-                print("Erste drei Zeilen des gespeicherten Textes:")
-                for i, line in enumerate(updated_lines[:3], start=1):
-                    print(f"Zeile {i}: {line}")
-            else:
-                print("Der gespeicherte Text ist leer oder nicht gefunden.")
+# Anzahl gesammelter Schreibzugriffe (Texte und Markierungen), die gemeinsam in einer Transaktion geschrieben werden
+WRITE_BATCH_SIZE = 10
 
-            print(f"Urteil mit ID {judgment_id} erfolgreich aktualisiert.\n")
-    except Exception as e:
-        print(f"Fehler beim Aktualisieren des Urteils mit ID {judgment_id}: {e}")
-    finally:
-        conn.close()
+# Sammelt Texte und "kein gültiger Text"-Markierungen und schreibt sie gebündelt über den Connection-Pool.
+# Statt den MEDIUMTEXT zurückzulesen, prüft MySQL Länge und SHA-256 des gespeicherten Texts.
+# Die Updates geben auch den Lease des Urteils frei (siehe judgment_queue).
+class JudgmentWriter:
+    def __init__(self, pool, batch_size=WRITE_BATCH_SIZE):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.texts = []
+        self.no_valid_text_ids = []
+        self.language_texts = []
 
-# Funktion zum Markieren eines Urteils als ohne gültigen Text
-def mark_as_no_valid_text(judgment_id):
-    try:
-        conn = get_mysql_connection()
-        with conn.cursor() as cursor:
-            update_query = """
-                UPDATE Judgments
-                SET no_valid_text_de = TRUE
-                WHERE id = %s
-            """
-            cursor.execute(update_query, (judgment_id,))
-            conn.commit()
-            print(f"Urteil mit ID {judgment_id} als 'no_valid_text_de = TRUE' markiert.\n")
-    except Exception as e:
-        print(f"Fehler beim Markieren von Urteil mit ID {judgment_id}: {e}")
-    finally:
-        conn.close()
+    # Funktion zum Aktualisieren des Urteilstextes in der Datenbank
+    def update_judgment_text(self, judgment_id, judgment_text):
+        print(f"Urteil mit ID {judgment_id} vorgemerkt. Textlänge: {len(judgment_text)} Zeichen.")
 
-# Funktion zum Abrufen des Urteiltexts mit 3_1_get_judgement.py
-def get_judgment_text(url, judgment_id):
-    target_language = "German"
-    try:
-        # Verwende subprocess.run für einfachere Handhabung
-        result = subprocess.run(
-            ["python3", "3_1_get_judgement.py", url, target_language],
-            stdout=subprocess.PIPE,  # Für die Markdown-Ausgabe
-            stderr=subprocess.PIPE,  # Für die Debug-Ausgaben
-            text=True                # Textmodus aktiviert
-        )
-
-        # Gib stderr direkt in die Konsole aus
-        print(result.stderr, end="")
-
-        # Überprüfe den Rückgabewert des Prozesses
-        if result.returncode != 0:
-            print(f"Fehler beim Abrufen des Texts von {url}")
-            return None
-
-        # Gib den Markdown-Inhalt zurück (stdout)
-        markdown_content = result.stdout.strip()
-
-        # Überprüfen, ob der Text mindestens 2000 Zeichen umfasst
-        if len(markdown_content) >= 2000:
-            print(f"Text von {url} erfolgreich abgerufen. Länge: {len(markdown_content)} Zeichen.")
-
-            # Falls du den Text nicht in eine Datei schreiben möchtest, kommentiere diesen Teil aus
-            # filename = os.path.join('judgment_files', f'judgment_{judgment_id}.md')
-            # with open(filename, 'w', encoding='utf-8') as f:
-            #     f.write(markdown_content)
-            # print(f"Text wurde in {filename} gespeichert.\n")
-
-            return markdown_content
-        else:
-            print(f"Der abgerufene Text von {url} ist zu kurz (weniger als 2000 Zeichen).")
-            return None
+        # Ausgabe der ersten drei Zeilen des Textes
+        lines = judgment_text.split('\n', 3)
+        print("Erste drei Zeilen des Textes:")
+        for i, line in enumerate(lines[:3], start=1):
+            print(f"Zeile {i}: {line}")
 
-    except Exception as e:
-        print(f"Ein Fehler ist aufgetreten: {e}")
-        return None
+        with self.lock:
+            self.texts.append((judgment_id, judgment_text))
+        self._flush_if_full()
 
-def process_judgment(judgment):
-    judgment_id, caselist_url = judgment
-    print(f"Verarbeite Urteil mit ID {judgment_id} und URL {caselist_url}...")
-    judgment_text = get_judgment_text(caselist_url, judgment_id)
+    # Funktion zum Markieren eines Urteils als ohne gültigen Text
+    def mark_as_no_valid_text(self, judgment_id):
+        with self.lock:
+            self.no_valid_text_ids.append(judgment_id)
+        self._flush_if_full()
 
-    if judgment_text:
-        update_judgment_text(judgment_id, judgment_text)
-    else:
-        print(f"Kein gültiger Text für Urteil mit ID {judgment_id} abgerufen. Keine Aktualisierung in der Datenbank.\n")
-        # Update der Spalte no_valid_text_de in der Datenbank
-        mark_as_no_valid_text(judgment_id)
+    # Funktion zum Vormerken des Texts einer weiteren Sprache (None = kein gültiger Text) für judgment_texts
+    def store_language_text(self, judgment_id, language_code, judgment_text):
+        if judgment_text:
+            print(f"Urteil mit ID {judgment_id} ({language_code}) vorgemerkt. Textlänge: {len(judgment_text)} Zeichen.")
+        with self.lock:
+            self.language_texts.append((judgment_id, language_code, judgment_text))
+        self._flush_if_full()
 
-def main():
-    # Verbindung zur Datenbank herstellen
-    conn = get_mysql_connection()
-    try:
+    def _flush_if_full(self):
+        with self.lock:
+            is_full = len(self.texts) + len(self.no_valid_text_ids) + len(self.language_texts) >= self.batch_size
+        if is_full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            texts, self.texts = self.texts, []
+            no_valid_text_ids, self.no_valid_text_ids = self.no_valid_text_ids, []
+            language_texts, self.language_texts = self.language_texts, []
+        if not texts and not no_valid_text_ids and not language_texts:
+            return
+
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    if texts:
+                        cursor.executemany(
+                            """
+                            UPDATE Judgments
+                            SET text_de = %s, text_lease_owner = NULL, text_lease_expires = NULL
+                            WHERE id = %s
+                            """,
+                            [(judgment_text, judgment_id) for judgment_id, judgment_text in texts],
+                        )
+                    if no_valid_text_ids:
+                        placeholders = ", ".join(["%s"] * len(no_valid_text_ids))
+                        cursor.execute(
+                            f"""
+                            UPDATE Judgments
+                            SET no_valid_text_de = TRUE, text_lease_owner = NULL, text_lease_expires = NULL
+                            WHERE id IN ({placeholders})
+                            """,
+                            no_valid_text_ids,
+                        )
+                    if language_texts:
+                        cursor.executemany(
+                            """
+                            INSERT INTO judgment_texts (judgment_id, lang, text) VALUES (%s, %s, %s)
+                            ON DUPLICATE KEY UPDATE text = VALUES(text)
+                            """,
+                            language_texts,
+                        )
+                        # Urteile, bei denen nur weitere Sprachen fehlten, werden sonst von keinem Update freigegeben
+                        language_ids = sorted({judgment_id for judgment_id, _, _ in language_texts})
+                        placeholders = ", ".join(["%s"] * len(language_ids))
+                        cursor.execute(
+                            f"""
+                            UPDATE Judgments
+                            SET text_lease_owner = NULL, text_lease_expires = NULL
+                            WHERE id IN ({placeholders})
+                            """,
+                            language_ids,
+                        )
+                conn.commit()
+                print(f"{len(texts)} Text(e), {len(no_valid_text_ids)} Markierung(en) und "
+                      f"{len(language_texts)} Text(e) weiterer Sprachen in einer Transaktion committet.")
+                for judgment_id in no_valid_text_ids:
+                    print(f"Urteil mit ID {judgment_id} als 'no_valid_text_de = TRUE' markiert.")
+                if texts:
+                    self._verify_texts(conn, texts)
+        except Exception as e:
+            failed_ids = [i for i, _ in texts] + no_valid_text_ids + [i for i, _, _ in language_texts]
+            print(f"Fehler beim Schreiben der Urteile {sorted(set(failed_ids))}: {e}")
+
+    # Vergleicht Länge und SHA-256 der gespeicherten Texte, ohne die Texte selbst zu übertragen
+    def _verify_texts(self, conn, texts):
+        placeholders = ", ".join(["%s"] * len(texts))
         with conn.cursor() as cursor:
-            # Aktuell verwendete Datenbank ausgeben
-            cursor.execute("SELECT DATABASE();")
-            result = cursor.fetchone()
-            if result:
-                current_db = result[0]
-                print(f"Aktuell verwendete Datenbank: {current_db}\n")
+            cursor.execute(
+                f"SELECT id, CHAR_LENGTH(text_de), SHA2(text_de, 256) FROM Judgments WHERE id IN ({placeholders})",
+                [judgment_id for judgment_id, _ in texts],
+            )
+            stored = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        conn.commit()
+
+        for judgment_id, judgment_text in texts:
+            expected = (len(judgment_text), hashlib.sha256(judgment_text.encode("utf-8")).hexdigest())
+            if stored.get(judgment_id) == expected:
+                print(f"Urteil mit ID {judgment_id} erfolgreich aktualisiert ({expected[0]} Zeichen, Hash geprüft).")
             else:
-                print("Keine Datenbank ausgewählt.\n")
+                print(f"Warnung: Gespeicherter Text von Urteil mit ID {judgment_id} weicht ab: {stored.get(judgment_id)} statt {expected}")
 
-            # Urteile ohne Text abrufen
-            judgments = fetch_judgments_without_text(cursor, limit=1000000)
+# Funktion zur Auswertung eines Abrufs über judgment_fetcher: Text bei Erfolg, sonst None
+def get_judgment_text(url, judgment_id, result):
+    if result.status == FOUND:
+        print(f"Text von {url} erfolgreich abgerufen. Länge: {len(result.text)} Zeichen.")
 
-            if not judgments:
-                print("Keine Urteile zum Aktualisieren gefunden.")
-                return
+        # Falls du den Text nicht in eine Datei schreiben möchtest, kommentiere diesen Teil aus
+        # filename = os.path.join('judgment_files', f'judgment_{judgment_id}.md')
+        # with open(filename, 'w', encoding='utf-8') as f:
+        #     f.write(result.text)
+        # print(f"Text wurde in {filename} gespeichert.\n")
+
+        return result.text
+    elif result.status == TOO_SHORT:
+        print(f"Der abgerufene Text von {url} ist zu kurz: {result.message}")
+    elif result.status == NO_LINK:
+        print(f"Kein Dokument für {url} gefunden: {result.message}")
+    elif result.status == TRANSIENT:
+        print(f"Vorübergehender Fehler bei {url}, Urteil wird später erneut versucht: {result.message}")
+    else:
+        print(f"Fehler beim Abrufen des Texts von {url}: {result.message}")
+    return None
+
+# Ruft alle noch fehlenden Sprachen eines Urteils in einem Durchgang ab (im selben Prozess, ohne Subprozess je Urteil)
+def process_judgment(judgment, writer, languages=DEFAULT_LANGUAGES):
+    judgment_id, caselist_url, ecli, case_no, done_languages = judgment
+    done_codes = set((done_languages or "").split(","))
+    missing_languages = [language for language in languages if LANGUAGE_CODES[language] not in done_codes]
+    print(f"Verarbeite Urteil mit ID {judgment_id} und URL {caselist_url} ({', '.join(missing_languages)})...")
+    results = fetch_judgments(caselist_url, missing_languages, ecli=ecli, case_no=case_no)
+
+    for language, result in results.items():
+        judgment_text = get_judgment_text(caselist_url, judgment_id, result)
+        language_code = LANGUAGE_CODES[language]
+        if result.status == TRANSIENT:
+            # Nichts schreiben: weder no_valid_text_de noch eine NULL-Zeile, der Lease läuft ab und
+            # ein späterer Durchgang versucht das Urteil erneut
+            continue
+        if language_code != TEXT_DE_LANGUAGE:
+            # Eine NULL-Zeile ist endgültig; ein Fehler (z. B. Exception beim Abruf) sagt nichts über den Text aus
+            if judgment_text or result.status != ERROR:
+                writer.store_language_text(judgment_id, language_code, judgment_text)
+        elif judgment_text:
+            writer.update_judgment_text(judgment_id, judgment_text)
+        else:
+            print(f"Kein gültiger Text für Urteil mit ID {judgment_id} abgerufen. Keine Aktualisierung in der Datenbank.\n")
+            # Update der Spalte no_valid_text_de in der Datenbank
+            writer.mark_as_no_valid_text(judgment_id)
+
+# Worker: beansprucht Batches offener Urteile, bis keine mehr übrig sind. Mehrere Worker (auch in anderen
+# Prozessen oder auf anderen Hosts) bekommen dank SKIP LOCKED und Lease nie dasselbe Urteil.
+# Der Lease wird erst mit dem gebündelten Schreiben des Ergebnisses freigegeben.
+def run_worker(worker_number, pool, writer, batch_size, lease_seconds, languages=DEFAULT_LANGUAGES):
+    owner = worker_name(worker_number)
+    language_codes = [LANGUAGE_CODES[language] for language in languages]
+    processed = 0
+    while True:
+        with pool.connection() as conn:
+            judgments = claim_judgments(conn, owner, batch_size, lease_seconds, language_codes)
+        if not judgments:
+            break
+        print(f"Worker {owner}: {len(judgments)} Urteil(e) beansprucht.")
+        for judgment in judgments:
+            try:
+                process_judgment(judgment, writer, languages)
+                processed += 1
+            except Exception as e:
+                # Der Lease bleibt bestehen und läuft ab, danach versucht es ein Worker erneut
+                print(f"Worker {owner}: Fehler bei Urteil mit ID {judgment[0]}: {e}")
+    print(f"Worker {owner} beendet, {processed} Urteil(e) verarbeitet.")
 
+def run_workers(pool, writer, workers, batch_size, lease_seconds, languages=DEFAULT_LANGUAGES):
+    threads = [
+        threading.Thread(target=run_worker, args=(number, pool, writer, batch_size, lease_seconds, languages),
+                         name=f"worker-{number}")
+        for number in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def run_sequential(pool, writer, languages=DEFAULT_LANGUAGES):
+    language_codes = [LANGUAGE_CODES[language] for language in languages]
+    try:
+        with pool.connection() as conn:
+            with conn.cursor() as cursor:
+                # Aktuell verwendete Datenbank ausgeben
+                cursor.execute("SELECT DATABASE();")
+                result = cursor.fetchone()
+                if result:
+                    current_db = result[0]
+                    print(f"Aktuell verwendete Datenbank: {current_db}\n")
+                else:
+                    print("Keine Datenbank ausgewählt.\n")
+            conn.commit()
     except Exception as e:
         print(f"Fehler beim Abrufen der Urteile: {e}")
         return
-    finally:
-        conn.close()
 
-    # Verarbeite die Urteile sequentiell
-    for judgment in judgments:
+    # Verarbeite die Urteile sequentiell, Seite für Seite
+    last_id = 0
+    total = 0
+    while True:
         try:
-            process_judgment(judgment)
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    judgments = fetch_judgments_without_text(cursor, after_id=last_id, language_codes=language_codes)
+                conn.commit()
         except Exception as e:
-            print(f"Ein Fehler ist aufgetreten: {e}")
+            print(f"Fehler beim Abrufen der Urteile: {e}")
+            return
+
+        if not judgments:
+            if not total:
+                print("Keine Urteile zum Aktualisieren gefunden.")
+            return
+
+        total += len(judgments)
+        last_id = judgments[-1][0]
+        for judgment in judgments:
+            try:
+                process_judgment(judgment, writer, languages)
+            except Exception as e:
+                print(f"Ein Fehler ist aufgetreten: {e}")
+
+# Erzeugt text_de aus dem HTML-Archiv neu, ohne Netzwerkzugriffe. Die Konvertierung läuft auf allen Kernen,
+# geschrieben werden nur Texte, die sich gegenüber dem gespeicherten Text geändert haben.
+def run_reconvert(pool, writer, processes):
+    archive = latest_entries("German")
+    if not archive:
+        print("Das HTML-Archiv enthält keine Seiten.")
+        return
+
+    last_id = 0
+    counts = {"changed": 0, "unchanged": 0, "missing": 0, "failed": 0}
+    with ProcessPoolExecutor(processes) as executor:
+        while True:
+            try:
+                with pool.connection() as conn:
+                    with conn.cursor() as cursor:
+                        judgments = fetch_judgments_with_text(cursor, after_id=last_id)
+                    conn.commit()
+            except Exception as e:
+                print(f"Fehler beim Abrufen der Urteile: {e}")
+                break
+            if not judgments:
+                break
+            last_id = judgments[-1][0]
+
+            jobs = []
+            for judgment_id, caselist_url, ecli, text_hash in judgments:
+                entry = archive.get(("ecli", ecli)) or archive.get(("source_url", caselist_url))
+                if entry:
+                    jobs.append((judgment_id, text_hash, entry))
+                else:
+                    counts["missing"] += 1
+
+            results = executor.map(reconvert_page, [entry for _, _, entry in jobs], chunksize=8)
+            for (judgment_id, text_hash, entry), result in zip(jobs, results):
+                if result.status != FOUND:
+                    print(f"Urteil mit ID {judgment_id} nicht neu erzeugt: {result.message}")
+                    counts["failed"] += 1
+                elif hashlib.sha256(result.text.encode("utf-8")).hexdigest() == text_hash:
+                    counts["unchanged"] += 1
+                else:
+                    writer.update_judgment_text(judgment_id, result.text)
+                    counts["changed"] += 1
+
+    print(f"Neu erzeugt: {counts['changed']} geändert, {counts['unchanged']} unverändert, "
+          f"{counts['missing']} nicht im Archiv, {counts['failed']} fehlgeschlagen.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Urteilstexte abrufen und in Judgments.text_de speichern.")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Anzahl paralleler Worker mit Lease (0 = bisheriger sequentieller Lauf)")
+    parser.add_argument("--batch-size", type=int, default=CLAIM_BATCH_SIZE,
+                        help="Urteile, die ein Worker auf einmal beansprucht")
+    parser.add_argument("--lease-seconds", type=int, default=LEASE_SECONDS,
+                        help="Gültigkeit eines Lease, danach übernimmt ein anderer Worker")
+    parser.add_argument("--reconvert", action="store_true",
+                        help="Vorhandene Texte aus dem HTML-Archiv neu erzeugen, ohne Seiten abzurufen")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(),
+                        help="Prozesse für --reconvert")
+    parser.add_argument("--languages", default=",".join(DEFAULT_LANGUAGES),
+                        help="Kommagetrennte Sprachen (z. B. German,English,French); German landet in text_de, "
+                             "alle weiteren in judgment_texts")
+    args = parser.parse_args()
+    languages = list(dict.fromkeys(language.strip() for language in args.languages.split(",") if language.strip()))
+    unknown = [language for language in languages if language not in LANGUAGE_CODES]
+    if not languages or unknown:
+        parser.error(f"Unbekannte Sprache(n): {', '.join(unknown) or '-'}; möglich sind {', '.join(LANGUAGE_CODES)}")
+
+    pool = get_connection_pool()
+    # Die gebündelten Updates setzen auch die Lease-Spalten zurück, daher werden sie in beiden Modi benötigt
+    with pool.connection() as conn:
+        ensure_lease_columns(conn)
+        # Die Abfrage der offenen Urteile liest die erledigten Sprachen auch aus judgment_texts
+        ensure_judgment_texts_table(conn)
+
+    writer = JudgmentWriter(pool)
+    try:
+        if args.reconvert:
+            run_reconvert(pool, writer, args.processes)
+        elif args.workers > 0:
+            run_workers(pool, writer, args.workers, args.batch_size, args.lease_seconds, languages)
+        else:
+            run_sequential(pool, writer, languages)
+    finally:
+        # Restliche vorgemerkte Texte und Markierungen schreiben
+        writer.flush()
+        pool.close()
 
+    report_table_fetch_stats()
+    get_request_policy().report()
     print("Alle Urteile erfolgreich verarbeitet.")
 
 if __name__ == "__main__":
@@ -66,7 +66,40 @@ def mark_judgment_processed(cursor, judgment_id):
     query = "INSERT INTO judgments_upsert (judgment_id) VALUES (%s)"
     cursor.execute(query, (judgment_id,))
 
-import re
+# Judgments fetched per page (metadata only) and maximum number of judgments per run
+PAGE_SIZE = 500
+MAX_JUDGMENTS_PER_RUN = 5000
+
+# Keyset pagination (id > last_id) over judgments that are ready to be upserted, so memory stays flat
+def iter_pending_judgments(cursor, page_size=PAGE_SIZE, max_judgments=MAX_JUDGMENTS_PER_RUN):
+    last_id = 0
+    fetched = 0
+    while fetched < max_judgments:
+        cursor.execute("""
+            SELECT j.id, j.ecli, j.case_no, j.date_decided
+            FROM Judgments j
+            LEFT JOIN judgments_upsert u ON u.judgment_id = j.id
+            WHERE j.text_summary_de IS NOT NULL
+            AND j.text_de IS NOT NULL
+            AND u.judgment_id IS NULL
+            AND j.id > %s
+            ORDER BY j.id
+            LIMIT %s
+        """, (last_id, min(page_size, max_judgments - fetched)))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        fetched += len(rows)
+        last_id = rows[-1][0]
+        print(f"Fetched {len(rows)} judgments to process ({fetched} in this run).")
+        for row in rows:
+            yield row
+
+# Function to fetch the text of a single judgment
+def fetch_judgment_text(cursor, judgment_id):
+    cursor.execute("SELECT text_de FROM Judgments WHERE id = %s", (judgment_id,))
+    row = cursor.fetchone()
+    return row[0] if row else None
 
 def split_text_with_linebreaks(text, max_length=2000, overlap=200):
     """
@@ -186,119 +219,108 @@ def process_judgments():
             """)
             print("Checked/Created judgments_upsert table.")
 
-            # Fetch judgments where text_summary_de is not null and not yet processed
-            query = """
-                SELECT id, ecli, case_no, date_decided, text_de, text_summary_de
-                FROM Judgments
-                WHERE text_summary_de IS NOT NULL
-                AND text_de IS NOT NULL
-                AND id NOT IN (SELECT judgment_id FROM judgments_upsert)
-                LIMIT 5000
-            """
-            cursor.execute(query)
-            judgments = cursor.fetchall()
-            print(f"Fetched {len(judgments)} judgments to process.")
-
-            for judgment in judgments:
-                try:
-                    judgment_id = judgment[0]
-                    ecli = judgment[1]
-                    case_no = judgment[2]
-                    date_decided = judgment[3]
-                    text_de = judgment[4]
-                    text_summary_de = judgment[5]
-
-                    print(f"\nProcessing judgment ID: {judgment_id}, Case Number (Aktenzeichen): {case_no}")
-
-                    # Check if already processed
-                    if is_judgment_processed(cursor, judgment_id):
-                        print(f"Judgment {judgment_id} already processed. Skipping.")
-                        continue
-
-                    if not text_de:
-                        print(f"No text_de for judgment {judgment_id}. Skipping.")
-                        continue
-
-                    # Split text_de into chunks with overlap using line breaks
-                    print("Splitting text into chunks...")
-                    chunks = split_text_with_linebreaks(text_de, max_length=1500, overlap=200)
-                    #chunks = split_text_by_paragraphs(text_de, max_length=2000, overlap=200)
-                    print(f"Text split into {len(chunks)} chunks.")
-
-                    # Prepare data for embeddings
-                    embeddings_data = []
-                    for idx, chunk in enumerate(chunks):
-                        embeddings_data.append({
-                            'judgment_id': judgment_id,
-                            'chunk': chunk,
-                            'chunk_idx': idx
-                        })
-
-                    # Process embeddings in batches of 20
-                    batch_size = 20
-                    for i in range(0, len(embeddings_data), batch_size):
-                        batch = embeddings_data[i:i+batch_size]
-                        texts = [item['chunk'] for item in batch]
-
-                        # Generate embeddings
-                        try:
-                            print(f"Generating embeddings for batch {i//batch_size + 1}...")
-                            response = openai.embeddings.create(
-                                input=texts,
-                                model="text-embedding-3-small"
-                            )
-                        except OpenAIError as e:
-                            print(f"OpenAI API error while processing batch {i//batch_size + 1} for judgment {judgment_id}: {e}")
-                            continue  # Skip this batch on error
-
-                        # Access embeddings from the response
-                        embeddings = [data.embedding for data in response.data]
-
-                        # Prepare points for Qdrant
-                        points = []
-                        for emb_data, embedding in zip(batch, embeddings):
-                            payload = {
-                                'Content': emb_data['chunk'],  # Not indexed as full-text
-                                'metadata': {
-                                    'case_no': case_no,
-                                    'ECLI': ecli,
-                                    'date_decided': date_decided.strftime('%Y-%m-%d') if date_decided else None,
-                                   # 'text_summary_de': text_summary_de
-                                },
-                                'loc': {
-                                    'judgment_id': emb_data['judgment_id'],
-                                    'chunk_idx': emb_data['chunk_idx']
+            # Stream judgments where text_summary_de is not null and not yet processed (metadata only, page by page)
+            with conn.cursor() as meta_cursor:
+                for judgment in iter_pending_judgments(meta_cursor):
+                    try:
+                        judgment_id = judgment[0]
+                        ecli = judgment[1]
+                        case_no = judgment[2]
+                        date_decided = judgment[3]
+
+                        print(f"\nProcessing judgment ID: {judgment_id}, Case Number (Aktenzeichen): {case_no}")
+
+                        # Check if already processed
+                        if is_judgment_processed(cursor, judgment_id):
+                            print(f"Judgment {judgment_id} already processed. Skipping.")
+                            continue
+
+                        # Fetch the large text column only for the judgment being processed
+                        text_de = fetch_judgment_text(cursor, judgment_id)
+                        if not text_de:
+                            print(f"No text_de for judgment {judgment_id}. Skipping.")
+                            continue
+
+                        # Split text_de into chunks with overlap using line breaks
+                        print("Splitting text into chunks...")
+                        chunks = split_text_with_linebreaks(text_de, max_length=1500, overlap=200)
+                        #chunks = split_text_by_paragraphs(text_de, max_length=2000, overlap=200)
+                        print(f"Text split into {len(chunks)} chunks.")
+
+                        # Prepare data for embeddings
+                        embeddings_data = []
+                        for idx, chunk in enumerate(chunks):
+                            embeddings_data.append({
+                                'judgment_id': judgment_id,
+                                'chunk': chunk,
+                                'chunk_idx': idx
+                            })
+
+                        # Process embeddings in batches of 20
+                        batch_size = 20
+                        for i in range(0, len(embeddings_data), batch_size):
+                            batch = embeddings_data[i:i+batch_size]
+                            texts = [item['chunk'] for item in batch]
+
+                            # Generate embeddings
+                            try:
+                                print(f"Generating embeddings for batch {i//batch_size + 1}...")
+                                response = openai.embeddings.create(
+                                    input=texts,
+                                    model="text-embedding-3-small"
+                                )
+                            except OpenAIError as e:
+                                print(f"OpenAI API error while processing batch {i//batch_size + 1} for judgment {judgment_id}: {e}")
+                                continue  # Skip this batch on error
+
+                            # Access embeddings from the response
+                            embeddings = [data.embedding for data in response.data]
+
+                            # Prepare points for Qdrant
+                            points = []
+                            for emb_data, embedding in zip(batch, embeddings):
+                                payload = {
+                                    'Content': emb_data['chunk'],  # Not indexed as full-text
+                                    'metadata': {
+                                        'case_no': case_no,
+                                        'ECLI': ecli,
+                                        'date_decided': date_decided.strftime('%Y-%m-%d') if date_decided else None,
+                                       # 'text_summary_de': text_summary_de
+                                    },
+                                    'loc': {
+                                        'judgment_id': emb_data['judgment_id'],
+                                        'chunk_idx': emb_data['chunk_idx']
+                                    }
                                 }
-                            }
-                            #point_id = f"{emb_data['judgment_id']}{emb_data['chunk_idx']}"
-                            point_id = emb_data['judgment_id'] * 10000 + emb_data['chunk_idx']
-                            points.append(models.PointStruct(
-                                id=point_id,
-                                vector=embedding,
-                                payload=payload
-                            ))
-
-                        # Upload to Qdrant
-                        try:
-                            print(f"Uploading batch {i//batch_size + 1} to Qdrant...")
-                            qdrant_client.upsert(
-                                collection_name=collection_name,
-                                points=points
-                            )
-                        except Exception as e:
-                            print(f"Qdrant upsert error while uploading batch {i//batch_size + 1} for judgment {judgment_id}: {e}")
-                            continue  # Skip this batch on error
-
-                        print(f"Uploaded batch {i//batch_size + 1} for judgment {judgment_id}")
-
-                    # Mark judgment as processed
-                    mark_judgment_processed(cursor, judgment_id)
-                    conn.commit()
-                    print(f"Judgment {judgment_id} processing complete.")
-
-                except Exception as e:
-                    print(f"An error occurred while processing judgment ID {judgment_id}: {e}")
-                    continue  # Continue with the next judgment
+                                #point_id = f"{emb_data['judgment_id']}{emb_data['chunk_idx']}"
+                                point_id = emb_data['judgment_id'] * 10000 + emb_data['chunk_idx']
+                                points.append(models.PointStruct(
+                                    id=point_id,
+                                    vector=embedding,
+                                    payload=payload
+                                ))
+
+                            # Upload to Qdrant
+                            try:
+                                print(f"Uploading batch {i//batch_size + 1} to Qdrant...")
+                                qdrant_client.upsert(
+                                    collection_name=collection_name,
+                                    points=points
+                                )
+                            except Exception as e:
+                                print(f"Qdrant upsert error while uploading batch {i//batch_size + 1} for judgment {judgment_id}: {e}")
+                                continue  # Skip this batch on error
+
+                            print(f"Uploaded batch {i//batch_size + 1} for judgment {judgment_id}")
+
+                        # Mark judgment as processed
+                        mark_judgment_processed(cursor, judgment_id)
+                        conn.commit()
+                        print(f"Judgment {judgment_id} processing complete.")
+
+                    except Exception as e:
+                        print(f"An error occurred while processing judgment ID {judgment_id}: {e}")
+                        continue  # Continue with the next judgment
 
     except Exception as e:
         print(f"An error occurred during database operations: {e}")
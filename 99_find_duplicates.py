@@ -1,55 +1,69 @@
 import pymysql
+from itertools import groupby
 from settings import get_mysql_connection
+from case_numbers import ensure_case_number_table, sync_case_numbers, delete_case_numbers
+
+# Liest die Duplikate über einen ungepufferten Cursor (SSCursor) auf einer eigenen Lese-Verbindung und liefert sie
+# gruppiert nach ECLI. Die großen Textspalten werden nicht übertragen, nur ob sie gefüllt sind.
+def stream_duplicate_groups(read_conn):
+    with read_conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+        # Finden aller Duplikate und Gruppieren nach ECLI
+        query = """
+            SELECT id, docid, ecli, EURLexDoc, caselist_url, case_no,
+                   (text_summary_de IS NOT NULL AND text_summary_de <> '') AS has_text_summary_de,
+                   (text_de IS NOT NULL AND text_de <> '') AS has_text_de
+            FROM Judgments
+            WHERE ecli IN (
+                SELECT ecli
+                FROM Judgments
+                GROUP BY ecli
+                HAVING COUNT(*) > 1
+            )
+            ORDER BY ecli, docid;
+        """
+        cursor.execute(query)
+        for ecli, rows in groupby(cursor, key=lambda row: row['ecli']):
+            yield ecli, list(rows)
+
+# Kopiert eine Textspalte serverseitig vom Duplikat in den Basiseintrag, ohne den Text zum Client zu übertragen
+def copy_text_column(cursor, column, source_id, target_id):
+    cursor.execute(
+        f"""
+        UPDATE Judgments AS base
+        JOIN Judgments AS dup ON dup.id = %s
+        SET base.{column} = dup.{column}
+        WHERE base.id = %s
+        """,
+        (source_id, target_id)
+    )
 
 def apply_changes_to_duplicates():
+    conn = None
+    read_conn = None
     try:
-        # Verbindung zur Datenbank herstellen
+        # Verbindung zur Datenbank herstellen (eine zum Schreiben, eine zum Streamen der Duplikate)
         conn = get_mysql_connection()
-        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
-            # Finden aller Duplikate und Gruppieren nach ECLI
-            query = """
-                SELECT id, docid, ecli, text_summary_de, EURLexDoc, caselist_url, case_no, text_de
-                FROM Judgments
-                WHERE ecli IN (
-                    SELECT ecli
-                    FROM Judgments
-                    GROUP BY ecli
-                    HAVING COUNT(*) > 1
-                )
-                ORDER BY ecli, docid;
-            """
-            cursor.execute(query)
-            duplicates = cursor.fetchall()
-
-            if not duplicates:
-                print("Keine Duplikate gefunden.")
-                return
-
-            grouped_duplicates = {}
-            for row in duplicates:
-                grouped_duplicates.setdefault(row['ecli'], []).append(row)
-
+        read_conn = get_mysql_connection()
+        ensure_case_number_table(conn)
+        with conn.cursor() as cursor:
+            total_groups = 0
             total_deletions = 0
             total_updates = 0
 
             print("Änderungen werden in der Datenbank angewendet:\n")
 
-            for ecli, group in grouped_duplicates.items():
-                # Sortiere innerhalb der Gruppe nach docid (aufsteigend)
-                group.sort(key=lambda x: x['docid'])
+            for ecli, group in stream_duplicate_groups(read_conn):
+                total_groups += 1
 
-                # Behalte den Eintrag mit der niedrigsten docid
+                # Behalte den Eintrag mit der niedrigsten docid (die Abfrage liefert nach docid sortiert)
                 base = group[0]
                 updates = []
 
                 for dup in group[1:]:
                     # Übernehme Daten aus den Duplikaten in die Basiseinträge
-                    if not base['text_summary_de'] and dup['text_summary_de']:
-                        base['text_summary_de'] = dup['text_summary_de']
-                        cursor.execute(
-                            "UPDATE Judgments SET text_summary_de = %s WHERE id = %s",
-                            (dup['text_summary_de'], base['id'])
-                        )
+                    if not base['has_text_summary_de'] and dup['has_text_summary_de']:
+                        base['has_text_summary_de'] = True
+                        copy_text_column(cursor, 'text_summary_de', dup['id'], base['id'])
                         total_updates += 1
 
                     if not base['EURLexDoc'] and dup['EURLexDoc']:
@@ -74,14 +88,12 @@ def apply_changes_to_duplicates():
                             "UPDATE Judgments SET case_no = %s WHERE id = %s",
                             (dup['case_no'], base['id'])
                         )
+                        sync_case_numbers(cursor, [(base['id'], dup['case_no'])])
                         total_updates += 1
 
-                    if not base['text_de'] and dup['text_de']:
-                        base['text_de'] = dup['text_de']
-                        cursor.execute(
-                            "UPDATE Judgments SET text_de = %s WHERE id = %s",
-                            (dup['text_de'], base['id'])
-                        )
+                    if not base['has_text_de'] and dup['has_text_de']:
+                        base['has_text_de'] = True
+                        copy_text_column(cursor, 'text_de', dup['id'], base['id'])
                         total_updates += 1
 
                     # Markiere das Duplikat für die Löschung
@@ -91,6 +103,11 @@ def apply_changes_to_duplicates():
                 for dup in updates:
                     cursor.execute("DELETE FROM Judgments WHERE id = %s", (dup['id'],))
                     total_deletions += 1
+                delete_case_numbers(cursor, [dup['id'] for dup in updates])
+
+            if not total_groups:
+                print("Keine Duplikate gefunden.")
+                return
 
             # Änderungen in der Datenbank bestätigen
             conn.commit()
@@ -101,7 +118,10 @@ def apply_changes_to_duplicates():
     except Exception as e:
         print(f"Fehler bei der Verarbeitung der Duplikate: {e}")
     finally:
-        conn.close()
+        if read_conn:
+            read_conn.close()
+        if conn:
+            conn.close()
 
 if __name__ == "__main__":
     apply_changes_to_duplicates()
@@ -0,0 +1,151 @@
+import atexit
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+CHROMEDRIVER_PATH = '/usr/local/bin/chromedriver'
+
+# Anzahl gleichzeitig laufender Browser und Seiten je Browser, nach denen er neu gestartet wird
+# (Chrome wächst mit jeder Seite, ein regelmäßiger Neustart begrenzt den Speicherverbrauch)
+POOL_SIZE = 2
+MAX_PAGES_PER_BROWSER = 50
+
+# Ressourcen, die für das Auslesen der Dokumententabelle nicht gebraucht werden (Bilder, Schriften, CSS)
+BLOCKED_EXTENSIONS = (
+    "png", "jpg", "jpeg", "gif", "svg", "ico", "webp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "css",
+)
+# Network.setBlockedURLs vergleicht nur die URL, nicht den Ressourcentyp; daher je Endung auch die Form mit
+# Query-String, sonst laden versionierte Dateien wie "style.css?v=3" weiter. (Fetch.enable mit resourceType würde
+# jede Anfrage anhalten, bis ein Fetch.requestPaused-Ereignis beantwortet ist, was execute_cdp_cmd nicht kann.)
+BLOCKED_URL_PATTERNS = [pattern for extension in BLOCKED_EXTENSIONS for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+# Blockiert die Ressourcen über das DevTools-Protokoll; gilt für alle späteren Seiten dieses Browsers
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        print(f"Ressourcen konnten nicht blockiert werden: {e}", file=sys.stderr)
+
+# Funktion zum Starten eines Headless-Chrome mit den bisherigen Optionen
+def start_browser():
+    print("Initializing WebDriver for Selenium...", file=sys.stderr)
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')  # Festlegen der Fenstergröße
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    driver = webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=chrome_options)
+    block_resources(driver)
+    return driver
+
+# Ein Platz im Pool; der Browser wird erst beim ersten Bedarf gestartet
+class _BrowserSlot:
+    def __init__(self, number):
+        self.number = number
+        self.driver = None
+        self.pages = 0
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                print(f"Fehler beim Beenden von Browser {self.number}: {e}", file=sys.stderr)
+        self.driver = None
+        self.pages = 0
+
+# Pool langlebiger Browser: Aufrufer warten in einer Queue, wenn alle Browser belegt sind.
+# Ein Browser wird nach max_pages Seiten, nach einem Absturz oder einem fehlgeschlagenen Health-Check neu gestartet.
+class BrowserPool:
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_BROWSER, factory=start_browser):
+        self.max_pages = max_pages
+        self.factory = factory
+        self.slots = [_BrowserSlot(number) for number in range(size)]
+        self.idle = queue.Queue()
+        for slot in self.slots:
+            self.idle.put(slot)
+        self.lock = threading.Lock()
+        self.started = 0
+        self.recycled = 0
+        self.closed = False
+
+    # Prüft, ob der Browser noch reagiert
+    def _is_healthy(self, slot):
+        try:
+            return slot.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _prepare(self, slot):
+        if slot.driver is not None and not self._is_healthy(slot):
+            print(f"Browser {slot.number} reagiert nicht mehr, starte neu...", file=sys.stderr)
+            slot.quit()
+            with self.lock:
+                self.recycled += 1
+        if slot.driver is None:
+            slot.driver = self.factory()
+            with self.lock:
+                self.started += 1
+
+    # Leiht einen Browser aus; timeout=None wartet unbegrenzt auf einen freien Browser
+    @contextmanager
+    def browser(self, timeout=None):
+        if self.closed:
+            raise RuntimeError("BrowserPool ist bereits geschlossen.")
+        try:
+            slot = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Kein freier Browser innerhalb von {timeout} Sekunden.")
+
+        try:
+            self._prepare(slot)
+            yield slot.driver
+            slot.pages += 1
+        except WebDriverException:
+            # Absturz oder verlorene Verbindung zum Browser: beim nächsten Ausleihen frisch starten
+            slot.quit()
+            with self.lock:
+                self.recycled += 1
+            raise
+        finally:
+            if slot.pages >= self.max_pages:
+                print(f"Browser {slot.number} hat {slot.pages} Seiten geladen, starte neu...", file=sys.stderr)
+                slot.quit()
+                with self.lock:
+                    self.recycled += 1
+            if self.closed:
+                slot.quit()
+            self.idle.put(slot)
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().quit()
+            except queue.Empty:
+                break
+
+    def report(self):
+        print(f"Browser-Pool: {len(self.slots)} Plätze, {self.started} Starts, {self.recycled} Neustarts", file=sys.stderr)
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+# Gemeinsamer Pool je Prozess; die Browser werden beim Beenden des Prozesses geschlossen
+def get_browser_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,89 @@
+import re
+
+# Seitentabelle mit einem Eintrag je Aktenzeichen eines Urteils (position 0 = erstes Aktenzeichen in case_no).
+# Ersetzt die Suche per "case_no LIKE '%C-123/45%'", die keinen Index nutzen kann.
+CREATE_CASE_NUMBER_TABLE = """
+    CREATE TABLE IF NOT EXISTS judgment_case_numbers (
+        judgment_id BIGINT NOT NULL,
+        case_no_normalized VARCHAR(100) NOT NULL,
+        position SMALLINT NOT NULL,
+        PRIMARY KEY (judgment_id, case_no_normalized),
+        KEY idx_case_no_normalized (case_no_normalized, position)
+    )
+"""
+
+# Funktion zur Normalisierung eines einzelnen Aktenzeichens, z. B. " c‑123/45  p" -> "C-123/45 P"
+def normalize_case_no(case_no):
+    case_no = str(case_no).upper().replace("‑", "-").replace("–", "-").replace("‐", "-")
+    return re.sub(r"\s+", " ", case_no).strip()[:100]
+
+# Zerlegt das kommagetrennte Feld case_no in normalisierte Aktenzeichen (ohne Duplikate, Reihenfolge bleibt)
+def split_case_numbers(case_no_field):
+    if not case_no_field:
+        return []
+    tokens = (normalize_case_no(token) for token in str(case_no_field).split(","))
+    return list(dict.fromkeys(token for token in tokens if token))
+
+# Schreibt die Aktenzeichen mehrerer Urteile neu: rows = [(judgment_id, case_no), ...]
+def sync_case_numbers(cursor, rows):
+    rows = list(rows)
+    if not rows:
+        return
+    judgment_ids = [judgment_id for judgment_id, _ in rows]
+    placeholders = ", ".join(["%s"] * len(judgment_ids))
+    cursor.execute(f"DELETE FROM judgment_case_numbers WHERE judgment_id IN ({placeholders})", judgment_ids)
+
+    values = [
+        (judgment_id, token, position)
+        for judgment_id, case_no in rows
+        for position, token in enumerate(split_case_numbers(case_no))
+    ]
+    if values:
+        cursor.executemany(
+            "INSERT INTO judgment_case_numbers (judgment_id, case_no_normalized, position) VALUES (%s, %s, %s)",
+            values,
+        )
+
+# Entfernt die Aktenzeichen gelöschter Urteile
+def delete_case_numbers(cursor, judgment_ids):
+    judgment_ids = list(judgment_ids)
+    if judgment_ids:
+        placeholders = ", ".join(["%s"] * len(judgment_ids))
+        cursor.execute(f"DELETE FROM judgment_case_numbers WHERE judgment_id IN ({placeholders})", judgment_ids)
+
+# Einmaliges Befüllen der Seitentabelle aus Judgments.case_no (seitenweise über die id)
+def backfill_case_numbers(conn, batch_size=5000):
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_CASE_NUMBER_TABLE)
+        cursor.execute("DELETE FROM judgment_case_numbers")
+        conn.commit()
+
+        last_id = 0
+        total = 0
+        while True:
+            cursor.execute(
+                "SELECT id, case_no FROM Judgments WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, batch_size),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            sync_case_numbers(cursor, rows)
+            conn.commit()
+            last_id = rows[-1][0]
+            total += len(rows)
+            print(f"Aktenzeichen für {total} Urteile übernommen...")
+    print(f"Backfill abgeschlossen: {total} Urteile.")
+
+# Legt die Tabelle an und befüllt sie, falls sie leer ist, Judgments aber schon Einträge hat
+def ensure_case_number_table(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_CASE_NUMBER_TABLE)
+        cursor.execute("SELECT 1 FROM judgment_case_numbers LIMIT 1")
+        is_empty = cursor.fetchone() is None
+        cursor.execute("SELECT 1 FROM Judgments LIMIT 1")
+        has_judgments = cursor.fetchone() is not None
+    conn.commit()
+    if is_empty and has_judgments:
+        print("Tabelle judgment_case_numbers ist leer, starte Backfill...")
+        backfill_case_numbers(conn)
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import pandas as pd
+from http_client import get_http_session
+from request_policy import get_request_policy
+from datetime import datetime
+
+# Zustand des letzten Laufs (ETag, Last-Modified, Hash der Seite, Hashes aller Zeilen)
+STATE_FILE = "caselist_state/c2_juris.json"
+
+# Verzeichnisse für Delta-Dateien (noch nicht importiert / bereits importiert)
+DELTA_DIRECTORY = "caselist_csv/delta"
+IMPORTED_DELTA_DIRECTORY = "caselist_csv/delta/imported"
+
+# Funktion zum Laden des gespeicherten Zustands
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# Funktion zum Speichern des Zustands (erst temporär schreiben, dann ersetzen)
+def save_state(state, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+# Bedingter GET-Request mit If-None-Match / If-Modified-Since aus dem letzten Lauf
+def conditional_get(url, state, timeout=60):
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return get_request_policy().request(url, lambda: get_http_session().get(url, headers=headers, timeout=timeout))
+
+# Übernimmt ETag und Last-Modified aus der Antwort in den Zustand
+def remember_validators(state, response):
+    state["etag"] = response.headers.get("ETag", state.get("etag"))
+    state["last_modified"] = response.headers.get("Last-Modified", state.get("last_modified"))
+
+# SHA-256 des Seiteninhalts
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+# Hash je Zeile über alle Spaltenwerte (64 Bit reichen zur Erkennung von Änderungen)
+def row_hashes(df):
+    hashes = [
+        hashlib.sha256("\x1f".join(map(str, row)).encode("utf-8")).hexdigest()[:16]
+        for row in df.itertuples(index=False)
+    ]
+    return pd.Series(hashes, index=df.index, dtype=object)
+
+# Liefert nur die neuen oder geänderten Zeilen und die Hashes aller aktuellen Zeilen
+def changed_rows(df, previous_hashes):
+    hashes = row_hashes(df)
+    known = set(previous_hashes or [])
+    return df[~hashes.isin(known)], hashes.tolist()
+
+# Speichert die Delta-Datei mit Zeitstempel, damit mehrere Läufe pro Tag nichts überschreiben
+def write_delta(delta_df, directory=DELTA_DIRECTORY, suffix="ecj-caselist-delta"):
+    os.makedirs(directory, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    path = os.path.join(directory, f"{timestamp}_{suffix}.csv")
+    delta_df.to_csv(path, index=False)
+    return path
+
+# Alle noch nicht importierten Delta-Dateien in zeitlicher Reihenfolge
+def get_pending_deltas(directory=DELTA_DIRECTORY):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".csv"))
+
+# Verschiebt eine importierte Delta-Datei nach "imported"
+def mark_delta_imported(path, imported_directory=IMPORTED_DELTA_DIRECTORY):
+    os.makedirs(imported_directory, exist_ok=True)
+    os.replace(path, os.path.join(imported_directory, os.path.basename(path)))
@@ -0,0 +1,83 @@
+import io
+from collections import namedtuple
+import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Verfügbare Parser: "lxml" (iterparse, nur <tr>-Elemente), "strainer" (BeautifulSoup mit SoupStrainer)
+# und "html.parser" (bisheriger vollständiger BeautifulSoup-Baum, als Referenz)
+PARSER_BACKENDS = ("lxml", "strainer", "html.parser")
+DEFAULT_BACKEND = "lxml"
+
+# Eine Tabellenzelle: gesamter Text (wie Tag.text), Text wie get_text(strip=True)
+# und alle Links als (href, Linktext)-Tupel
+CaselistCell = namedtuple("CaselistCell", ["text", "stripped_text", "links"])
+
+# Entspricht get_text(strip=True): Textstücke einzeln trimmen und ohne Trenner verbinden
+def _join_stripped(strings):
+    return "".join(s.strip() for s in strings if s.strip())
+
+# Funktion zum Erstellen einer Zelle aus den Textstücken und Links
+def _make_cell(strings, links):
+    return CaselistCell("".join(strings), _join_stripped(strings), tuple(links))
+
+# Zeilen aus einem BeautifulSoup-Baum (vollständig oder per SoupStrainer gefiltert)
+def _iter_rows_soup(soup):
+    for row in soup.find_all("tr"):
+        cells = []
+        for column in row.find_all("td"):
+            links = [(link.get("href"), link.get_text(strip=True)) for link in column.find_all("a")]
+            cells.append(_make_cell(list(column.strings), links))
+        yield tuple(cells)
+
+# Zeilen per lxml.iterparse: es wird nie ein Baum der ganzen Seite aufgebaut.
+# Ohne encoding liest libxml2 Bytes ohne <meta charset> als Latin-1, daher wird der Zeichensatz durchgereicht.
+def _iter_rows_lxml(content, encoding=None):
+    from lxml import etree
+
+    for _, row in etree.iterparse(io.BytesIO(content), events=("end",), tag="tr", html=True, encoding=encoding):
+        cells = []
+        for column in row.iter("td"):
+            links = [(link.get("href"), _join_stripped(link.itertext())) for link in column.iter("a")]
+            cells.append(_make_cell(list(column.itertext()), links))
+        yield tuple(cells)
+
+        # Verarbeitete Zeilen sofort freigeben, damit der Speicher flach bleibt
+        row.clear()
+        parent = row.getparent()
+        if parent is not None:
+            while row.getprevious() is not None:
+                del parent[0]
+
+# Liefert für jedes <tr> der Caseliste ein Tupel von CaselistCell-Einträgen (eine pro <td>).
+# encoding ist der Zeichensatz der Bytes (z. B. response.encoding); None überlässt die Erkennung dem Parser.
+def iter_caselist_rows(content, backend=DEFAULT_BACKEND, encoding=None):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+        encoding = "utf-8"
+
+    if backend == "lxml":
+        return _iter_rows_lxml(content, encoding)
+    if backend == "strainer":
+        return _iter_rows_soup(BeautifulSoup(content, "html.parser", parse_only=SoupStrainer("tr"), from_encoding=encoding))
+    if backend == "html.parser":
+        return _iter_rows_soup(BeautifulSoup(content, "html.parser", from_encoding=encoding))
+    raise ValueError(f"Unbekannter Parser '{backend}'. Erlaubt: {', '.join(PARSER_BACKENDS)}")
+
+# Bildet jeden Wurzelfall auf die Liste seiner Unterfälle ab (Reihenfolge wie in der Caseliste).
+# Das Dictionary kann von den Importern direkt genutzt werden, statt "Child-Cases" wieder zu zerlegen.
+def build_case_families(df, case_column, root_column="Referenziertes Root Case"):
+    roots = df[root_column].fillna("").astype(str)
+    has_root = roots != ""
+    families = df.loc[has_root, case_column].groupby(roots[has_root], sort=False).agg(list)
+    return families.to_dict()
+
+# Fügt die Spalte "Child-Cases" (kommagetrennte Unterfälle je Wurzelfall) hinzu und gibt die Zuordnung zurück
+def add_child_cases_column(df, case_column, root_column="Referenziertes Root Case"):
+    families = build_case_families(df, case_column, root_column)
+    joined = pd.Series({root: ", ".join(children) for root, children in families.items()}, dtype=object)
+    df["Child-Cases"] = df[case_column].map(joined).fillna("")
+    return families
+
+# Aktenzeichen eines Falls inklusive aller Unterfälle, z. B. "C-1/20, C-2/20"
+def case_no_with_children(case_no, families):
+    return ", ".join([case_no] + families.get(case_no, []))
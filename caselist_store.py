@@ -0,0 +1,106 @@
+import json
+import os
+import pandas as pd
+from datetime import datetime
+from caselist_delta import row_hashes
+
+# Snapshot-Verzeichnisse der beiden Caselisten
+C2_SNAPSHOT_DIRECTORY = "caselist_snapshots/c2_juris"
+C1_SNAPSHOT_DIRECTORY = "caselist_snapshots/c1"
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_RETENTION = 60
+
+# Funktion zum Laden des Manifests (Liste aller Snapshots, älteste zuerst)
+def load_manifest(directory):
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["snapshots"]
+
+# Funktion zum Speichern des Manifests (erst temporär schreiben, dann ersetzen)
+def save_manifest(directory, snapshots):
+    path = os.path.join(directory, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"snapshots": snapshots}, f, indent=2)
+    os.replace(tmp_path, path)
+
+# Wandelt die Textspalten eines Scrapes in typisierte Spalten um (Datum als date, Child-Cases als Liste)
+def to_typed_frame(df, date_columns=(), list_columns=("Child-Cases",)):
+    typed = df.copy()
+    for column in date_columns:
+        typed[column] = pd.to_datetime(typed[column].replace("", None), format="%Y-%m-%d", errors="coerce").dt.date
+    for column in list_columns:
+        if column in typed:
+            typed[column] = typed[column].fillna("").map(lambda v: v.split(", ") if v else [])
+    return typed
+
+# Speichert einen Scrape als komprimierte Parquet-Datei, trägt ihn ins Manifest ein und wendet die Aufbewahrung an
+def write_snapshot(directory, df, date_columns=(), scraped_at=None, retention=DEFAULT_RETENTION):
+    os.makedirs(directory, exist_ok=True)
+    scraped_at = scraped_at or datetime.now()
+    snapshot_id = scraped_at.strftime("%Y-%m-%d_%H%M%S")
+    file_name = f"{snapshot_id}.parquet"
+
+    typed = to_typed_frame(df, date_columns)
+    typed.to_parquet(os.path.join(directory, file_name), compression="zstd", index=False)
+
+    snapshots = [s for s in load_manifest(directory) if s["id"] != snapshot_id]
+    snapshots.append({
+        "id": snapshot_id,
+        "scraped_at": scraped_at.isoformat(timespec="seconds"),
+        "file": file_name,
+        "rows": len(typed),
+    })
+    save_manifest(directory, snapshots)
+    apply_retention(directory, retention)
+    print(f"Snapshot {snapshot_id} mit {len(typed)} Zeilen gespeichert in: {directory}")
+    return snapshot_id
+
+# Liest einen Snapshot: nach ID, Stand zu einem Zeitpunkt ("as of") oder standardmäßig den neuesten
+def read_snapshot(directory, snapshot_id=None, as_of=None):
+    snapshots = load_manifest(directory)
+    if snapshot_id is not None:
+        snapshots = [s for s in snapshots if s["id"] == snapshot_id]
+    if as_of is not None:
+        # Ein reines Datum umfasst den ganzen Tag
+        if not isinstance(as_of, datetime):
+            as_of = datetime.combine(as_of, datetime.max.time())
+        snapshots = [s for s in snapshots if datetime.fromisoformat(s["scraped_at"]) <= as_of]
+    if not snapshots:
+        return None
+    return pd.read_parquet(os.path.join(directory, snapshots[-1]["file"]))
+
+# Unterschiede zwischen zwei Snapshots: neue, entfernte und geänderte Zeilen (Schlüssel z. B. Aktenzeichen)
+def diff_snapshots(directory, old_id, new_id, key_column):
+    old_df = read_snapshot(directory, snapshot_id=old_id)
+    new_df = read_snapshot(directory, snapshot_id=new_id)
+    if old_df is None or new_df is None:
+        raise ValueError(f"Snapshot {old_id if old_df is None else new_id} nicht im Manifest gefunden.")
+
+    old_only = old_df[~row_hashes(old_df).isin(set(row_hashes(new_df)))]
+    new_only = new_df[~row_hashes(new_df).isin(set(row_hashes(old_df)))]
+
+    changed_keys = set(old_only[key_column]) & set(new_only[key_column])
+    return {
+        "added": new_only[~new_only[key_column].isin(changed_keys)],
+        "removed": old_only[~old_only[key_column].isin(changed_keys)],
+        "changed": new_only[new_only[key_column].isin(changed_keys)],
+    }
+
+# Behält nur die neuesten max_snapshots Snapshots (Reihenfolge laut Manifest, nicht nach mtime)
+def apply_retention(directory, max_snapshots=DEFAULT_RETENTION):
+    snapshots = load_manifest(directory)
+    if len(snapshots) <= max_snapshots:
+        return 0
+
+    expired, kept = snapshots[:-max_snapshots], snapshots[-max_snapshots:]
+    save_manifest(directory, kept)
+    for snapshot in expired:
+        path = os.path.join(directory, snapshot["file"])
+        if os.path.exists(path):
+            print(f"Deleting snapshot: {path}")
+            os.remove(path)
+    return len(expired)
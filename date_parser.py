@@ -0,0 +1,138 @@
+import json
+import re
+import unicodedata
+from datetime import date
+from functools import lru_cache
+
+# Monatsnamen (Englisch, Französisch, Deutsch inkl. Abkürzungen), Schreibweise ohne Akzente
+MONTHS = {
+    # Englisch
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+    # Französisch
+    "janvier": 1, "fevrier": 2, "mars": 3, "avril": 4, "mai": 5, "juin": 6,
+    "juillet": 7, "aout": 8, "septembre": 9, "octobre": 10, "novembre": 11, "decembre": 12,
+    "janv": 1, "fevr": 2, "fev": 2, "avr": 4, "juil": 7,
+    # Deutsch
+    "januar": 1, "janner": 1, "februar": 2, "feber": 2, "marz": 3, "maerz": 3,
+    "juni": 6, "juli": 7, "oktober": 10, "dezember": 12, "okt": 10, "dez": 12,
+}
+
+NUMERIC_DMY_PATTERN = re.compile(r"\b(\d{1,2})\s*[/.\-]\s*(\d{1,2})\s*[/.\-]\s*(\d{4})\b")
+NUMERIC_ISO_PATTERN = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+ORDINAL_PATTERN = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th|er|re|e)\b")
+TOKEN_PATTERN = re.compile(r"[a-z]+|\d+")
+
+# Funktion zum Entfernen von Akzenten (z. B. "février" -> "fevrier", "März" -> "marz")
+def _strip_accents(text):
+    normalized = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+# Funktion zur Erstellung eines ISO-Datums, falls Tag/Monat/Jahr gültig sind
+def _to_iso(year, month, day):
+    try:
+        return date(int(year), int(month), int(day)).strftime("%Y-%m-%d")
+    except ValueError:
+        return ""
+
+# Lokale Datumsumwandlung in YYYY-MM-DD ohne Netzwerkzugriff.
+# Unterstützt "12 January 2023", "1st March 2020", "12 janvier 2023", "12. Januar 2023",
+# Zeiträume wie "12 and 13 May 2020" oder "30 January and 2 February 2023" (erster Tag zählt)
+# sowie "12/01/2023". Gibt "" zurück, wenn kein eindeutiges Datum erkannt wurde.
+@lru_cache(maxsize=None)
+def parse_date(date_str):
+    if date_str is None:
+        return ""
+    text = _strip_accents(str(date_str)).lower().strip()
+    if not text or text == "nan":
+        return ""
+
+    match = NUMERIC_ISO_PATTERN.search(text)
+    if match:
+        return _to_iso(match.group(1), match.group(2), match.group(3))
+
+    match = NUMERIC_DMY_PATTERN.search(text)
+    if match:
+        return _to_iso(match.group(3), match.group(2), match.group(1))
+
+    text = ORDINAL_PATTERN.sub(r"\1", text)
+
+    day = month = year = None
+    for token in TOKEN_PATTERN.findall(text):
+        if token.isdigit():
+            if len(token) == 4 and year is None:
+                year = token
+            elif len(token) <= 2 and day is None:
+                day = token
+        elif month is None and token in MONTHS:
+            month = MONTHS[token]
+
+    if day is None or month is None or year is None:
+        return ""
+    return _to_iso(year, month, day)
+
+# Funktion, um GPT-4o-mini mit genau einer Anfrage für alle übrig gebliebenen Datumsangaben zu nutzen
+def ask_gpt_for_dates(client, date_strs):
+    date_strs = list(date_strs)
+    if not date_strs:
+        return {}
+
+    numbered = "\n".join(f"{i}: {s}" for i, s in enumerate(date_strs))
+    prompt = (
+        "Please convert each of the following dates to the format YYYY-MM-DD. "
+        "Answer with a JSON object that maps each number to the converted date, "
+        "or to an empty string if the text contains no date.\n" + numbered
+    )
+
+    try:
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}
+            ]
+        )
+    except Exception as e:
+        print(f"Error calling GPT-4 API: {e}")
+        return {s: "" for s in date_strs}
+
+    answers = {}
+    if response.choices:
+        try:
+            answers = json.loads(response.choices[0].message.content)
+        except (TypeError, ValueError):
+            answers = {}
+        # Gültiges JSON, aber kein Objekt (z. B. eine Liste): wie eine unbrauchbare Antwort behandeln
+        if not isinstance(answers, dict):
+            answers = {}
+
+    results = {}
+    for i, date_str in enumerate(date_strs):
+        answer = str(answers.get(str(i), ""))
+        match = re.search(r"\b\d{4}-\d{2}-\d{2}\b", answer)
+        results[date_str] = match.group(0) if match else ""
+        if results[date_str]:
+            print(f"Found date using GPT: {date_str} -> {results[date_str]}")
+    return results
+
+# Wandelt alle Rohdaten eines Laufs um: zuerst lokal, nur die Reste gesammelt per GPT
+def convert_dates(date_strs, client=None):
+    results = {}
+    unresolved = []
+    for date_str in dict.fromkeys(date_strs):
+        if not date_str:
+            results[date_str] = ""
+            continue
+        parsed = parse_date(date_str)
+        results[date_str] = parsed
+        if not parsed:
+            unresolved.append(date_str)
+
+    if unresolved:
+        print(f"Date parsing failed for {len(unresolved)} value(s), asking GPT for help in one request.")
+        if client is not None:
+            results.update(ask_gpt_for_dates(client, unresolved))
+    return results
@@ -0,0 +1,66 @@
+import queue
+import threading
+from contextlib import contextmanager
+from settings import get_mysql_connection
+
+# Gemeinsamer Connection-Pool für den Collector: Verbindungen (inkl. SSL-Handshake) werden wiederverwendet
+# statt für jeden Schreibzugriff neu aufgebaut
+POOL_SIZE = 4
+
+class ConnectionPool:
+    def __init__(self, size=POOL_SIZE, factory=get_mysql_connection):
+        self.factory = factory
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.created = 0
+
+    def _checkout(self):
+        try:
+            conn = self.idle.get_nowait()
+            # Getrennte Verbindungen (Timeout auf dem Server) werden dabei neu aufgebaut
+            conn.ping(reconnect=True)
+            return conn
+        except queue.Empty:
+            conn = self.factory()
+            if conn is None:
+                raise RuntimeError("Keine Verbindung zum MySQL-Server möglich.")
+            self.created += 1
+            return conn
+
+    # Leiht eine Verbindung aus; bei einer Exception wird die offene Transaktion zurückgerollt
+    @contextmanager
+    def connection(self):
+        self.slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except Exception:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Exception:
+                    conn.close()
+                    conn = None
+            raise
+        finally:
+            if conn is not None:
+                self.idle.put(conn)
+            self.slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_connection_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool()
+        return _default_pool
@@ -0,0 +1,153 @@
+import asyncio
+import re
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from http_cache import get_http_cache
+from http_client import create_session as create_http_session, get_http_session
+from request_policy import get_request_policy, TransientError
+
+# Höchstens so viele gleichzeitige Anfragen je Host und Mindestabstand zwischen zwei Anfragestarts je Host
+MAX_REQUESTS_PER_HOST = 4
+MIN_REQUEST_INTERVAL = 0.25
+
+# Session mit Connection-Pool, damit TCP/TLS-Verbindungen wiederverwendet werden (Einstellungen aus http_client)
+def create_session(pool_size=MAX_REQUESTS_PER_HOST):
+    return create_http_session(pool_maxsize=pool_size)
+
+# Muster für den schnellen Weg: "ECLI identifier: ECLI:EU:C:2020:123" direkt in den Rohbytes.
+# Die ECLI muss vollständig sein: danach folgt kein Buchstabe/keine Ziffer und kein Punkt mit weiterer Ordnungsnummer.
+ECLI_BYTES_PATTERN = re.compile(
+    rb"ECLI identifier:\s*(ECLI:[A-Za-z]{2}:[A-Za-z0-9]+:\d{4}:[A-Za-z0-9.]*[A-Za-z0-9])(?![A-Za-z0-9]|\.[A-Za-z0-9])"
+)
+CHUNK_SIZE = 16 * 1024
+
+# Schneller Weg: durchsucht die Chunks, bis die ECLI gefunden ist. Gibt (ECLI oder None, gelesene Bytes) zurück.
+# Es wird nur der Rest des vorherigen Chunks mit durchsucht, damit Treffer an Chunkgrenzen nicht verloren gehen.
+# Ein Treffer, der bis an das Pufferende (oder ein Byte davor) reicht, könnte abgeschnitten sein; er zählt erst,
+# wenn weitere Daten folgen oder der Stream zu Ende ist.
+def scan_ecli(chunks):
+    buffer = bytearray()
+    overlap = 128
+    search_from = 0
+    for chunk in chunks:
+        search_from = max(0, len(buffer) - overlap)
+        buffer.extend(chunk)
+        match = ECLI_BYTES_PATTERN.search(buffer, search_from)
+        if match and match.end() + 1 < len(buffer):
+            return match.group(1).decode("ascii"), bytes(buffer)
+    match = ECLI_BYTES_PATTERN.search(buffer, search_from)
+    if match:
+        return match.group(1).decode("ascii"), bytes(buffer)
+    return None, bytes(buffer)
+
+# Langsamer Weg: vollständiger DOM-Aufbau und Suche nach dem <p> mit "ECLI identifier: "
+def extract_ecli_dom(content):
+    soup = BeautifulSoup(content, "html.parser")
+    ecli_paragraph = soup.find("p", string=lambda s: s and "ECLI identifier: " in s)
+    if ecli_paragraph:
+        return ecli_paragraph.string.replace("ECLI identifier: ", "").strip()
+    return None
+
+# Version der gespeicherten ECLI-Ergebnisse: erhöhen, wenn sich die Extraktion ändert, damit alte Einträge
+# nicht weiterverwendet werden (v2: vor der Korrektur in scan_ecli konnten ECLIs an Chunkgrenzen abgeschnitten sein)
+ECLI_MEMO_VERSION = "v2"
+
+# Funktion, um die ECLI aus dem HTML zu extrahieren. Bereits aufgelöste URLs kommen aus dem HTTP-Cache;
+# gleichzeitige Abrufe derselben URL (verbundene Rechtssachen) werden zu einem Abruf zusammengefasst.
+def fetch_ecli_from_url(url, session=None):
+    return get_http_cache().memoize(f"ecli:{ECLI_MEMO_VERSION} {url}", lambda: _fetch_ecli(url, session))
+
+# Die Antwort wird gestreamt und die Verbindung geschlossen, sobald die ECLI gefunden ist;
+# nur wenn der schnelle Weg nichts findet, wird der DOM durchsucht.
+def _fetch_ecli(url, session):
+    try:
+        # HTTP-Anfrage mit Unterstützung für Redirects
+        response = get_request_policy().request(
+            url, lambda: (session or get_http_session()).get(url, allow_redirects=True, timeout=10, stream=True)
+        )
+        try:
+            if response.status_code != 200:
+                print(f"Fehler beim Abrufen der Seite {url}. Statuscode: {response.status_code}")
+                return None
+
+            # Umleiten-URL ausgeben (falls Redirect erfolgt)
+            if response.history:
+                print(f"Redirects: {[r.url for r in response.history]}")
+            print(f"Endgültige URL: {response.url}")
+
+            ecli, content = scan_ecli(response.iter_content(chunk_size=CHUNK_SIZE))
+        finally:
+            response.close()
+
+        if not ecli:
+            ecli = extract_ecli_dom(content)
+
+        if ecli:
+            print(f"ECLI abgerufen: {ecli}")
+            return ecli
+        else:
+            print(f"ECLI nicht gefunden auf Seite: {url}")
+            return None
+    except TransientError as e:
+        # None wird nicht gespeichert, der nächste Lauf versucht es erneut
+        print(f"Vorübergehender Fehler beim Abrufen der URL {url}: {e}")
+        return None
+    except requests.exceptions.RequestException as e:
+        print(f"HTTP-Fehler beim Abrufen der URL {url}: {e}")
+        return None
+    except Exception as e:
+        print(f"Allgemeiner Fehler beim Abrufen der ECLI von {url}: {e}")
+        return None
+
+# Begrenzung je Host: Semaphore für die Parallelität und ein Lock für den Mindestabstand zwischen Anfragen
+class _HostLimiter:
+    def __init__(self, max_concurrent, min_interval):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.lock = asyncio.Lock()
+        self.min_interval = min_interval
+        self.next_start = 0.0
+
+    async def wait_turn(self):
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_start > now:
+                await asyncio.sleep(self.next_start - now)
+            self.next_start = max(now, self.next_start) + self.min_interval
+
+# Nur echte URLs auflösen: aus pd.read_csv kommen fehlende Links als float NaN, aus älteren CSVs als "None"
+def _is_resolvable(url):
+    return isinstance(url, str) and url not in ("", "None")
+
+async def _resolve_all(urls, max_per_host, min_interval):
+    session = create_session(max_per_host)
+    limiters = {}
+    loop = asyncio.get_running_loop()
+    hosts = {urlparse(url).netloc for url in urls if _is_resolvable(url)}
+    executor = ThreadPoolExecutor(max_workers=max(1, max_per_host * len(hosts)))
+
+    async def resolve(url):
+        if not _is_resolvable(url):
+            return None
+        host = urlparse(url).netloc
+        limiter = limiters.setdefault(host, _HostLimiter(max_per_host, min_interval))
+        async with limiter.semaphore:
+            await limiter.wait_turn()
+            return await loop.run_in_executor(executor, fetch_ecli_from_url, url, session)
+
+    try:
+        # gather liefert die Ergebnisse in der Reihenfolge der Eingabe
+        return await asyncio.gather(*(resolve(url) for url in urls))
+    finally:
+        executor.shutdown(wait=False)
+        session.close()
+
+# Ruft die ECLIs vieler Fallseiten gleichzeitig ab; Ergebnis (ECLI oder None) in Eingabereihenfolge
+def resolve_eclis(urls, max_per_host=MAX_REQUESTS_PER_HOST, min_interval=MIN_REQUEST_INTERVAL):
+    urls = list(urls)
+    if not urls:
+        return []
+    print(f"Rufe {len(urls)} ECLI(s) ab (max. {max_per_host} gleichzeitig je Host)...")
+    return asyncio.run(_resolve_all(urls, max_per_host, min_interval))
@@ -0,0 +1,94 @@
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+from case_numbers import split_case_numbers
+
+# Bestätigte Zuordnungen ECLI -> CELEX, damit spätere Läufe direkt die richtige EUR-Lex-URL verwenden
+CELEX_MAP_FILE = "caselist_state/ecli_celex.json"
+
+# Direkte Textseite auf EUR-Lex (ohne Redirect über die Suchseite)
+EURLEX_HTML_URL = "https://eur-lex.europa.eu/legal-content/{language}/TXT/HTML/?uri={uri}"
+
+# Präfix des Aktenzeichens -> Dokumenttyp "Urteil" im CELEX-Sektor 6 (Rechtsprechung)
+CELEX_JUDGMENT_TYPES = {"C": "CJ", "T": "TJ", "F": "FJ"}
+
+# Gerichts-Kürzel in der ECLI (ECLI:EU:C:... = Gerichtshof, ECLI:EU:T:... = Gericht)
+ECLI_PATTERN = re.compile(r"^ECLI:EU:([CTF]):(\d{4}):(\d+)$")
+CASE_NO_PATTERN = re.compile(r"^(?:([CTF])-)?(\d+)/(\d{2})\b")
+CELEX_PATTERN = re.compile(r"CELEX(?::|%3A)\s*(6\d{4}[A-Z]{2}\d{4})")
+
+_celex_map_lock = threading.Lock()
+
+# Kandidat für den direkten Abruf: CELEX (oder None), URL und ob die URL sicher zur ECLI des Urteils gehört.
+# Aus dem Aktenzeichen abgeleitete CELEX-Nummern (immer Typ CJ/TJ/FJ) können auch auf einen anderen Beschluss
+# oder ein weiteres Urteil derselben Rechtssache zeigen und müssen über die ECLI in der Seite bestätigt werden.
+Candidate = namedtuple("Candidate", ["celex", "url", "confirmed"])
+
+# CELEX-Nummer eines Urteils aus dem Aktenzeichen, z. B. "C-123/21 P" -> "62021CJ0123".
+# Das Jahr im CELEX ist das Jahr der Einreichung (aus dem Aktenzeichen), nicht das der Entscheidung.
+def celex_from_case_no(case_no, court=None):
+    case_numbers = split_case_numbers(case_no)
+    if not case_numbers:
+        return None
+    match = CASE_NO_PATTERN.match(case_numbers[0])
+    if not match:
+        return None
+    prefix, number, year = match.groups()
+    # Alte Aktenzeichen ohne Präfix (z. B. "26/62") gehören zum Gerichtshof
+    prefix = prefix or court or "C"
+    year = int(year)
+    year += 1900 if year >= 50 else 2000
+    return f"6{year}{CELEX_JUDGMENT_TYPES[prefix]}{int(number):04d}"
+
+def eurlex_html_url(uri, language_code):
+    return EURLEX_HTML_URL.format(language=language_code.upper(), uri=uri)
+
+# Sucht eine CELEX-Nummer in einer EUR-Lex-Seite oder URL
+def find_celex(text):
+    match = CELEX_PATTERN.search(text or "")
+    return match.group(1) if match else None
+
+def load_celex_map(path=CELEX_MAP_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# Speichert eine bestätigte Zuordnung (neu laden, ergänzen, atomar ersetzen, damit parallele Läufe nichts verlieren)
+def remember_celex(ecli, celex, path=CELEX_MAP_FILE):
+    if not ecli or not celex:
+        return
+    with _celex_map_lock:
+        celex_map = load_celex_map(path)
+        if celex_map.get(ecli) == celex:
+            return
+        celex_map[ecli] = celex
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(celex_map, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+# Kandidaten (siehe Candidate) in der Reihenfolge, in der sie versucht werden:
+# bestätigte Zuordnung, dann die ECLI direkt, dann das CELEX aus dem Aktenzeichen (unbestätigt)
+def candidate_urls(ecli, case_no, language_code, celex_map=None):
+    ecli = (ecli or "").strip()
+    court = None
+    match = ECLI_PATTERN.match(ecli)
+    if match:
+        court = match.group(1)
+    else:
+        ecli = None
+
+    candidates = []
+    known_celex = (celex_map if celex_map is not None else load_celex_map()).get(ecli) if ecli else None
+    if known_celex:
+        candidates.append(Candidate(known_celex, eurlex_html_url(f"CELEX:{known_celex}", language_code), True))
+    if ecli:
+        candidates.append(Candidate(None, eurlex_html_url(f"ecli:{ecli}", language_code), True))
+    case_celex = celex_from_case_no(case_no, court) if case_no else None
+    if case_celex and case_celex != known_celex:
+        candidates.append(Candidate(case_celex, eurlex_html_url(f"CELEX:{case_celex}", language_code), False))
+    return candidates
@@ -52,5 +52,28 @@ DB_STRUCTURE = {
             'date_decided',
             'FULLTEXT(case_no)',   
         ]
+    },
+    # One row per case number of a judgment (maintained by the importers, see case_numbers.py)
+    'judgment_case_numbers': {
+        'columns': {
+            'judgment_id': 'BIGINT NOT NULL',
+            'case_no_normalized': 'VARCHAR(100) NOT NULL',
+            'position': 'SMALLINT NOT NULL',
+        },
+        'index': [
+            'PRIMARY KEY (judgment_id, case_no_normalized)',
+            '(case_no_normalized, position)',
+        ]
+    },
+    # Judgment texts in languages other than German (text_de); NULL text = no valid text (see judgment_queue.py)
+    'judgment_texts': {
+        'columns': {
+            'judgment_id': 'BIGINT NOT NULL',
+            'lang': 'VARCHAR(2) NOT NULL',
+            'text': 'MEDIUMTEXT NULL',
+        },
+        'index': [
+            'PRIMARY KEY (judgment_id, lang)',
+        ]
     }
 }
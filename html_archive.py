@@ -0,0 +1,67 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+# Archiv der Roh-HTML-Seiten, aus denen Urteilstexte erzeugt wurden. Inhalte liegen inhaltsadressiert (SHA-256)
+# und gzip-komprimiert unter objects/, jeder Abruf ist eine Zeile in index.jsonl (URL, Sprache, Abrufzeit, ...).
+# Damit lässt sich text_de nach Änderungen an Extraktion oder Konvertierung ohne neue Abrufe neu erzeugen.
+ARCHIVE_DIRECTORY = "html_archive"
+INDEX_FILE = "index.jsonl"
+
+_index_lock = threading.Lock()
+
+def _object_path(directory, sha256):
+    return os.path.join(directory, "objects", sha256[:2], f"{sha256}.html.gz")
+
+# Speichert eine Seite im Archiv und hängt einen Eintrag an den Index an.
+# kind gibt an, mit welcher Extraktion der Text erzeugt wurde (z. B. "curia_document" oder "eurlex_document").
+def archive_page(url, content, language, kind, encoding=None, source_url=None, ecli=None, directory=ARCHIVE_DIRECTORY):
+    sha256 = hashlib.sha256(content).hexdigest()
+    path = _object_path(directory, sha256)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(content))
+        os.replace(tmp_path, path)
+
+    entry = {
+        "url": url,
+        "language": language,
+        "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        "sha256": sha256,
+        "kind": kind,
+        "encoding": encoding,
+        "source_url": source_url,
+        "ecli": ecli,
+    }
+    # Eine Zeile wird mit einem einzigen write im Append-Modus geschrieben, auch parallele Prozesse vermischen nichts
+    with _index_lock:
+        with open(os.path.join(directory, INDEX_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    return entry
+
+def read_page(entry, directory=ARCHIVE_DIRECTORY):
+    with gzip.open(_object_path(directory, entry["sha256"]), "rb") as f:
+        return f.read()
+
+def load_index(directory=ARCHIVE_DIRECTORY):
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# Neuester Eintrag je Urteil für eine Sprache, auffindbar über die ECLI und über die Ausgangs-URL (caselist_url)
+def latest_entries(language, directory=ARCHIVE_DIRECTORY):
+    latest = {}
+    for entry in load_index(directory):
+        if entry["language"] != language:
+            continue
+        for key in (("ecli", entry.get("ecli")), ("source_url", entry.get("source_url"))):
+            if key[1] and (key not in latest or entry["fetched_at"] >= latest[key]["fetched_at"]):
+                latest[key] = entry
+    return latest
@@ -0,0 +1,228 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from request_policy import get_request_policy
+from http_client import get_http_session
+
+# Gemeinsamer HTTP-Cache für alle Abrufe von curia und EUR-Lex.
+# Bodies liegen inhaltsadressiert (SHA-256) und gzip-komprimiert unter bodies/, je URL gibt es einen
+# kleinen Eintrag unter entries/ mit Validatoren (ETag, Last-Modified), Abrufzeit und Verweis auf den Body.
+HTTP_CACHE_DIRECTORY = "http_cache"
+HTTP_CACHE_TTL = 7 * 24 * 3600
+
+CachedRedirect = namedtuple("CachedRedirect", ["status_code", "url"])
+
+# Antwortobjekt mit den Attributen, die die Fetcher von requests.Response nutzen
+class CachedResponse:
+    def __init__(self, status_code, url, content, encoding, history=(), from_cache=False):
+        self.status_code = status_code
+        self.url = url
+        self.content = content
+        self.encoding = encoding
+        self.history = list(history)
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(
+            response.status_code,
+            response.url,
+            response.content,
+            response.encoding or response.apparent_encoding,
+            [CachedRedirect(r.status_code, r.url) for r in response.history],
+        )
+
+# Führt gleichzeitige Aufrufe mit demselben Schlüssel zu einem einzigen Aufruf zusammen (Single-Flight)
+class _SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func):
+        with self.lock:
+            future = self.calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self.calls[key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+class HttpCache:
+    def __init__(self, directory=HTTP_CACHE_DIRECTORY, ttl=HTTP_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self.single_flight = _SingleFlight()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _entry_path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "entries", digest[:2], f"{digest}.json")
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.directory, "bodies", body_hash[:2], f"{body_hash}.gz")
+
+    # Schreibt atomar (temporäre Datei je Prozess und Thread, dann ersetzen), damit parallele Läufe sich nicht stören
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _load_entry(self, key):
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_entry(self, key, entry):
+        self._write_atomic(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+    def _load_body(self, body_hash):
+        try:
+            with gzip.open(self._body_path(body_hash), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _save_body(self, content):
+        body_hash = hashlib.sha256(content).hexdigest()
+        path = self._body_path(body_hash)
+        # Gleicher Inhalt (z. B. verbundene Rechtssachen mit derselben Seite) wird nur einmal gespeichert
+        if not os.path.exists(path):
+            self._write_atomic(path, gzip.compress(content))
+        return body_hash
+
+    # GET mit Cache: innerhalb der TTL ohne Netzwerk, danach bedingter GET (304 = Body aus dem Cache).
+    # Nur Antworten mit Status 200 werden gespeichert. Ohne timeout gilt DEFAULT_TIMEOUT der Session (http_client).
+    def get(self, url, headers=None, session=None, timeout=None):
+        headers = dict(headers or {})
+        key = "GET " + url + "\n" + json.dumps(headers, sort_keys=True)
+        return self.single_flight.do(key, lambda: self._get(key, url, headers, session or get_http_session(), timeout))
+
+    def _get(self, key, url, headers, session, timeout):
+        entry = self._load_entry(key)
+        content = self._load_body(entry["body"]) if entry else None
+        if content is not None and time.time() - entry["fetched_at"] < self.ttl:
+            self.hits += 1
+            return self._to_response(entry, content)
+
+        request_headers = dict(headers)
+        if content is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        # Nur echte Abrufe laufen über die Abrufregeln des Hosts (Rate, Wiederholungen, Pause), Treffer nicht
+        response = get_request_policy().request(
+            url, lambda: session.get(url, headers=request_headers, allow_redirects=True, timeout=timeout)
+        )
+        if response.status_code == 304 and content is not None:
+            self.revalidated += 1
+            entry["fetched_at"] = time.time()
+            self._save_entry(key, entry)
+            return self._to_response(entry, content)
+
+        self.misses += 1
+        if response.status_code != 200:
+            return CachedResponse.from_response(response)
+
+        cached = CachedResponse.from_response(response)
+        self._save_entry(key, {
+            "url": url,
+            "final_url": cached.url,
+            "status_code": cached.status_code,
+            "encoding": cached.encoding,
+            "history": [list(r) for r in cached.history],
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body": self._save_body(cached.content),
+        })
+        return cached
+
+    def _to_response(self, entry, content):
+        history = [CachedRedirect(*r) for r in entry["history"]]
+        return CachedResponse(entry["status_code"], entry["final_url"], content, entry["encoding"], history, from_cache=True)
+
+    # Speichert abgeleitete Werte (z. B. die ECLI einer Fallseite), damit die Seite gar nicht mehr geladen werden muss.
+    # None wird nicht gespeichert; ttl=None bedeutet unbegrenzt gültig.
+    def memoize(self, key, compute, ttl=None):
+        key = "VALUE " + key
+        return self.single_flight.do(key, lambda: self._memoize(key, compute, ttl))
+
+    def _memoize(self, key, compute, ttl):
+        entry = self._load_entry(key)
+        if entry and (ttl is None or time.time() - entry["fetched_at"] < ttl):
+            self.hits += 1
+            return entry["value"]
+
+        self.misses += 1
+        value = compute()
+        if value is not None:
+            self._save_entry(key, {"value": value, "fetched_at": time.time()})
+        return value
+
+    # Löscht Einträge, die älter als max_age Sekunden sind, und danach alle nicht mehr referenzierten Bodies
+    def prune(self, max_age):
+        now = time.time()
+        referenced = set()
+        removed = 0
+        entries_directory = os.path.join(self.directory, "entries")
+        for root, _, files in os.walk(entries_directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if now - entry.get("fetched_at", 0) > max_age:
+                    os.remove(path)
+                    removed += 1
+                elif "body" in entry:
+                    referenced.add(entry["body"])
+
+        for root, _, files in os.walk(os.path.join(self.directory, "bodies")):
+            for name in files:
+                if name.endswith(".gz") and name[:-3] not in referenced:
+                    os.remove(os.path.join(root, name))
+        return removed
+
+    def report(self):
+        print(f"HTTP-Cache: {self.hits} Treffer, {self.revalidated} revalidiert (304), {self.misses} Abrufe")
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+# Gemeinsame Instanz je Prozess, damit Single-Flight über alle Fetcher hinweg greift
+def get_http_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
@@ -0,0 +1,136 @@
+import importlib.util
+import threading
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Gemeinsamer HTTP-Client aller Stufen: eine Session mit Keep-Alive-Pool je Host, Standard-Timeouts,
+# komprimierter Übertragung und optional HTTP/2 (über httpx, nur wenn installiert und eingeschaltet).
+
+# Header für direkte HTTP-Abrufe, wie ein normaler Browser
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko)'
+                  ' Chrome/112.0.0.0 Safari/537.36',
+    'Accept-Language': 'de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7'
+}
+
+# Brotli nur anbieten, wenn urllib3 bzw. httpx es auch dekodieren können
+BROTLI_AVAILABLE = any(importlib.util.find_spec(name) for name in ("brotli", "brotlicffi"))
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+# (Verbindungsaufbau, Lesen) in Sekunden, für alle Anfragen ohne eigenes timeout
+DEFAULT_TIMEOUT = (10, 60)
+
+# Anzahl der Hosts mit eigenem Pool und offene Verbindungen je Host
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 16
+
+# HTTP/2 für https (mehrere Anfragen über eine Verbindung); braucht "pip install httpx[http2]"
+HTTP2 = False
+
+# Session, die DEFAULT_TIMEOUT setzt, wenn der Aufrufer kein timeout angibt
+class _TimeoutSession(requests.Session):
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.default_timeout
+        return super().request(method, url, **kwargs)
+
+# Rohdaten einer gestreamten httpx-Antwort in der Form, die requests.Response.iter_content erwartet
+class _Http2Body:
+    def __init__(self, response):
+        self.response = response
+        self.chunks = None
+
+    def stream(self, amt=None, decode_content=True):
+        yield from self.response.iter_bytes(amt)
+
+    def read(self, amt=None, decode_content=True):
+        if amt is None:
+            return self.response.read()
+        if self.chunks is None:
+            self.chunks = self.response.iter_bytes(amt)
+        return next(self.chunks, b"")
+
+    def close(self):
+        self.response.close()
+
+    def release_conn(self):
+        self.response.close()
+
+# Transport-Adapter, der Anfragen einer requests-Session über einen httpx-Client mit HTTP/2 sendet.
+# Redirects, Cookies und Header bleiben Sache der Session; httpx dekodiert gzip/br selbst.
+class Http2Adapter(BaseAdapter):
+    def __init__(self, pool_maxsize=POOL_MAXSIZE):
+        super().__init__()
+        import httpx
+
+        self.httpx = httpx
+        self.client = httpx.Client(
+            http2=True,
+            follow_redirects=False,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+        )
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self.httpx.Timeout(read, connect=connect)
+        return self.httpx.Timeout(timeout)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        # Verbindungsbezogene Header gibt es in HTTP/2 nicht
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in ("connection", "keep-alive")}
+        httpx_request = self.client.build_request(
+            request.method, request.url, headers=headers, content=request.body,
+            timeout=self._timeout(timeout),
+        )
+        try:
+            httpx_response = self.client.send(httpx_request, stream=stream)
+        except self.httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except self.httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.reason = httpx_response.reason_phrase
+        response.headers = CaseInsensitiveDict(httpx_response.headers.multi_items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = _Http2Body(httpx_response)
+        if not stream:
+            response._content = httpx_response.read()
+            httpx_response.close()
+        return response
+
+    def close(self):
+        self.client.close()
+
+# Neue Session mit den gemeinsamen Einstellungen. Eigene Sessions brauchen Abläufe mit Cookies
+# (z. B. der JSF-Ajax-Request auf curia), alle anderen nutzen get_http_session().
+def create_session(pool_maxsize=POOL_MAXSIZE, http2=HTTP2, timeout=DEFAULT_TIMEOUT):
+    session = _TimeoutSession(timeout)
+    session.headers.update(BROWSER_HEADERS)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", Http2Adapter(pool_maxsize) if http2 else adapter)
+    return session
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+# Gemeinsame Session je Prozess, damit Verbindungen über alle Fetcher und Worker hinweg wiederverwendet werden
+def get_http_session():
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = create_session()
+        return _default_session
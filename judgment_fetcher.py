@@ -0,0 +1,649 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from bs4 import BeautifulSoup, CData, NavigableString
+import time
+import sys
+from urllib.parse import urljoin, urlparse, urlunparse
+import re
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from http_cache import get_http_cache
+from browser_pool import get_browser_pool
+from eurlex_resolver import candidate_urls, find_celex, remember_celex
+from html_archive import archive_page, read_page, ARCHIVE_DIRECTORY
+from markdown_converter import convert, DEFAULT_BACKEND
+from request_policy import get_request_policy, TransientError
+from http_client import create_session, BROWSER_HEADERS
+
+# Funktion zur URL-Umwandlung für curia.europa.eu (bleibt unverändert)
+def modify_url_curia(url):
+    print("Modifying curia.europa.eu URL...", file=sys.stderr)
+    modified_url = url.replace('liste.jsf', 'documents.jsf')
+    print(f"Modified curia.europa.eu URL: {modified_url}", file=sys.stderr)
+    return modified_url
+
+# Selektor der Dokumententabelle auf documents.jsf und maximale Wartezeit, bis sie gerendert ist
+DOCUMENTS_TABLE_SELECTOR = "table.detail_table_documents"
+RENDER_TIMEOUT = 15  # Sekunden
+
+# Funktion zum Abrufen des Inhalts mit Selenium für curia.europa.eu (Browser aus dem gemeinsamen Pool).
+# Wartet, bis wait_selector im DOM ist, statt einer festen Wartezeit. Mit table_only=True wird nur das
+# outerHTML dieses Elements per JavaScript zurückgegeben statt der gesamten page_source.
+def fetch_rendered_html_selenium(url, wait_selector=DOCUMENTS_TABLE_SELECTOR, timeout=RENDER_TIMEOUT, table_only=False):
+    try:
+        with get_browser_pool().browser() as driver:
+            try:
+                # Auch der Browser hält sich an Rate und Pause des Hosts
+                get_request_policy().acquire(url)
+                print(f"Opening URL in Selenium: {url}", file=sys.stderr)
+                start = time.perf_counter()
+                driver.get(url)
+
+                print(f"Waiting up to {timeout} seconds for '{wait_selector}'...", file=sys.stderr)
+                element = WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                )
+                print(f"'{wait_selector}' after {time.perf_counter() - start:.2f} seconds available.", file=sys.stderr)
+
+                if table_only:
+                    print("Extracting outerHTML of the table with Selenium...", file=sys.stderr)
+                    rendered_html = driver.execute_script("return arguments[0].outerHTML;", element)
+                else:
+                    print("Extracting page source with Selenium...", file=sys.stderr)
+                    rendered_html = driver.page_source
+                print("HTML extracted successfully with Selenium.", file=sys.stderr)
+                return rendered_html
+
+            except TimeoutException:
+                print(f"'{wait_selector}' wurde nicht innerhalb von {timeout} Sekunden gefunden.", file=sys.stderr)
+                save_error_page(driver)
+                return None
+
+            except TransientError:
+                raise
+            except Exception as e:
+                print(f"Fehler beim Abrufen der gerenderten HTML mit Selenium: {e}", file=sys.stderr)
+                save_error_page(driver)
+                return None
+
+    except TransientError:
+        raise
+    except Exception as e:
+        print(f"Fehler beim Verwenden des WebDrivers: {e}", file=sys.stderr)
+        return None
+
+# Speichern Sie den HTML-Inhalt zur weiteren Analyse
+def save_error_page(driver):
+    rendered_html = driver.page_source
+    with open("error_rendered_page_curia.html", "w", encoding='utf-8') as f:
+        f.write(rendered_html)
+    print("Speichere den gerenderten HTML-Inhalt zur Fehleranalyse als 'error_rendered_page_curia.html'.", file=sys.stderr)
+
+# Zähler, wie oft die Tabelle ohne Browser (http), nur mit Selenium (selenium) oder gar nicht (failed) geladen wurde
+TABLE_FETCH_STATS = {"http": 0, "selenium": 0, "failed": 0}
+_table_fetch_stats_lock = threading.Lock()
+
+def _count_table_fetch(kind):
+    with _table_fetch_stats_lock:
+        TABLE_FETCH_STATS[kind] += 1
+
+def report_table_fetch_stats():
+    total = sum(TABLE_FETCH_STATS.values())
+    print(
+        f"Dokumententabelle: {TABLE_FETCH_STATS['http']} per HTTP, {TABLE_FETCH_STATS['selenium']} per Selenium, "
+        f"{TABLE_FETCH_STATS['failed']} fehlgeschlagen (insgesamt {total})",
+        file=sys.stderr,
+    )
+
+# Sucht die Tabelle 'detail_table_documents' in einem HTML-Fragment und gibt sie formatiert zurück
+def extract_documents_table(html_content):
+    soup = BeautifulSoup(html_content, 'html.parser')
+    table_element = soup.find('table', class_='detail_table_documents')
+    return table_element.prettify() if table_element else None
+
+# Bildet den JSF-Ajax-Request nach, den das JavaScript von documents.jsf absetzt:
+# alle Felder des Formulars inklusive javax.faces.ViewState, gesendet als "partial/ajax" an die action des Formulars
+def _post_jsf_partial(session, page_url, html_content, timeout):
+    soup = BeautifulSoup(html_content, 'html.parser')
+    view_state = soup.find('input', attrs={'name': 'javax.faces.ViewState'})
+    form = view_state.find_parent('form') if view_state else None
+    if not form:
+        return None
+
+    form_id = form.get('id') or form.get('name')
+    data = {field['name']: field.get('value', '') for field in form.find_all('input', attrs={'name': True})
+            if field.get('type', 'text').lower() in ('hidden', 'text')}
+    data.update({
+        'javax.faces.partial.ajax': 'true',
+        'javax.faces.source': form_id,
+        'javax.faces.partial.execute': '@all',
+        'javax.faces.partial.render': '@all',
+        form_id: form_id,
+    })
+    headers = {'Faces-Request': 'partial/ajax', 'X-Requested-With': 'XMLHttpRequest'}
+    action_url = urljoin(page_url, form.get('action') or page_url)
+    response = get_request_policy().request(
+        action_url, lambda: session.post(action_url, data=data, headers=headers, timeout=timeout)
+    )
+    if response.status_code != 200:
+        return None
+
+    # Die partial-response enthält das neue HTML in CDATA-Abschnitten der <update>-Elemente
+    updates = re.findall(r'<!\[CDATA\[(.*?)\]\]>', response.text, re.S)
+    return '\n'.join(updates) if updates else response.text
+
+# Versucht, die Dokumententabelle ohne Browser zu laden: erst direkter GET, dann der JSF-Ajax-Request.
+# Eigene Session, weil der Ajax-Request das Session-Cookie des GET braucht.
+def fetch_table_html_http(url, timeout=30):
+    with create_session() as session:
+        response = get_request_policy().request(url, lambda: session.get(url, timeout=timeout))
+        if response.status_code != 200:
+            print(f"HTTP-Abruf von documents.jsf fehlgeschlagen. Statuscode: {response.status_code}", file=sys.stderr)
+            return None
+
+        table_html = extract_documents_table(response.text)
+        if table_html:
+            return table_html
+
+        print("Tabelle nicht im statischen HTML, versuche JSF-Ajax-Request...", file=sys.stderr)
+        partial_html = _post_jsf_partial(session, response.url, response.text, timeout)
+        return extract_documents_table(partial_html) if partial_html else None
+
+# Funktion zum Abrufen des HTML-Inhalts der Tabelle für curia.europa.eu: zuerst per HTTP, Selenium nur als Fallback
+def fetch_table_html(url):
+    modified_url = modify_url_curia(url)
+
+    print("Fetching documents table per HTTP für curia.europa.eu...", file=sys.stderr)
+    try:
+        table_html = fetch_table_html_http(modified_url)
+    except requests.exceptions.RequestException as e:
+        print(f"Fehler beim HTTP-Abruf der Tabelle: {e}", file=sys.stderr)
+        table_html = None
+    if table_html:
+        print("Table per HTTP gefunden! Kein Browser nötig.", file=sys.stderr)
+        _count_table_fetch("http")
+        return table_html
+
+    print("Fetching rendered HTML für curia.europa.eu...", file=sys.stderr)
+    rendered_html = fetch_rendered_html_selenium(modified_url, table_only=True)
+
+    if rendered_html:
+        print("Parsing rendered HTML für curia.europa.eu...", file=sys.stderr)
+        table_html = extract_documents_table(rendered_html)
+        if table_html:
+            print("Table gefunden! HTML erfolgreich extrahiert.", file=sys.stderr)
+            _count_table_fetch("selenium")
+            return table_html
+        else:
+            print("Table mit der Klasse 'detail_table_documents' nicht gefunden.", file=sys.stderr)
+    else:
+        print("Fehler beim Abrufen der gerenderten HTML für curia.europa.eu.", file=sys.stderr)
+    _count_table_fetch("failed")
+    return None
+
+# Funktion zum Extrahieren aller Links der gewünschten Sprachen aus einer einzigen Dokumententabelle:
+# Sprache -> Liste der Links
+def extract_language_links(html_content, target_languages):
+    print("Parsing HTML mit BeautifulSoup...", file=sys.stderr)
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    print("Suche nach Zeilen, die 'Judgment' und 'ECLI' enthalten...", file=sys.stderr)
+    rows = soup.find_all('tr', class_='table_document_ligne')
+
+    wanted = {language.lower(): language for language in target_languages}
+    language_links = {language: [] for language in target_languages}  # Alle passenden Links je Sprache
+
+    for index, row in enumerate(rows):
+        print(f"Überprüfe Zeile {index + 1}...", file=sys.stderr)
+        doc_cell = row.find('td', class_='table_cell_doc')
+
+        if doc_cell and 'Judgment' in doc_cell.text and 'ECLI' in doc_cell.text:
+            print(f"Zeile {index + 1} enthält 'Judgment' und 'ECLI'. Suche nach Link-Listen...", file=sys.stderr)
+            link_lists = row.find_all('ul')
+
+            found = set()
+            for list_index, link_list in enumerate(link_lists):
+                links = link_list.find_all('a', href=True)
+
+                for link in links:
+                    language = link.text.strip()
+                    if language.lower() in wanted:
+                        print(f"Gefundener Link für Sprache '{language}': {link['href']}", file=sys.stderr)
+                        language_links[wanted[language.lower()]].append(link['href'])
+                        found.add(language.lower())
+
+            for language in wanted.keys() - found:
+                print(f"Kein Link für Sprache '{wanted[language]}' in Zeile {index + 1} gefunden.", file=sys.stderr)
+        else:
+            print(f"Zeile {index + 1} enthält nicht 'Judgment' und 'ECLI'.", file=sys.stderr)
+
+    for language, links in language_links.items():
+        if links:
+            print(f"Gefunden: {len(links)} Link(s) für Sprache '{language}'.", file=sys.stderr)
+        else:
+            print(f"Keine Links für Sprache '{language}' in 'Judgment' Zeilen gefunden.", file=sys.stderr)
+
+    return language_links
+
+# Funktion zum Abrufen des Inhalts von "document_content" mit requests für curia.europa.eu (bleibt unverändert)
+def fetch_document_content(url):
+    print(f"Fetching content von: {url}", file=sys.stderr)
+    # Die Header gehören zum Cache-Schlüssel, Accept-Encoding und Keep-Alive kommen von der gemeinsamen Session
+    response = get_http_cache().get(url, headers=BROWSER_HEADERS)
+
+    if response.status_code == 200:
+        print("Seite erfolgreich abgerufen. Parsing Content...", file=sys.stderr)
+        document_content, text_length = parse_document_content(response.text)
+        return document_content, text_length, FetchedPage(response.url, response.content, response.encoding)
+    else:
+        print(f"Fehler beim Abrufen der Seite. Statuscode: {response.status_code}", file=sys.stderr)
+        return None, 0, None
+
+# Sucht das div 'document_content' einer curia-Dokumentseite
+def parse_document_content(html):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    document_content = soup.find('div', id='document_content')
+    if document_content:
+        text_length = len(document_content.get_text(strip=True))
+        print(f"'document_content' Länge: {text_length} Zeichen.", file=sys.stderr)
+        return document_content, text_length
+    else:
+        print("Kein 'document_content' div auf der Seite gefunden.", file=sys.stderr)
+        return None, 0
+
+# Die ersten count Zeilen eines Texts, ohne den ganzen Text in Zeilen aufzuteilen
+def first_lines(text, count):
+    end = -1
+    for _ in range(count):
+        end = text.find('\n', end + 1)
+        if end == -1:
+            return text
+    return text[:end]
+
+# Text ab einem Element bis zum Dokumentende, wie get_text(separator='\n'): next_elements läuft das Dokument
+# ab dem Element einmal in Dokumentreihenfolge durch (erst die eigenen Nachfahren, dann alles Folgende).
+# Reine Leerraum-Knoten zwischen Tags werden wie bei der bisherigen Serialisierung der Folgeelemente ausgelassen.
+def text_from_element_onwards(element):
+    strings = [str(node) for node in element.next_elements
+               if type(node) in (NavigableString, CData) and not node.isspace()]
+    return '\n'.join(strings).strip()
+
+# Folgt den Redirects der EUR-Lex-URL und fügt '/HTML/' nach '/TXT/' ein; None bei einem Fehler
+def _resolve_eurlex_html_url(url, headers):
+    # Führen Sie die erste Anfrage mit requests durch, um Redirects zu verfolgen
+    print("Führe initialen requests.get aus, um Redirects zu verfolgen...", file=sys.stderr)
+    try:
+        initial_response = get_http_cache().get(url, headers=headers)
+    except TransientError:
+        raise
+    except Exception as e:
+        print(f"Fehler bei der initialen requests.get: {e}", file=sys.stderr)
+        return None
+
+    # Loggen Sie alle Redirects
+    if initial_response.history:
+        print("Redirect-Historie:", file=sys.stderr)
+        for resp in initial_response.history:
+            print(f"{resp.status_code} -> {resp.url}", file=sys.stderr)
+        print(f"Endgültige URL: {initial_response.url}", file=sys.stderr)
+    else:
+        print("Keine Redirects gefunden.", file=sys.stderr)
+
+    # Überprüfen Sie, ob die endgültige URL HTTPS verwendet
+    parsed_final_url = urlparse(initial_response.url)
+    if parsed_final_url.scheme != 'https':
+        print(f"Endgültige URL verwendet nicht HTTPS: {initial_response.url}", file=sys.stderr)
+    else:
+        print(f"Endgültige URL verwendet HTTPS: {initial_response.url}", file=sys.stderr)
+
+    # Modifizieren Sie die endgültige URL, indem Sie '/HTML/' nach '/TXT/' einfügen
+    path_parts = parsed_final_url.path.split('/')
+    try:
+        txt_index = path_parts.index('TXT')  # Suche nach 'TXT' im Pfad
+        # Füge 'HTML' direkt nach 'TXT' ein
+        path_parts.insert(txt_index + 1, 'HTML')
+        new_path = '/'.join(path_parts)
+        modified_final_url = urlunparse(parsed_final_url._replace(path=new_path))
+        print(f"Modifizierte endgültige URL: {modified_final_url}", file=sys.stderr)
+    except ValueError:
+        print("'TXT' nicht im Pfad der endgültigen URL gefunden. Keine Modifikation vorgenommen.", file=sys.stderr)
+        modified_final_url = initial_response.url
+
+    return modified_final_url
+
+# Neue Funktion zum dynamischen Abrufen des richtigen Dokumentinhalts für eur-lex.europa.eu mit requests
+def fetch_eurlex_document_content(url, target_language="German"):
+    print("Verarbeite eur-lex.europa.eu URL...", file=sys.stderr)
+    headers = BROWSER_HEADERS
+
+    # Direkte TXT/HTML-URLs (z. B. aus dem CELEX-Resolver) brauchen keinen initialen Abruf mit Redirects
+    if '/TXT/HTML/' in urlparse(url).path:
+        modified_final_url = url
+    else:
+        modified_final_url = _resolve_eurlex_html_url(url, headers)
+        if modified_final_url is None:
+            return None, 0, None
+
+    # Abrufen des Inhalts der modifizierten URL
+    print(f"Rufe Inhalt der modifizierten URL ab: {modified_final_url}", file=sys.stderr)
+    try:
+        content_response = get_http_cache().get(modified_final_url, headers=headers)
+    except TransientError:
+        raise
+    except Exception as e:
+        print(f"Fehler beim Abrufen der modifizierten URL: {e}", file=sys.stderr)
+        return None, 0, None
+
+    if content_response.status_code != 200:
+        print(f"Fehler beim Abrufen der modifizierten URL. Statuscode: {content_response.status_code}", file=sys.stderr)
+        return None, 0, None
+
+    document_text, text_length = parse_eurlex_document(content_response.text, target_language)
+    return document_text, text_length, FetchedPage(content_response.url, content_response.content, content_response.encoding)
+
+# Extrahiert den Urteilstext aus einer EUR-Lex-Textseite (erkannt am Wort für "Urteil" in der Zielsprache)
+def parse_eurlex_document(html, target_language="German"):
+    marker = JUDGMENT_MARKERS.get(target_language, JUDGMENT_MARKERS["German"])
+    # Parsen des Inhalts
+    print("Parsing des Inhalts der modifizierten URL...", file=sys.stderr)
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Entfernen des Elements mit id="banner"
+    banner = soup.find(id="banner")
+    if banner:
+        print("Entferne das Element mit id='banner'...", file=sys.stderr)
+        banner.decompose()
+    else:
+        print("Kein Element mit id='banner' gefunden.", file=sys.stderr)
+
+    # Extrahieren der ersten dreißig Zeilen
+    text = soup.get_text(separator='\n').strip()
+    first_thirty_lines = first_lines(text, 30).lower()
+    print(f"Erste dreißig Zeilen: {first_thirty_lines}", file=sys.stderr)
+
+    if marker in first_thirty_lines:
+        print(f"'{marker}' in den ersten dreißig Zeilen gefunden.", file=sys.stderr)
+        text_length = len(text)
+        print(f"Länge des Textes: {text_length} Zeichen.", file=sys.stderr)
+        if text_length >= 2000:
+            print("Textlänge erfüllt die Mindestanforderung von 2000 Zeichen.", file=sys.stderr)
+            return text, text_length
+        else:
+            print(f"Textlänge ist zu kurz: {text_length} Zeichen.", file=sys.stderr)
+            return None, text_length
+    else:
+        print(f"'{marker}' nicht in den ersten dreißig Zeilen gefunden. Suche nach <a> Tag mit id='judgment'...", file=sys.stderr)
+        judgment_tag = soup.find('a', id='judgment')
+        if judgment_tag:
+            print("<a> Tag mit id='judgment' gefunden.", file=sys.stderr)
+            # Extrahieren des gesamten Inhalts nach dem <a id='judgment'> Tag inklusive des <a> Tags selbst
+            # Finden der Eltern des <a> Tags, um den relevanten Kontext zu erhalten
+            judgment_parent = judgment_tag.find_parent()
+
+            if judgment_parent:
+                print("Finde Eltern-Tag des <a id='judgment'> Tags...", file=sys.stderr)
+                # Extrahiere den Text des Eltern-Tags und aller folgenden Elemente (ein Durchlauf, ohne erneutes Parsen)
+                judgment_text = text_from_element_onwards(judgment_parent)
+                judgment_text_lower = judgment_text.lower()
+                print(f"Länge des gefundenen Urteils: {len(judgment_text)} Zeichen.", file=sys.stderr)
+                if marker in judgment_text_lower and len(judgment_text) >= 2000:
+                    print("Gefundenes Urteil erfüllt die Anforderungen.", file=sys.stderr)
+                    return judgment_text, len(judgment_text)
+                else:
+                    print("Gefundenes Urteil erfüllt nicht die Anforderungen.", file=sys.stderr)
+                    return None, 0
+            else:
+                print("Eltern-Tag des <a id='judgment'> Tags nicht gefunden.", file=sys.stderr)
+                return None, 0
+        else:
+            print("<a> Tag mit id='judgment' nicht gefunden.", file=sys.stderr)
+            return None, 0
+
+# Funktion zur Konvertierung von HTML nach Markdown (Backends siehe markdown_converter)
+def convert_html_to_markdown(html_content, backend=DEFAULT_BACKEND):
+    print("Konvertiere HTML zu Markdown...", file=sys.stderr)
+    return convert(str(html_content), backend)
+
+# Mindestlänge eines gültigen Urteilstexts in Zeichen
+MIN_TEXT_LENGTH = 2000
+
+# Status eines Abrufs: Text gefunden, Text zu kurz, kein Link/Dokument für die Sprache, Fehler.
+# TRANSIENT: Host überlastet oder pausiert (siehe request_policy), das Urteil wird später erneut versucht.
+FOUND = "found"
+TOO_SHORT = "too_short"
+NO_LINK = "no_link"
+ERROR = "error"
+TRANSIENT = "transient"
+
+# Ergebnis von fetch_judgment: status (siehe oben), text (Markdown, nur bei FOUND) und eine kurze Meldung.
+# Bei FOUND außerdem die Quellseite (page) und die verwendete Extraktion (kind) für das HTML-Archiv.
+JudgmentResult = namedtuple("JudgmentResult", ["status", "text", "message", "page", "kind"], defaults=(None, None))
+
+# Abgerufene Rohseite: endgültige URL, Bytes und Zeichenkodierung
+FetchedPage = namedtuple("FetchedPage", ["url", "content", "encoding"])
+
+# Gleichzeitige Dokument-Downloads beim Abruf mehrerer Sprachen
+DOCUMENT_WORKERS = 4
+
+# Extraktionsarten der archivierten Seiten
+CURIA_DOCUMENT = "curia_document"
+EURLEX_DOCUMENT = "eurlex_document"
+
+# Sprachcode-Mapping
+LANGUAGE_CODES = {
+    'German': 'de',
+    'English': 'en',
+    'French': 'fr',
+    'Spanish': 'es',
+    # Weitere Sprachen hinzufügen, falls erforderlich
+}
+
+# Wort für "Urteil" je Sprache (klein geschrieben), an dem parse_eurlex_document den Urteilstext erkennt
+JUDGMENT_MARKERS = {
+    'German': 'urteil',
+    'English': 'judgment',
+    'French': 'arrêt',
+    'Spanish': 'sentencia',
+}
+
+# Funktion zum Setzen von HTTPS und des 'lg' Parameters einer eur-lex.europa.eu URL
+def build_eurlex_url(url, target_language):
+    parsed_url = urlparse(url)
+    # Sicherstellen, dass die URL mit HTTPS beginnt
+    if parsed_url.scheme != 'https':
+        print("Ändere URL-Schema zu HTTPS...", file=sys.stderr)
+        parsed_url = parsed_url._replace(scheme='https')
+
+    # Sprachcode basierend auf target_language abrufen
+    language_code = LANGUAGE_CODES.get(target_language, 'en')  # Standardmäßig 'en' verwenden
+
+    # 'lg' Parameter ersetzen oder hinzufügen
+    query_string = parsed_url.query
+    if 'lg=' in query_string:
+        new_query_string = re.sub(r'lg=[^&]*', 'lg=' + language_code, query_string)
+    elif query_string:
+        new_query_string = query_string + '&lg=' + language_code
+    else:
+        new_query_string = 'lg=' + language_code
+
+    modified_url = urlunparse(parsed_url._replace(query=new_query_string))
+    print(f"Geänderte URL: {modified_url}", file=sys.stderr)
+    return modified_url
+
+# Konvertiert den gefundenen Inhalt und prüft die Mindestlänge des Markdown-Texts
+def _markdown_result(html_content, page=None, kind=None):
+    markdown_content = convert_html_to_markdown(html_content).strip()
+    if len(markdown_content) < MIN_TEXT_LENGTH:
+        return JudgmentResult(TOO_SHORT, None, f"Markdown-Text zu kurz ({len(markdown_content)} Zeichen).")
+    print("Markdown-Inhalt erfolgreich abgerufen.", file=sys.stderr)
+    return JudgmentResult(FOUND, markdown_content, f"Text gefunden ({len(markdown_content)} Zeichen).", page, kind)
+
+def _fetch_eurlex_judgment(url, target_language):
+    print("URL erkannt: eur-lex.europa.eu", file=sys.stderr)
+    document_text, text_length, page = fetch_eurlex_document_content(build_eurlex_url(url, target_language), target_language)
+    if document_text and text_length >= MIN_TEXT_LENGTH:
+        return _markdown_result(document_text, page, EURLEX_DOCUMENT)
+    if text_length:
+        return JudgmentResult(TOO_SHORT, None, f"Dokument für Sprache '{target_language}' zu kurz ({text_length} Zeichen).")
+    return JudgmentResult(ERROR, None, f"Kein geeignetes Dokument für Sprache '{target_language}' auf EUR-Lex gefunden.")
+
+# Rendert die Dokumententabelle einmal und lädt die Dokumente aller Sprachen gleichzeitig
+def _fetch_curia_judgments(url, target_languages, executor):
+    print("URL erkannt: curia.europa.eu", file=sys.stderr)
+    html_content = fetch_table_html(url)
+    if not html_content:
+        return {language: JudgmentResult(ERROR, None, "Fehler beim Abrufen des HTML-Inhalts für curia.europa.eu.")
+                for language in target_languages}
+
+    print("HTML-Inhalt abgerufen. Parsing startet...", file=sys.stderr)
+    links_by_language = extract_language_links(html_content, target_languages)
+    results = {}
+    futures = {}
+    for language, links in links_by_language.items():
+        if links:
+            futures[language] = executor.submit(_guarded, language, _first_valid_document, links, language)
+        else:
+            results[language] = JudgmentResult(NO_LINK, None, f"Keine Links für Sprache '{language}' gefunden.")
+    for language, future in futures.items():
+        results[language] = future.result()
+    return results
+
+# Erstes Dokument einer Sprache mit ausreichend langem Text
+def _first_valid_document(links, target_language):
+    for link_index, link in enumerate(links):
+        print(f"Verarbeite Link {link_index + 1}/{len(links)} ({target_language}): {link}", file=sys.stderr)
+        document_html, text_length, page = fetch_document_content(link)
+
+        if document_html and text_length >= MIN_TEXT_LENGTH:
+            print(f"Geeigneter Inhalt gefunden in Link {link_index + 1} mit {text_length} Zeichen.", file=sys.stderr)
+            return _markdown_result(document_html, page, CURIA_DOCUMENT)
+        elif document_html:
+            print(f"Inhalt in Link {link_index + 1} ist zu kurz ({text_length} Zeichen). Suche weiter...", file=sys.stderr)
+        else:
+            print(f"Inhalt von Link {link_index + 1} konnte nicht abgerufen werden. Suche weiter...", file=sys.stderr)
+
+    return JudgmentResult(TOO_SHORT, None, f"Kein Dokument mit mindestens {MIN_TEXT_LENGTH} Zeichen für Sprache '{target_language}' gefunden.")
+
+# Direkter Weg über EUR-Lex: CELEX-/ECLI-URLs aus ECLI und Aktenzeichen, ohne curia-Rendering und ohne Redirect.
+# Gibt None zurück, wenn kein Kandidat einen gültigen Text liefert.
+def _fetch_judgment_by_celex(ecli, case_no, target_language):
+    language_code = LANGUAGE_CODES.get(target_language, 'en')
+    ecli = (ecli or '').strip()
+    for celex, candidate_url, confirmed in candidate_urls(ecli, case_no, language_code):
+        # Ein aus dem Aktenzeichen abgeleitetes CELEX lässt sich nur über die ECLI des Urteils bestätigen
+        if not confirmed and not ecli:
+            print(f"Überspringe {candidate_url}: ohne ECLI nicht bestätigbar.", file=sys.stderr)
+            continue
+        print(f"Versuche EUR-Lex direkt: {candidate_url}", file=sys.stderr)
+        document_text, text_length, page = fetch_eurlex_document_content(candidate_url, target_language)
+        if document_text and text_length >= MIN_TEXT_LENGTH:
+            page_text = page.content.decode(page.encoding or 'utf-8', errors='replace')
+            if not confirmed and ecli.upper() not in page_text.upper():
+                print(f"{candidate_url} gehört nicht zu {ecli} (anderer Beschluss oder anderes Urteil), verworfen.", file=sys.stderr)
+                continue
+            if ecli and not celex:
+                celex = find_celex(page.url) or find_celex(page_text)
+            remember_celex(ecli, celex)
+            return _markdown_result(document_text, page, EURLEX_DOCUMENT)
+    return None
+
+# Ruft den Urteilstext im laufenden Prozess ab: zuerst direkt über EUR-Lex (falls ECLI oder Aktenzeichen
+# bekannt sind), danach wie bisher über die Caselist-URL (curia oder EUR-Lex).
+def fetch_judgment(url, target_language="German", ecli=None, case_no=None):
+    return fetch_judgments(url, [target_language], ecli=ecli, case_no=case_no)[target_language]
+
+# Wie fetch_judgment für mehrere Sprachen auf einmal (Sprache -> JudgmentResult). Die curia-Tabelle wird nur
+# einmal gerendert, die Dokumente der Sprachen werden gleichzeitig geladen.
+# Die Quellseite eines gefundenen Texts wird im HTML-Archiv abgelegt.
+def fetch_judgments(url, target_languages, ecli=None, case_no=None):
+    target_languages = list(dict.fromkeys(target_languages))
+    if not target_languages:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(DOCUMENT_WORKERS, len(target_languages))) as executor:
+        results = _fetch_judgments(url, target_languages, ecli, case_no, executor)
+
+    for language, result in results.items():
+        if result.status == FOUND and result.page:
+            try:
+                page = result.page
+                archive_page(page.url, page.content, language, result.kind, page.encoding, source_url=url, ecli=ecli)
+            except Exception as e:
+                print(f"Fehler beim Archivieren von {result.page.url}: {e}", file=sys.stderr)
+    return results
+
+# Führt den Abruf einer Sprache aus; eine Exception wird zum Ergebnis TRANSIENT bzw. ERROR
+def _guarded(language, function, *args):
+    try:
+        return function(*args)
+    except TransientError as e:
+        return JudgmentResult(TRANSIENT, None, f"Vorübergehender Fehler für Sprache '{language}': {e}")
+    except Exception as e:
+        return JudgmentResult(ERROR, None, f"Fehler beim Abrufen für Sprache '{language}': {e}")
+
+def _fetch_judgments(url, target_languages, ecli, case_no, executor):
+    results = {}
+    # Vorübergehende Fehler des direkten Wegs; sie gelten, falls auch die Caselist-URL keinen Text liefert
+    transient = {}
+    if ecli or case_no:
+        futures = {language: executor.submit(_guarded, language, _fetch_judgment_by_celex, ecli, case_no, language)
+                   for language in target_languages}
+        for language, future in futures.items():
+            result = future.result()
+            # Nur ein gefundener Text beendet die Suche; zu kurz, Fehler usw. gehen an die Caselist-URL
+            if result and result.status == FOUND:
+                results[language] = result
+            elif result and result.status == TRANSIENT:
+                transient[language] = result
+        if len(results) == len(target_languages):
+            return results
+        print("Kein Treffer über CELEX/ECLI, verwende die Caselist-URL...", file=sys.stderr)
+
+    remaining = [language for language in target_languages if language not in results]
+    results.update(_fetch_by_caselist_url(url, remaining, executor))
+    # Sonst würde ein endgültiges Ergebnis der Caselist-URL das Urteil dauerhaft als ohne Text markieren,
+    # obwohl EUR-Lex nur vorübergehend nicht erreichbar war
+    for language, result in transient.items():
+        if results[language].status != FOUND:
+            results[language] = result
+    return results
+
+# Fallback über die Caselist-URL (curia oder EUR-Lex) für die angegebenen Sprachen
+def _fetch_by_caselist_url(url, remaining, executor):
+    if not url:
+        return {language: JudgmentResult(NO_LINK, None, "Keine Caselist-URL vorhanden.") for language in remaining}
+    netloc = urlparse(url).netloc
+    if 'eur-lex.europa.eu' in netloc:
+        futures = {language: executor.submit(_guarded, language, _fetch_eurlex_judgment, url, language)
+                   for language in remaining}
+        return {language: future.result() for language, future in futures.items()}
+    if 'curia.europa.eu' in netloc:
+        try:
+            return _fetch_curia_judgments(url, remaining, executor)
+        except TransientError as e:
+            return {language: JudgmentResult(TRANSIENT, None, f"Vorübergehender Fehler bei {url}: {e}") for language in remaining}
+        except Exception as e:
+            return {language: JudgmentResult(ERROR, None, f"Fehler beim Abrufen von {url}: {e}") for language in remaining}
+    return {language: JudgmentResult(ERROR, None, f"Nicht unterstützte URL-Domain: {netloc}") for language in remaining}
+
+# Erzeugt den Text aus einer archivierten Seite neu (ohne Netzwerk); läuft auch in Worker-Prozessen
+def reconvert_page(entry, directory=ARCHIVE_DIRECTORY):
+    try:
+        html = read_page(entry, directory).decode(entry.get("encoding") or 'utf-8', errors='replace')
+        if entry["kind"] == CURIA_DOCUMENT:
+            document_html, text_length = parse_document_content(html)
+            if document_html and text_length >= MIN_TEXT_LENGTH:
+                return _markdown_result(document_html)
+        elif entry["kind"] == EURLEX_DOCUMENT:
+            document_text, text_length = parse_eurlex_document(html, entry["language"])
+            if document_text and text_length >= MIN_TEXT_LENGTH:
+                return _markdown_result(document_text)
+        else:
+            return JudgmentResult(ERROR, None, f"Unbekannte Extraktion: {entry['kind']}")
+        return JudgmentResult(TOO_SHORT, None, f"Archivierte Seite {entry['url']} liefert keinen gültigen Text.")
+    except Exception as e:
+        return JudgmentResult(ERROR, None, f"Fehler beim Neuerzeugen aus {entry['url']}: {e}")
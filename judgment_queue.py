@@ -0,0 +1,117 @@
+import os
+import socket
+
+# Urteile ohne Text werden von Workern (Threads, Prozesse, Hosts) in kleinen Batches beansprucht.
+# Ein Lease gilt LEASE_SECONDS; stürzt ein Worker ab, läuft der Lease ab und ein anderer Worker übernimmt das Urteil.
+LEASE_SECONDS = 15 * 60
+CLAIM_BATCH_SIZE = 5
+
+LEASE_COLUMNS = {
+    "text_lease_owner": "VARCHAR(64) NULL",
+    "text_lease_expires": "DATETIME NULL",
+}
+
+# Bedingung für Urteile, deren Text noch abgerufen werden muss (wie fetch_judgments_without_text)
+PENDING_CONDITION = """
+    text_de IS NULL
+    AND caselist_url IS NOT NULL
+    AND (no_valid_text_de IS NULL OR no_valid_text_de = FALSE)
+"""
+
+# Sprache von Judgments.text_de. Texte weiterer Sprachen liegen in judgment_texts, eine Zeile je Urteil und
+# Sprache; text NULL bedeutet, dass kein gültiger Text gefunden wurde (wie no_valid_text_de).
+TEXT_DE_LANGUAGE = "de"
+
+CREATE_JUDGMENT_TEXTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS judgment_texts (
+        judgment_id BIGINT NOT NULL,
+        lang VARCHAR(2) NOT NULL,
+        text MEDIUMTEXT NULL,
+        PRIMARY KEY (judgment_id, lang)
+    )
+"""
+
+# Bereits erledigte Sprachen eines Urteils (text_de bzw. Zeilen in judgment_texts), kommagetrennt
+DONE_LANGUAGES_COLUMN = """
+    CONCAT_WS(',',
+        IF(text_de IS NOT NULL OR no_valid_text_de = TRUE, 'de', NULL),
+        (SELECT GROUP_CONCAT(t.lang) FROM judgment_texts t WHERE t.judgment_id = Judgments.id))
+"""
+
+def ensure_judgment_texts_table(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_JUDGMENT_TEXTS_TABLE)
+    conn.commit()
+
+# Bedingung (SQL und Parameter) für Urteile, denen mindestens eine der Sprachen (Codes wie "de", "en") fehlt
+def pending_condition(language_codes):
+    conditions = []
+    params = []
+    if TEXT_DE_LANGUAGE in language_codes:
+        conditions.append(f"({PENDING_CONDITION})")
+    other_codes = [code for code in language_codes if code != TEXT_DE_LANGUAGE]
+    if other_codes:
+        placeholders = ", ".join(["%s"] * len(other_codes))
+        conditions.append(
+            f"""(caselist_url IS NOT NULL AND (
+                SELECT COUNT(*) FROM judgment_texts t WHERE t.judgment_id = Judgments.id AND t.lang IN ({placeholders})
+            ) < %s)"""
+        )
+        params += other_codes + [len(other_codes)]
+    return "(" + " OR ".join(conditions) + ")", params
+
+# Legt die Lease-Spalten an, falls sie fehlen (MySQL kennt kein ADD COLUMN IF NOT EXISTS)
+def ensure_lease_columns(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COLUMN_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Judgments' AND COLUMN_NAME IN %s
+            """,
+            (tuple(LEASE_COLUMNS),),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        for column, definition in LEASE_COLUMNS.items():
+            if column not in existing:
+                print(f"Lege Spalte Judgments.{column} an...")
+                cursor.execute(f"ALTER TABLE Judgments ADD COLUMN {column} {definition}")
+        if "text_lease_expires" not in existing:
+            cursor.execute("CREATE INDEX idx_text_lease_expires ON Judgments (text_lease_expires)")
+    conn.commit()
+
+# Eindeutiger Name eines Workers: Host, Prozess und Nummer des Threads
+def worker_name(worker_number):
+    return f"{socket.gethostname()}:{os.getpid()}:{worker_number}"[:64]
+
+# Beansprucht bis zu batch_size offene Urteile, deren Lease frei oder abgelaufen ist.
+# FOR UPDATE SKIP LOCKED (MySQL 8) überspringt Zeilen, die gerade ein anderer Worker beansprucht;
+# OF Judgments sperrt nur die Urteile, nicht die gelesenen Zeilen aus judgment_texts.
+def claim_judgments(conn, owner, batch_size=CLAIM_BATCH_SIZE, lease_seconds=LEASE_SECONDS, language_codes=(TEXT_DE_LANGUAGE,)):
+    condition, params = pending_condition(language_codes)
+    with conn.cursor() as cursor:
+        conn.begin()
+        cursor.execute(
+            f"""
+            SELECT id, caselist_url, ecli, case_no, {DONE_LANGUAGES_COLUMN}
+            FROM Judgments
+            WHERE {condition}
+              AND (text_lease_expires IS NULL OR text_lease_expires < NOW())
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE OF Judgments SKIP LOCKED
+            """,
+            params + [batch_size],
+        )
+        rows = cursor.fetchall()
+        if rows:
+            placeholders = ", ".join(["%s"] * len(rows))
+            cursor.execute(
+                f"""
+                UPDATE Judgments
+                SET text_lease_owner = %s, text_lease_expires = NOW() + INTERVAL %s SECOND
+                WHERE id IN ({placeholders})
+                """,
+                [owner, lease_seconds] + [row[0] for row in rows],
+            )
+        conn.commit()
+    return rows
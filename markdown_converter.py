@@ -0,0 +1,480 @@
+import io
+import re
+from textwrap import wrap
+import html2text  # Referenz-Implementierung
+from html2text.config import (RE_SPACE, RE_MD_BACKSLASH_MATCHER, RE_MD_DOT_MATCHER, RE_MD_PLUS_MATCHER,
+                              RE_MD_DASH_MATCHER)
+from html2text.utils import escape_md, skipwrap
+
+# Backends für die Umwandlung von Urteils-HTML in Markdown (Name -> Funktion html -> markdown, siehe MARKDOWN_BACKENDS).
+# "html2text" ist die bisherige Umwandlung und bleibt die Referenz. "lxml" parst das HTML in C, läuft den Baum
+# einmal durch und schreibt das Markdown direkt in einen Puffer; die Ausgabe folgt den Regeln von html2text
+# (Absätze, Hervorhebungen, Links, Listen, Tabellen, Escaping, Umbruch nach BODY_WIDTH Zeichen).
+DEFAULT_BACKEND = "lxml"
+BODY_WIDTH = 78
+
+WHITESPACE = re.compile(r"\s+")
+ABSOLUTE_URL = re.compile(r"^[a-zA-Z+]+://")
+# Zeichen, vor die nach dem Ende einer Hervorhebung ein Leerzeichen gesetzt wird (wie html2text)
+AFTER_STRESS = re.compile(r"[^][(){}\s.!?]")
+HEADINGS = {f"h{n}": n for n in range(1, 10)}
+QUIET_TAGS = {"head", "style", "script"}
+
+def convert_with_html2text(html):
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    h.body_width = BODY_WIDTH
+    return h.handle(html)
+
+# Schreibt das Markdown mit der Zeilen- und Leerraumlogik von html2text (o/p/pbr/soft_br) in einen Puffer,
+# der die Absätze fortlaufend umbricht
+class _MarkdownStream:
+    def __init__(self):
+        self.buffer = _ParagraphWriter()
+        self.last_was_nl = False
+        self.p_p = 0
+        self.space = False
+        self.start = True
+        self.br_toggle = ""
+        self.quiet = 0
+        self.blockquote = 0
+        self.pre = False
+        self.startpre = False
+        self.pre_indent = ""
+        self.code = False
+        self.stressed = False
+        self.preceding_stressed = False
+        self.preceding_data = ""
+        self.current_tag = ""
+        self.lists = []
+        self.last_was_list = False
+        self.list_code_indent = ""
+        self.astack = []
+        self.maybe_automatic_link = None
+        self.empty_link = False
+        self.split_next_td = False
+        self.td_count = 0
+        self.table_start = False
+
+    def out(self, text):
+        if text:
+            self.buffer.write(text)
+            self.last_was_nl = text[-1] == "\n"
+
+    def p(self):
+        self.p_p = 2
+
+    def pbr(self):
+        if self.p_p == 0:
+            self.p_p = 1
+
+    def soft_br(self):
+        self.pbr()
+        self.br_toggle = "  "
+
+    def o(self, data, puredata=False, force=False):
+        if self.quiet:
+            return
+        if puredata and not self.pre:
+            data = WHITESPACE.sub(" ", data)
+            if data and data[0] == " ":
+                self.space = True
+                data = data[1:]
+        if not data and not force:
+            return
+
+        if self.startpre and not data.startswith("\n"):
+            data = "\n" + data
+        bq = ">" * self.blockquote
+        if not (force and data and data[0] == ">") and self.blockquote:
+            bq += " "
+        if self.pre:
+            if self.lists:
+                bq += self.list_code_indent
+            bq += "    "
+            data = data.replace("\n", "\n" + bq)
+            self.pre_indent = bq
+        if self.startpre:
+            self.startpre = False
+            if self.lists:
+                data = data.lstrip("\n" + self.pre_indent)
+
+        if self.start:
+            self.space = False
+            self.p_p = 0
+            self.start = False
+        if force == "end":
+            self.p_p = 0
+            self.out("\n")
+            self.space = False
+        if self.p_p:
+            self.out((self.br_toggle + "\n" + bq) * self.p_p)
+            self.space = False
+            self.br_toggle = ""
+        if self.space:
+            if not self.last_was_nl:
+                self.out(" ")
+            self.space = False
+        self.p_p = 0
+        self.out(data)
+
+    def data(self, data):
+        if self.stressed:
+            data = data.strip()
+            self.stressed = False
+            self.preceding_stressed = True
+        elif self.preceding_stressed:
+            if (AFTER_STRESS.match(data[0]) and self.current_tag not in HEADINGS
+                    and self.current_tag not in ("a", "code", "pre")):
+                data = " " + data
+            self.preceding_stressed = False
+
+        if self.maybe_automatic_link is not None:
+            if self.maybe_automatic_link == data and ABSOLUTE_URL.match(data):
+                self.o("<" + data + ">")
+                self.empty_link = False
+                return
+            self.o("[")
+            self.maybe_automatic_link = None
+            self.empty_link = False
+
+        if not self.code and not self.pre:
+            data = _escape_section(data)
+        self.preceding_data = data
+        self.o(data, puredata=True)
+
+    def _stress(self, mark, start, needs_space):
+        if start and self.preceding_data and needs_space(self.preceding_data[-1]):
+            mark = " " + mark
+            self.preceding_data += " "
+        self.o(mark)
+        if start:
+            self.stressed = True
+
+    def tag(self, tag, element, start):
+        self.current_tag = tag
+
+        if (start and self.maybe_automatic_link is not None
+                and tag not in ("p", "div", "style", "dl", "dt", "img")):
+            self.o("[")
+            self.maybe_automatic_link = None
+            self.empty_link = False
+
+        level = HEADINGS.get(tag)
+        if level:
+            if self.astack:
+                if start:
+                    self.o("#" * level + " ")
+                else:
+                    self.p_p = 0
+                    return
+            else:
+                self.p()
+                if start:
+                    self.o("#" * level + " ")
+                else:
+                    return
+
+        if tag in ("p", "div"):
+            if not self.astack and not self.split_next_td:
+                self.p()
+        elif tag == "br":
+            if start:
+                self.o("  \n> " if self.blockquote > 0 else "  \n")
+        elif tag == "hr":
+            if start:
+                self.p()
+                self.o("* * *")
+                self.p()
+        elif tag in QUIET_TAGS:
+            self.quiet += 1 if start else -1
+        elif tag == "body":
+            self.quiet = 0
+        elif tag == "blockquote":
+            if start:
+                self.p()
+                self.o("> ", force=True)
+                self.start = True
+                self.blockquote += 1
+            else:
+                self.blockquote -= 1
+                self.p()
+        elif tag in ("em", "i", "u"):
+            self._stress("_", start, lambda c: not c.isspace() and not _is_punctuation(c))
+        elif tag in ("strong", "b"):
+            self._stress("**", start, lambda c: c == "*")
+        elif tag in ("del", "strike", "s"):
+            self._stress("~~", start, lambda c: c == "~")
+        elif tag in ("kbd", "code", "tt"):
+            if not self.pre:
+                self.o("`")
+                self.code = not self.code
+        elif tag == "q":
+            self.o('"')
+        elif tag == "a":
+            self._link(element, start)
+        elif tag == "img":
+            if start and element.get("src") is not None:
+                alt = element.get("alt") or ""
+                if self.maybe_automatic_link is not None:
+                    self.o("[")
+                    self.maybe_automatic_link = None
+                    self.empty_link = False
+                self.o("![" + escape_md(alt) + "]")
+                self.o("(" + escape_md(element.get("src")) + ")")
+        elif tag == "dl":
+            if start:
+                self.p()
+        elif tag == "dt":
+            if not start:
+                self.pbr()
+        elif tag == "dd":
+            if start:
+                self.o("    ")
+            else:
+                self.pbr()
+
+        if tag in ("ol", "ul"):
+            if not self.lists and not self.last_was_list:
+                self.p()
+            if start:
+                self.lists.append([tag, _list_start(element)])
+            elif self.lists:
+                self.lists.pop()
+                if not self.lists:
+                    self.o("\n")
+            self.last_was_list = True
+        else:
+            self.last_was_list = False
+
+        if tag == "li":
+            self._list_item(start)
+        elif tag in ("table", "tr", "td", "th"):
+            self._table(tag, start)
+        elif tag == "pre":
+            if start:
+                self.startpre = True
+                self.pre = True
+                self.pre_indent = ""
+            else:
+                self.pre = False
+            self.p()
+
+    def _link(self, element, start):
+        if start:
+            href = element.get("href")
+            if href is not None and not href.startswith("#"):
+                self.astack.append((href, element.get("title")))
+                self.maybe_automatic_link = href
+                self.empty_link = True
+            else:
+                self.astack.append(None)
+        elif self.astack:
+            link = self.astack.pop()
+            if self.maybe_automatic_link and not self.empty_link:
+                self.maybe_automatic_link = None
+            elif link:
+                href, title = link
+                if self.empty_link:
+                    self.o("[")
+                    self.empty_link = False
+                    self.maybe_automatic_link = None
+                self.p_p = 0
+                title = escape_md(title or "")
+                title = f' "{title}"' if title.strip() else ""
+                self.o(f"]({escape_md(href)}{title})")
+
+    def _list_item(self, start):
+        self.list_code_indent = ""
+        self.pbr()
+        if not start:
+            return
+        item = self.lists[-1] if self.lists else ["ul", 0]
+        parent = None
+        for name, _ in self.lists:
+            self.list_code_indent += "   " if parent == "ol" else "  "
+            parent = name
+        self.o(self.list_code_indent)
+        if item[0] == "ul":
+            self.list_code_indent += "  "
+            self.o("* ")
+        else:
+            item[1] += 1
+            self.list_code_indent += "   "
+            self.o(f"{item[1]}. ")
+        self.start = True
+
+    def _table(self, tag, start):
+        if tag == "table":
+            if start:
+                self.table_start = True
+            return
+        if tag in ("td", "th") and start:
+            if self.split_next_td:
+                self.o("| ")
+            self.split_next_td = True
+            self.td_count += 1
+        elif tag == "tr":
+            if start:
+                self.td_count = 0
+            else:
+                self.split_next_td = False
+                self.soft_br()
+                if self.table_start:
+                    self.o("|".join(["---"] * self.td_count))
+                    self.soft_br()
+                    self.table_start = False
+
+    def finish(self):
+        self.pbr()
+        self.o("", force="end")
+        return self.buffer.getvalue()
+
+# escape_md_section von html2text; die regulären Ausdrücke laufen nur, wenn ihr Zeichen überhaupt vorkommt
+def _escape_section(text):
+    if "\\" in text:
+        text = RE_MD_BACKSLASH_MATCHER.sub(r"\\\1", text)
+    if "." in text:
+        text = RE_MD_DOT_MATCHER.sub(r"\1\\\2", text)
+    if "+" in text:
+        text = RE_MD_PLUS_MATCHER.sub(r"\1\\\2", text)
+    if "-" in text:
+        text = RE_MD_DASH_MATCHER.sub(r"\1\\\2", text)
+    return text
+
+def _is_punctuation(char):
+    return char in '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
+
+def _list_start(element):
+    try:
+        return int(element.get("start", 1)) - 1
+    except ValueError:
+        return 0
+
+# Umbruch eines Absatzes wie textwrap.wrap(para, width, break_long_words=False, subsequent_indent=indent).
+# Zeilen werden direkt am letzten passenden Leerzeichen umbrochen. textwrap trennt zusätzlich nach Bindestrichen;
+# enthält das Wort am Zeilenende einen Bindestrich, übernimmt textwrap den Rest des Absatzes ab diesem Zeilenanfang.
+def _wrap(para, width, indent):
+    if "\t" in para or "  " in para or para[0] == " " or para[-1] == " ":
+        return wrap(para, width, break_long_words=False, subsequent_indent=indent)
+    lines = []
+    pos = 0
+    line_indent = ""
+    while True:
+        line_width = width - len(line_indent)
+        if len(para) - pos <= line_width:
+            lines.append(line_indent + para[pos:])
+            return lines
+        cut = para.rfind(" ", pos, pos + line_width + 1)
+        # Wort, das nicht mehr in die Zeile passt (bzw. allein länger als die Zeile ist)
+        word_start = pos if cut == -1 else cut + 1
+        word_end = para.find(" ", word_start)
+        if "-" in para[word_start:word_end if word_end != -1 else len(para)]:
+            return lines + wrap(para[pos:], width, break_long_words=False,
+                                initial_indent=line_indent, subsequent_indent=indent)
+        if cut == -1:
+            # Wort länger als die Zeile: es bleibt ungeteilt in einer eigenen Zeile
+            if word_end == -1:
+                lines.append(line_indent + para[pos:])
+                return lines
+            cut = word_end
+        lines.append(line_indent + para[pos:cut])
+        pos = cut + 1
+        line_indent = indent
+
+# Umbruch der Absätze wie html2text (HTML2Text.optwrap mit den Standardeinstellungen). Der Text wird stückweise
+# geschrieben; jede vollständige Zeile wird sofort umbrochen, so entsteht das Markdown nur einmal im Speicher.
+class _ParagraphWriter:
+    def __init__(self, width=BODY_WIDTH):
+        self.width = width
+        self.partial = []
+        self.result = []
+        self.newlines = 0
+
+    def write(self, text):
+        if "\n" not in text:
+            self.partial.append(text)
+            return
+        self.partial.append(text)
+        lines = "".join(self.partial).split("\n")
+        for para in lines[:-1]:
+            self._paragraph(para)
+        self.partial = [lines[-1]]
+
+    def _paragraph(self, para):
+        if para:
+            if not skipwrap(para, True, False, False):
+                indent = "    " if para.startswith("  * ") else "> " if para.startswith("> ") else ""
+                self.result.append("\n".join(_wrap(para, self.width, indent)))
+                if para.endswith("  "):
+                    self.result.append("  \n")
+                    self.newlines = 1
+                elif indent:
+                    self.result.append("\n")
+                    self.newlines = 1
+                else:
+                    self.result.append("\n\n")
+                    self.newlines = 2
+            elif not RE_SPACE.match(para):
+                self.result.append(para + "\n")
+                self.newlines = 1
+        elif self.newlines < 2:
+            self.result.append("\n")
+            self.newlines += 1
+
+    def getvalue(self):
+        self._paragraph("".join(self.partial))
+        self.partial = []
+        return "".join(self.result)
+
+# Text- und Tag-Ereignisse in Dokumentreihenfolge per lxml.iterparse. Text vor einem Kind (text des Elternelements
+# bzw. tail des vorigen Geschwisters) steht fest, sobald das Kind beginnt; bereits ausgegebene Geschwister werden
+# sofort aus dem Baum gelöscht, damit auch bei sehr langen Urteilen nie der ganze Baum im Speicher liegt.
+def _iter_events(html):
+    from lxml import etree
+
+    stack = []
+    content = io.BytesIO(html.encode("utf-8"))
+    for event, element in etree.iterparse(content, events=("start", "end", "comment", "pi"), html=True, encoding="utf-8"):
+        if event == "end":
+            parent, previous = stack.pop()
+            text = parent.text if previous is None else previous.tail
+            if text:
+                yield "text", text
+            del parent[:]
+            yield "end", parent
+            continue
+
+        if stack:
+            parent, previous = stack[-1]
+            text = parent.text if previous is None else previous.tail
+            if text:
+                yield "text", text
+            if previous is not None:
+                del parent[0]
+            stack[-1][1] = element
+        if event == "start":
+            stack.append([element, None])
+            yield "start", element
+
+def convert_with_lxml(html):
+    stream = _MarkdownStream()
+    if not html.strip():
+        # libxml2 meldet für ein leeres Dokument einen Fehler
+        return stream.finish()
+    for event, value in _iter_events(html):
+        if event == "text":
+            stream.data(value)
+        else:
+            stream.tag(value.tag.lower(), value, event == "start")
+    return stream.finish()
+
+MARKDOWN_BACKENDS = {
+    "lxml": convert_with_lxml,
+    "html2text": convert_with_html2text,
+}
+
+def convert(html, backend=DEFAULT_BACKEND):
+    if backend not in MARKDOWN_BACKENDS:
+        raise ValueError(f"Unbekanntes Markdown-Backend '{backend}'. Erlaubt: {', '.join(MARKDOWN_BACKENDS)}")
+    return MARKDOWN_BACKENDS[backend](html)
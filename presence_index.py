@@ -0,0 +1,84 @@
+import sys
+import time
+import pymysql
+from case_numbers import normalize_case_no, split_case_numbers
+
+# Import-Session-Cache: alle Urteile werden einmal zu Beginn gestreamt, danach beantworten die 2_*-Skripte
+# Fragen wie "gibt es diesen Fall schon?" lokal und schicken nur noch echte Schreibzugriffe an MySQL.
+class PresenceIndex:
+    def __init__(self):
+        # judgment_id -> (case_no, ecli, docid, date_decided, caselist_url)
+        self.records = {}
+        # normalisiertes Aktenzeichen -> Menge der judgment_ids (irgendeine Position in case_no)
+        self.by_case_no = {}
+        # normalisiertes erstes Aktenzeichen -> Menge der judgment_ids
+        self.by_primary_case_no = {}
+        self.build_seconds = 0.0
+
+    # Lädt alle Urteile über einen ungepufferten Cursor (SSCursor), damit nie alles gleichzeitig im Client liegt
+    @classmethod
+    def load(cls, conn):
+        index = cls()
+        start = time.perf_counter()
+        with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+            cursor.execute("SELECT id, case_no, ecli, docid, date_decided, caselist_url FROM Judgments ORDER BY id")
+            for judgment_id, case_no, ecli, docid, date_decided, caselist_url in cursor:
+                index._store(judgment_id, case_no, ecli, docid, date_decided, caselist_url)
+        index.build_seconds = time.perf_counter() - start
+        return index
+
+    def _store(self, judgment_id, case_no, ecli, docid, date_decided, caselist_url):
+        self.records[judgment_id] = (case_no, ecli, docid, date_decided, caselist_url)
+        for position, token in enumerate(split_case_numbers(case_no)):
+            self.by_case_no.setdefault(token, set()).add(judgment_id)
+            if position == 0:
+                self.by_primary_case_no.setdefault(token, set()).add(judgment_id)
+
+    # Entfernt nur diese judgment_id aus der Menge; andere Urteile mit demselben Aktenzeichen bleiben erhalten
+    @staticmethod
+    def _discard(mapping, token, judgment_id):
+        judgment_ids = mapping.get(token)
+        if judgment_ids is not None:
+            judgment_ids.discard(judgment_id)
+            if not judgment_ids:
+                del mapping[token]
+
+    # Nach einem INSERT oder UPDATE aufrufen, damit spätere Zeilen desselben Laufs den neuen Stand sehen
+    def upsert(self, judgment_id, case_no, ecli, docid, date_decided, caselist_url):
+        old = self.records.get(judgment_id)
+        if old is not None:
+            for position, token in enumerate(split_case_numbers(old[0])):
+                self._discard(self.by_case_no, token, judgment_id)
+                if position == 0:
+                    self._discard(self.by_primary_case_no, token, judgment_id)
+        self._store(judgment_id, case_no, ecli, docid, date_decided, caselist_url)
+
+    # Gibt es ein Urteil mit diesem Aktenzeichen (an beliebiger Position)?
+    def exists(self, case_no):
+        return normalize_case_no(case_no) in self.by_case_no
+
+    # Urteil, dessen case_no mit diesem Aktenzeichen beginnt: (id, case_no, ecli, docid, date_decided, caselist_url)
+    def find_primary(self, case_no):
+        judgment_ids = self.by_primary_case_no.get(normalize_case_no(case_no))
+        if not judgment_ids:
+            return None
+        # Bei mehreren Treffern gilt wie bisher das Urteil mit der niedrigsten ID
+        judgment_id = min(judgment_ids)
+        return (judgment_id,) + self.records[judgment_id]
+
+    # Geschätzter Speicherbedarf in Bytes (Dictionaries, Schlüssel, Tupel und deren Werte)
+    def memory_footprint(self):
+        total = sys.getsizeof(self.records) + sys.getsizeof(self.by_case_no) + sys.getsizeof(self.by_primary_case_no)
+        for judgment_id, record in self.records.items():
+            total += sys.getsizeof(judgment_id) + sys.getsizeof(record)
+            total += sum(sys.getsizeof(value) for value in record if value is not None)
+        # Die Tokens der beiden Aktenzeichen-Maps sind eigene String-Objekte, dazu je eine Menge von IDs
+        for mapping in (self.by_case_no, self.by_primary_case_no):
+            total += sum(sys.getsizeof(token) + sys.getsizeof(judgment_ids) for token, judgment_ids in mapping.items())
+        return total
+
+    def report(self):
+        print(
+            f"Presence-Index: {len(self.records)} Urteile, {len(self.by_case_no)} Aktenzeichen, "
+            f"{self.memory_footprint() / 1024 / 1024:.1f} MB, aufgebaut in {self.build_seconds:.2f} s"
+        )
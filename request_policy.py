@@ -0,0 +1,243 @@
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+
+# Gemeinsame Abrufregeln je Host (curia, EUR-Lex): ein Token-Bucket, dessen Rate sich nach Latenz und Fehlern
+# richtet (AIMD: additiv erhöhen, bei Überlast halbieren), Wiederholungen mit exponentiellem Backoff und Jitter
+# (Retry-After des Servers wird beachtet) und ein Circuit Breaker, der einen ausfallenden Host pausiert.
+INITIAL_RATE = 2.0  # Anfragen pro Sekunde je Host zu Beginn
+MIN_RATE = 0.2
+MAX_RATE = 20.0
+RATE_INCREASE = 0.5  # additive Erhöhung der Rate pro Sekunde erfolgreicher Anfragen
+RATE_DECREASE = 0.5  # Faktor bei Überlast (429, 5xx, Timeout oder zu langsame Antwort)
+SLOW_RESPONSE_SECONDS = 10.0  # langsamere Antworten gelten als Zeichen von Überlast
+
+# Statuscodes, die auf eine vorübergehende Störung hindeuten und wiederholt werden
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0  # Sekunden, verdoppelt sich je Versuch (Full Jitter)
+BACKOFF_MAX = 60.0
+
+# Nach so vielen Fehlern in Folge wird der Host pausiert; jede weitere gescheiterte Probeanfrage verdoppelt die Pause
+FAILURE_THRESHOLD = 5
+OPEN_SECONDS = 30.0
+MAX_OPEN_SECONDS = 600.0
+# Längste Wartezeit eines Aufrufers auf einen pausierten Host, danach gilt der Abruf als vorübergehend gescheitert
+MAX_WAIT_SECONDS = 120.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Vorübergehend gescheiterter Abruf (Wiederholungen erschöpft oder Host pausiert). Bewusst keine
+# requests.exceptions.RequestException, damit Aufrufer sie nicht wie einen endgültigen Fehler behandeln.
+class TransientError(Exception):
+    pass
+
+class CircuitOpenError(TransientError):
+    pass
+
+# Retry-After als Sekunden oder HTTP-Datum; None, wenn nicht vorhanden oder ungültig
+def parse_retry_after(value):
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Wartezeit vor dem nächsten Versuch: zufällig zwischen 0 und BACKOFF_BASE * 2^(Versuch-1), höchstens BACKOFF_MAX
+def backoff_delay(attempt, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+# Zustand eines Hosts: Token-Bucket, AIMD-Rate, Circuit Breaker und Zähler für den Bericht
+class HostState:
+    def __init__(self, host, rate=INITIAL_RATE):
+        self.host = host
+        self.condition = threading.Condition()
+        self.rate = rate
+        self.tokens = 1.0
+        self.refilled_at = time.monotonic()
+        self.latency = None  # gleitender Mittelwert der Antwortzeit (Sekunden)
+        self.decreased_at = 0.0
+        self.paused_until = 0.0  # aus Retry-After
+        self.state = CLOSED
+        self.failures = 0
+        self.open_seconds = OPEN_SECONDS
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.circuit_opened = 0
+
+    def _refill(self, now):
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    # Sekunden bis zur nächsten erlaubten Anfrage (0 = sofort)
+    def _wait_time(self, now):
+        if self.state == OPEN:
+            if now < self.open_until:
+                return self.open_until - now
+            print(f"{self.host}: Pause beendet, sende Probeanfrage.", file=sys.stderr)
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        if self.state == HALF_OPEN and self.probe_in_flight:
+            return 1.0  # bis die Probeanfrage entschieden ist (notify weckt vorher)
+        if self.paused_until > now:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens < 1.0:
+            return (1.0 - self.tokens) / self.rate
+        return 0.0
+
+    # Wartet auf ein Token; CircuitOpenError, wenn die nächste Anfrage erst nach max_wait möglich wäre.
+    # Mit probe=False (Aufrufer meldet kein Ergebnis zurück) wird keine Probeanfrage beansprucht, sonst bliebe
+    # der Host ohne record_success/record_failure/abandon dauerhaft halb offen.
+    def acquire(self, max_wait=MAX_WAIT_SECONDS, probe=True):
+        deadline = time.monotonic() + max_wait
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    break
+                if now + wait > deadline:
+                    raise CircuitOpenError(f"{self.host} ist pausiert oder ausgelastet (nächste Anfrage in {wait:.0f} Sekunden).")
+                self.condition.wait(wait)
+            self.tokens -= 1.0
+            self.requests += 1
+            if self.state == HALF_OPEN and probe:
+                self.probe_in_flight = True
+
+    # Multiplikative Verringerung höchstens einmal je Antwortzeit, damit gleichzeitige Fehler derselben
+    # Überlast die Rate nicht mehrfach halbieren
+    def _decrease(self, now):
+        if now - self.decreased_at >= (self.latency or 1.0):
+            self.rate = max(MIN_RATE, self.rate * RATE_DECREASE)
+            self.decreased_at = now
+
+    def record_success(self, latency):
+        with self.condition:
+            now = time.monotonic()
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.failures = 0
+            if self.state != CLOSED:
+                print(f"{self.host}: Probeanfrage erfolgreich, Host wieder freigegeben.", file=sys.stderr)
+                self.state = CLOSED
+                self.open_seconds = OPEN_SECONDS
+            if latency > SLOW_RESPONSE_SECONDS:
+                self._decrease(now)
+            else:
+                self.rate = min(MAX_RATE, self.rate + RATE_INCREASE / self.rate)
+            self.condition.notify_all()
+
+    def record_failure(self, retry_after=None):
+        with self.condition:
+            now = time.monotonic()
+            self.errors += 1
+            self.failures += 1
+            self._decrease(now)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if self.state == HALF_OPEN:
+                self.open_seconds = min(MAX_OPEN_SECONDS, self.open_seconds * 2)
+                self._open(now)
+            elif self.state == CLOSED and self.failures >= FAILURE_THRESHOLD:
+                self._open(now)
+            self.condition.notify_all()
+
+    # Anfrage ohne Bewertung beendet (z. B. ungültige URL): eine offene Probeanfrage wieder freigeben
+    def abandon(self):
+        with self.condition:
+            if self.state == HALF_OPEN:
+                self.probe_in_flight = False
+            self.condition.notify_all()
+
+    def _open(self, now):
+        print(f"{self.host}: {self.failures} Fehler in Folge, pausiere für {self.open_seconds:.0f} Sekunden.", file=sys.stderr)
+        self.state = OPEN
+        self.open_until = now + self.open_seconds
+        self.probe_in_flight = False
+        self.circuit_opened += 1
+
+class RequestPolicy:
+    def __init__(self, max_attempts=MAX_ATTEMPTS, max_wait=MAX_WAIT_SECONDS):
+        self.max_attempts = max_attempts
+        self.max_wait = max_wait
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def host(self, url):
+        netloc = urlparse(url).netloc.lower()
+        with self.lock:
+            if netloc not in self.hosts:
+                self.hosts[netloc] = HostState(netloc)
+            return self.hosts[netloc]
+
+    # Nur Ratenbegrenzung und Pause, z. B. vor einem Seitenaufruf im Browser; ohne Rückmeldung des Ergebnisses,
+    # daher nie als Probeanfrage des Circuit Breakers
+    def acquire(self, url):
+        self.host(url).acquire(self.max_wait, probe=False)
+
+    # Führt send() (eine Anfrage an url, liefert eine requests.Response) nach den Regeln des Hosts aus.
+    # Antworten mit anderem Status als RETRY_STATUS_CODES werden unverändert zurückgegeben, nach erschöpften
+    # Wiederholungen folgt eine TransientError.
+    def request(self, url, send):
+        state = self.host(url)
+        for attempt in range(1, self.max_attempts + 1):
+            state.acquire(self.max_wait)
+            start = time.monotonic()
+            try:
+                response = send()
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                reason = f"{type(e).__name__}: {e}"
+                state.record_failure()
+            except BaseException:
+                state.abandon()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    state.record_success(time.monotonic() - start)
+                    return response
+                reason = f"Statuscode {response.status_code}"
+                # Retry-After pausiert den ganzen Host, acquire wartet beim nächsten Versuch entsprechend
+                state.record_failure(parse_retry_after(response.headers.get("Retry-After")))
+                response.close()
+
+            if attempt < self.max_attempts:
+                delay = backoff_delay(attempt)
+                print(f"{url}: {reason}, Versuch {attempt}/{self.max_attempts}, nächster in {delay:.1f} Sekunden.", file=sys.stderr)
+                with state.condition:
+                    state.retries += 1
+                time.sleep(delay)
+        raise TransientError(f"{url}: {reason} nach {self.max_attempts} Versuchen.")
+
+    def report(self):
+        with self.lock:
+            hosts = list(self.hosts.values())
+        for state in hosts:
+            print(
+                f"{state.host}: {state.requests} Anfragen, {state.retries} Wiederholungen, {state.errors} Fehler, "
+                f"{state.circuit_opened}x pausiert, Rate zuletzt {state.rate:.2f}/s ({state.state})",
+                file=sys.stderr,
+            )
+
+_default_policy = None
+_default_policy_lock = threading.Lock()
+
+# Gemeinsame Instanz je Prozess, damit alle Fetcher und Worker dieselben Host-Grenzen teilen
+def get_request_policy():
+    global _default_policy
+    with _default_policy_lock:
+        if _default_policy is None:
+            _default_policy = RequestPolicy()
+        return _default_policy
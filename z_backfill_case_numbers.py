@@ -0,0 +1,10 @@
+from settings import get_mysql_connection
+from case_numbers import backfill_case_numbers
+
+# One-shot backfill of the judgment_case_numbers index table from Judgments.case_no
+if __name__ == "__main__":
+    conn = get_mysql_connection()
+    try:
+        backfill_case_numbers(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,61 @@
+import sys
+import time
+import tracemalloc
+from caselist_parser import iter_caselist_rows, PARSER_BACKENDS
+
+# Kleine Tabelle mit Nicht-ASCII-Text und ohne <meta charset>, damit jedes Backend den Zeichensatz korrekt übernimmt
+NON_ASCII_ROWS = (
+    '<html><body><table>'
+    '<tr><td><a href="/juris/liste.jsf?num=C-1/20">C-1/20</a></td><td>Société Générale – Kommission</td></tr>'
+    '<tr><td>T-2/21</td><td>Müller ./. Österreich</td></tr>'
+    '</table></body></html>'
+)
+
+# Vergleicht alle Backends bei str- und UTF-8-Eingabe mit dem erwarteten Text; False bei Abweichung
+def check_non_ascii():
+    ok = True
+    for backend in PARSER_BACKENDS:
+        for content, encoding in ((NON_ASCII_ROWS, None), (NON_ASCII_ROWS.encode("utf-8"), "utf-8")):
+            rows = list(iter_caselist_rows(content, backend, encoding))
+            texts = [cell.stripped_text for row in rows for cell in row]
+            if texts != ["C-1/20", "Société Générale – Kommission", "T-2/21", "Müller ./. Österreich"]:
+                print(f"{backend} ({type(content).__name__}): Nicht-ASCII-Text ABWEICHEND: {texts}")
+                ok = False
+    return ok
+
+# Benchmark der Caselist-Parser gegen eine gespeicherte Kopie von c2_juris.htm (oder c1.htm)
+# Aufruf: python3 z_bench_caselist_parser.py <pfad/zu/c2_juris.htm> [wiederholungen]
+def benchmark_parsers(html_file, repeat=3):
+    with open(html_file, "rb") as f:
+        content = f.read()
+    print(f"Datei: {html_file} ({len(content) / 1024 / 1024:.1f} MB)")
+
+    if not check_non_ascii():
+        sys.exit(1)
+
+    reference = list(iter_caselist_rows(content, "html.parser", "utf-8"))
+    print(f"Referenz (html.parser): {len(reference)} Zeilen\n")
+
+    # tracemalloc misst nur den Python-Heap; Speicher von libxml2 (lxml) ist darin nicht enthalten
+    print(f"{'Parser':<12} {'beste Zeit (s)':>15} {'Python-Heap-Peak (MB)':>22} {'identisch':>10}")
+    for backend in PARSER_BACKENDS:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = list(iter_caselist_rows(content, backend, "utf-8"))
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        for _ in iter_caselist_rows(content, backend, "utf-8"):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        identical = "ja" if rows == reference else "NEIN"
+        print(f"{backend:<12} {min(timings):>15.3f} {peak / 1024 / 1024:>22.1f} {identical:>10}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 z_bench_caselist_parser.py <c2_juris.htm> [repeat]")
+        sys.exit(1)
+    benchmark_parsers(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 3)
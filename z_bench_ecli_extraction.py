@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+from ecli_resolver import scan_ecli, extract_ecli_dom, CHUNK_SIZE
+
+# Benchmark: schneller Byte-Scan (mit Abbruch beim Treffer) gegen vollständigen DOM-Aufbau
+# Aufruf: python3 z_bench_ecli_extraction.py <verzeichnis/mit/gespeicherten/fallseiten> [wiederholungen]
+def iter_chunks(content):
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield content[start:start + CHUNK_SIZE]
+
+# Schneidet die Seite an jeder Position innerhalb von "ECLI identifier: ..." in zwei Chunks; gibt die Schnitte zurück,
+# bei denen der schnelle Weg nicht die erwartete ECLI liefert (z. B. eine abgeschnittene Ordnungsnummer)
+def check_chunk_boundaries(content, expected_ecli):
+    start = content.find(b"ECLI identifier:")
+    if start == -1 or not expected_ecli:
+        return []
+    end = content.find(expected_ecli.encode("ascii"), start) + len(expected_ecli) + 2
+    return [cut for cut in range(start + 1, min(end, len(content)))
+            if scan_ecli([content[:cut], content[cut:]])[0] != expected_ecli]
+
+def benchmark_extraction(directory, repeat=5):
+    files = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith((".htm", ".html")))
+    if not files:
+        print(f"Keine HTML-Dateien in {directory} gefunden.")
+        return
+
+    dom_seconds = fast_seconds = 0.0
+    total_bytes = read_bytes = 0
+    fast_hits = mismatches = boundary_errors = 0
+    for path in files:
+        with open(path, "rb") as f:
+            content = f.read()
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            dom_ecli = extract_ecli_dom(content)
+        dom_seconds += (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fast_ecli, consumed = scan_ecli(iter_chunks(content))
+            found_fast = fast_ecli is not None
+            if not found_fast:
+                fast_ecli = extract_ecli_dom(consumed)
+        fast_seconds += (time.perf_counter() - start) / repeat
+
+        fast_hits += found_fast
+
+        total_bytes += len(content)
+        read_bytes += len(consumed)
+        if fast_ecli != dom_ecli:
+            mismatches += 1
+            print(f"Abweichung in {path}: schnell={fast_ecli!r}, DOM={dom_ecli!r}")
+
+        bad_cuts = check_chunk_boundaries(content, dom_ecli)
+        if bad_cuts:
+            boundary_errors += 1
+            print(f"Chunkgrenze in {path} bei Byte {bad_cuts[0]}: {scan_ecli([content[:bad_cuts[0]], content[bad_cuts[0]:]])[0]!r}")
+
+    print(f"Seiten: {len(files)}, Treffer im schnellen Weg: {fast_hits}, Abweichungen: {mismatches}, "
+          f"Fehler an Chunkgrenzen: {boundary_errors}")
+    print(f"DOM:     {dom_seconds * 1000 / len(files):8.2f} ms/Seite, {total_bytes / len(files) / 1024:8.1f} KB/Seite gelesen")
+    print(f"Schnell: {fast_seconds * 1000 / len(files):8.2f} ms/Seite, {read_bytes / len(files) / 1024:8.1f} KB/Seite gelesen")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 z_bench_ecli_extraction.py <directory> [repeat]")
+        sys.exit(1)
+    benchmark_extraction(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 5)
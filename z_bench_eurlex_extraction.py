@@ -0,0 +1,73 @@
+import gzip
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+from http_cache import HTTP_CACHE_DIRECTORY
+from judgment_fetcher import first_lines, text_from_element_onwards
+
+# Benchmark der Urteilsextraktion ab <a id="judgment"> auf den größten EUR-Lex-Seiten:
+# bisherige Variante (alle folgenden Elemente serialisieren und neu parsen) gegen den einmaligen Durchlauf.
+# Aufruf: python3 z_bench_eurlex_extraction.py [verzeichnis/mit/html] [anzahl]
+# Ohne Verzeichnis werden die gespeicherten Seiten aus dem HTTP-Cache verwendet.
+
+def load_pages(directory, count):
+    pages = []
+    if directory:
+        for name in os.listdir(directory):
+            if name.endswith((".htm", ".html")):
+                with open(os.path.join(directory, name), "rb") as f:
+                    pages.append((name, f.read()))
+    else:
+        for root, _, files in os.walk(os.path.join(HTTP_CACHE_DIRECTORY, "bodies")):
+            for name in files:
+                with gzip.open(os.path.join(root, name), "rb") as f:
+                    pages.append((name, f.read()))
+    pages = [(name, content) for name, content in pages if b'id="judgment"' in content]
+    pages.sort(key=lambda page: len(page[1]), reverse=True)
+    return pages[:count]
+
+def old_extraction(judgment_parent):
+    judgment_content = ''.join([str(judgment_parent)] + [str(element) for element in judgment_parent.find_all_next()])
+    return BeautifulSoup(judgment_content, 'html.parser').get_text(separator='\n').strip()
+
+def benchmark(directory=None, count=10):
+    pages = load_pages(directory, count)
+    if not pages:
+        print("Keine EUR-Lex-Seiten mit <a id=\"judgment\"> gefunden.")
+        return
+
+    print(f"{'Seite':<40} {'KB':>8} {'alt (s)':>9} {'neu (s)':>9} {'Zeichen alt':>12} {'Zeichen neu':>12}")
+    for name, content in pages:
+        soup = BeautifulSoup(content, 'html.parser')
+        judgment_parent = soup.find('a', id='judgment').find_parent()
+
+        start = time.perf_counter()
+        old_text = old_extraction(judgment_parent)
+        old_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new_text = text_from_element_onwards(judgment_parent)
+        new_seconds = time.perf_counter() - start
+
+        # Die alte Variante enthält jeden Text mehrfach; jede Zeile des neuen Texts muss darin vorkommen
+        old_lines = set(old_text.split('\n'))
+        missing = sum(1 for line in new_text.split('\n') if line not in old_lines)
+        print(f"{name[:40]:<40} {len(content) / 1024:8.0f} {old_seconds:9.3f} {new_seconds:9.3f} "
+              f"{len(old_text):12} {len(new_text):12}" + (f"  ({missing} Zeilen fehlen in alt!)" if missing else ""))
+
+        full_text = soup.get_text(separator='\n').strip()
+        start = time.perf_counter()
+        for _ in range(100):
+            '\n'.join(full_text.split('\n')[:30])
+        split_seconds = (time.perf_counter() - start) / 100
+        start = time.perf_counter()
+        for _ in range(100):
+            first_lines(full_text, 30)
+        first_lines_seconds = (time.perf_counter() - start) / 100
+        print(f"{'':<40} erste 30 Zeilen: split {split_seconds * 1000:.3f} ms, first_lines {first_lines_seconds * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    benchmark(directory, count)
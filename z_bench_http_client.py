@@ -0,0 +1,139 @@
+import gzip
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from http_client import BROWSER_HEADERS, create_session
+
+# Benchmark: Latenz je Anfrage mit einzelnen requests.get-Aufrufen wie bisher (neue Verbindung je Abruf)
+# gegen die gemeinsame Session aus http_client (Keep-Alive-Pool).  Beide senden "Accept-Encoding: gzip"
+# (requests tut das von sich aus), br kommt nur mit installiertem brotli hinzu. Ein lokaler Ersatzserver liefert
+# curia- und EUR-Lex-Seiten aus und simuliert Netzlaufzeit (RTT), Verbindungsaufbau (TCP + TLS) und Bandbreite.
+# Aufruf: python3 z_bench_http_client.py [anzahl] [threads] [rtt_ms] [mbit_s]
+# Die Seiten kommen aus dem HTML-Archiv (html_archive), ohne Archiv werden Seiten ähnlicher Größe erzeugt.
+HANDSHAKE_ROUND_TRIPS = 3  # TCP (1) und TLS 1.2 (2)
+
+# Beispielseiten (Pfad, Bytes): echte Seiten aus dem Archiv oder erzeugte Seiten
+def load_pages(count=20):
+    from html_archive import ARCHIVE_DIRECTORY, load_index, read_page
+
+    pages = []
+    seen = set()
+    for entry in load_index(ARCHIVE_DIRECTORY):
+        if entry["sha256"] in seen:
+            continue
+        seen.add(entry["sha256"])
+        pages.append((f"/{entry['kind']}/{entry['sha256']}", read_page(entry, ARCHIVE_DIRECTORY)))
+        if len(pages) >= count:
+            break
+    if pages:
+        return pages
+
+    # Zufällige Sätze aus einem kleinen Wortschatz, damit gzip ähnlich wie bei echten Urteilen komprimiert
+    words = ("Klägerin Kommission Beschluss Gerichtshof Rechtssache Verordnung Artikel Absatz Mitgliedstaat "
+             "Urteil Auslegung Vorabentscheidung Richtlinie nichtig erklären betrifft gemäß daher jedoch").split()
+    generator = random.Random(0)
+    for number in range(count):
+        body = "".join(
+            f"<p class=\"normal\">{generator.randint(1, 200)}. "
+            f"{' '.join(generator.choice(words) for _ in range(generator.randint(20, 60)))}.</p>\n"
+            for _ in range(150 + 15 * number)
+        )
+        if number % 2:
+            pages.append((f"/juris/document/document.jsf?docid={number}",
+                          f"<html><body><div id=\"document_content\">{body}</div></body></html>".encode("utf-8")))
+        else:
+            pages.append((f"/legal-content/DE/TXT/HTML/?uri=CELEX:6202{number}CJ0001",
+                          f"<html><body><p>URTEIL DES GERICHTSHOFS</p>{body}</body></html>".encode("utf-8")))
+    return pages
+
+# Ersatzserver: eine Antwort kostet eine RTT plus Übertragungszeit, eine neue Verbindung zusätzlich den Handshake
+def start_server(pages, rtt, bandwidth):
+    bodies = {path: (content, gzip.compress(content)) for path, content in pages}
+    stats = {"connections": 0, "bytes": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Header und Body gehen getrennt raus, ohne TCP_NODELAY käme bei Keep-Alive das verzögerte ACK dazu
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+            time.sleep(HANDSHAKE_ROUND_TRIPS * rtt)
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            content, compressed = bodies.get(self.path, (b"", b""))
+            use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+            body = compressed if use_gzip else content
+            time.sleep(rtt + len(body) / bandwidth)
+            self.send_response(200 if content else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                stats["bytes"] += len(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+def run(base_url, paths, fetch, threads):
+    def timed(path):
+        start = time.perf_counter()
+        response = fetch(base_url + path)
+        assert response.status_code == 200 and response.content
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(timed, paths))
+    return latencies, time.perf_counter() - start
+
+def benchmark(count=200, threads=4, rtt_ms=20.0, mbit_s=50.0):
+    pages = load_pages()
+    rtt = rtt_ms / 1000
+    server, stats = start_server(pages, rtt, mbit_s * 1_000_000 / 8)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    paths = [pages[number % len(pages)][0] for number in range(count)]
+    print(f"{count} Abrufe über {threads} Threads, {len(pages)} Seiten, RTT {rtt_ms:.0f} ms, {mbit_s:.0f} Mbit/s\n")
+
+    session = create_session()
+    variants = [
+        # Bisher: jeder Abruf mit eigenen Headern über das Modul requests (neue Verbindung je Abruf)
+        ("requests.get je Abruf", lambda url: requests.get(url, headers=BROWSER_HEADERS, timeout=60)),
+        ("gemeinsame Session", lambda url: session.get(url)),
+    ]
+    print(f"{'Variante':<24} {'Mittel (ms)':>12} {'p50 (ms)':>10} {'p95 (ms)':>10} {'gesamt (s)':>11} {'Verb.':>6} {'MB übertragen':>14}")
+    baseline = None
+    for name, fetch in variants:
+        stats.update(connections=0, bytes=0)
+        latencies, total = run(base_url, paths, fetch, threads)
+        mean = statistics.mean(latencies) * 1000
+        p95 = statistics.quantiles(latencies, n=20)[18] * 1000
+        print(f"{name:<24} {mean:>12.1f} {statistics.median(latencies) * 1000:>10.1f} {p95:>10.1f} {total:>11.2f} "
+              f"{stats['connections']:>6} {stats['bytes'] / 1024 / 1024:>14.2f}")
+        baseline = baseline or mean
+    print(f"\nGesparte Latenz je Anfrage: {baseline - mean:.1f} ms ({(1 - mean / baseline) * 100:.0f} %)")
+    session.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    rtt_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+    mbit_s = float(sys.argv[4]) if len(sys.argv) > 4 else 50.0
+    benchmark(count, threads, rtt_ms, mbit_s)
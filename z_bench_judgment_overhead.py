@@ -0,0 +1,40 @@
+import statistics
+import subprocess
+import sys
+import time
+
+# Misst den festen Aufwand je Urteil: Subprozess mit 3_1_get_judgement.py (Interpreterstart, Importe von
+# selenium/bs4/html2text, Pipe) gegen den Aufruf von judgment_fetcher.fetch_judgment im selben Prozess.
+# Die URL hat absichtlich eine nicht unterstützte Domain, damit kein Netzwerk und kein Browser mitgemessen wird.
+# Aufruf: python3 z_bench_judgment_overhead.py [anzahl]
+URL = "https://example.invalid/judgment"
+
+def time_subprocess(count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "3_1_get_judgement.py", URL, "German"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def time_in_process(count):
+    start = time.perf_counter()
+    from judgment_fetcher import fetch_judgment
+    import_seconds = time.perf_counter() - start
+
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fetch_judgment(URL, "German")
+        timings.append(time.perf_counter() - start)
+    return import_seconds, timings
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    subprocess_timings = time_subprocess(count)
+    import_seconds, in_process_timings = time_in_process(count)
+
+    print(f"Subprozess:   {statistics.median(subprocess_timings) * 1000:10.2f} ms/Urteil (Median über {count})")
+    print(f"Im Prozess:   {statistics.median(in_process_timings) * 1000:10.2f} ms/Urteil (Median über {count}), "
+          f"einmaliger Import {import_seconds * 1000:.0f} ms")
@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import sys
+import time
+from markdown_converter import convert, MARKDOWN_BACKENDS
+
+# Vergleich der Markdown-Backends auf echten curia- und EUR-Lex-Dokumenten: identische Ausgabe zur Referenz
+# html2text, Durchsatz und Spitzen-RSS (je Backend in einem frischen Prozess, inklusive Speicher von libxml2).
+# Aufruf: python3 z_bench_markdown_conversion.py [verzeichnis/mit/html | archiv] [anzahl] [wiederholungen]
+# Ohne Verzeichnis werden die mitgelieferten Seiten aus markdown_fixtures verwendet, mit "archiv" die Seiten aus
+# dem HTML-Archiv (html_archive). Weicht ein Backend bei einem Dokument von der Referenz ab, endet das Skript mit 1.
+REFERENCE_BACKEND = "html2text"
+FIXTURE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "markdown_fixtures")
+ARCHIVE_SOURCE = "archiv"
+
+# Eingabe des Konverters wie im Abruf: das div 'document_content' (curia) bzw. der Text ab dem Urteil (EUR-Lex)
+def converter_input(kind, html, language="German"):
+    from judgment_fetcher import parse_document_content, parse_eurlex_document, CURIA_DOCUMENT
+
+    if kind == CURIA_DOCUMENT:
+        document_content, _ = parse_document_content(html)
+        return str(document_content) if document_content else None
+    document_text, _ = parse_eurlex_document(html, language)
+    return document_text
+
+# judgment_fetcher (Selenium, BeautifulSoup) wird erst hier importiert, damit die Messprozesse schlank bleiben
+def load_documents(directory, count):
+    from html_archive import ARCHIVE_DIRECTORY, load_index, read_page
+    from judgment_fetcher import CURIA_DOCUMENT, EURLEX_DOCUMENT
+
+    pages = []
+    if directory != ARCHIVE_SOURCE:
+        for name in sorted(os.listdir(directory)):
+            if name.endswith((".htm", ".html")):
+                with open(os.path.join(directory, name), "rb") as f:
+                    content = f.read()
+                kind = CURIA_DOCUMENT if b'id="document_content"' in content else EURLEX_DOCUMENT
+                pages.append((name, kind, content.decode("utf-8", errors="replace"), "German"))
+    else:
+        seen = set()
+        for entry in load_index(ARCHIVE_DIRECTORY):
+            if entry["sha256"] in seen:
+                continue
+            seen.add(entry["sha256"])
+            content = read_page(entry, ARCHIVE_DIRECTORY)
+            pages.append((entry["url"], entry["kind"], content.decode(entry.get("encoding") or "utf-8", errors="replace"),
+                          entry["language"]))
+
+    pages.sort(key=lambda page: len(page[2]), reverse=True)
+    documents = []
+    for name, kind, html, language in pages:
+        document = converter_input(kind, html, language)
+        if document:
+            documents.append((name, kind, document))
+        if len(documents) >= count:
+            break
+    return documents
+
+# Wert einer Zeile aus /proc/self/status in KB (VmRSS = aktueller RSS, VmHWM = Höchststand)
+def proc_status(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+# Läuft in einem eigenen Prozess, damit der Speicher nur diesem Backend zugerechnet wird. Der Höchststand wird
+# nach dem Laden der Dokumente über /proc/self/clear_refs zurückgesetzt (ru_maxrss würde den des Elternprozesses
+# erben); Ergebnis ist der Anstieg des Höchststands über den RSS davor, in MB
+def measure_peak_rss(backend, documents):
+    convert("<p>Start</p>", backend)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    before = proc_status("VmRSS")
+    for document in documents:
+        convert(document, backend)
+    return (proc_status("VmHWM") - before) / 1024
+
+def first_difference(expected, actual):
+    for number, (expected_line, actual_line) in enumerate(zip(expected.split("\n"), actual.split("\n")), start=1):
+        if expected_line != actual_line:
+            return f"Zeile {number}: {expected_line[:60]!r} / {actual_line[:60]!r}"
+    return "unterschiedliche Länge"
+
+# Gibt False zurück, wenn kein Dokument gefunden wurde oder ein Backend von der Referenz abweicht
+def benchmark(directory=FIXTURE_DIRECTORY, count=20, repeat=3):
+    documents = load_documents(directory, count)
+    if not documents:
+        print("Keine curia- oder EUR-Lex-Dokumente gefunden.")
+        return False
+    total_mb = sum(len(document.encode("utf-8")) for _, _, document in documents) / 1024 / 1024
+    print(f"{len(documents)} Dokumente, {total_mb:.1f} MB Eingabe\n")
+
+    # Ausgabe-Äquivalenz: identisch, bis auf Leerraum gleich oder abweichend
+    print(f"{'Dokument':<50} {'Art':<16} {'KB':>7}  Ergebnis")
+    differing = 0
+    for name, kind, document in documents:
+        expected = convert(document, REFERENCE_BACKEND)
+        results = []
+        for backend in MARKDOWN_BACKENDS:
+            if backend == REFERENCE_BACKEND:
+                continue
+            actual = convert(document, backend)
+            if actual == expected:
+                results.append(f"{backend}: identisch")
+            elif actual.split() == expected.split():
+                results.append(f"{backend}: bis auf Leerraum gleich")
+            else:
+                results.append(f"{backend}: ABWEICHEND ({first_difference(expected, actual)})")
+                differing += 1
+        print(f"{name[-50:]:<50} {kind:<16} {len(document) / 1024:7.0f}  {', '.join(results)}")
+
+    print(f"\n{'Backend':<12} {'beste Zeit (s)':>15} {'MB/s':>8} {'RSS-Spitze (MB)':>16}")
+    context = multiprocessing.get_context("spawn")
+    for backend in MARKDOWN_BACKENDS:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _, _, document in documents:
+                convert(document, backend)
+            timings.append(time.perf_counter() - start)
+        with context.Pool(1) as pool:
+            peak_rss = pool.apply(measure_peak_rss, (backend, [document for _, _, document in documents]))
+        print(f"{backend:<12} {min(timings):>15.3f} {total_mb / min(timings):>8.2f} {peak_rss:>16.1f}")
+
+    if differing:
+        print(f"\n{differing} Abweichung(en) von {REFERENCE_BACKEND}.")
+    return not differing
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else FIXTURE_DIRECTORY
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    if not benchmark(directory, count, repeat):
+        sys.exit(1)
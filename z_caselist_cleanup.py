@@ -1,5 +1,7 @@
 import os
 from datetime import datetime
+from caselist_store import apply_retention, C2_SNAPSHOT_DIRECTORY, C1_SNAPSHOT_DIRECTORY
+from http_cache import get_http_cache, HTTP_CACHE_DIRECTORY
 
 # Function to clean up old files in the 'caselist_csv' folder
 def cleanup_old_files(directory, max_files=60):
@@ -24,6 +26,16 @@ def cleanup_old_files(directory, max_files=60):
 
     print(f"{files_to_delete} old files have been deleted. Now there are {len(files) - files_to_delete} files remaining.")
 
-# Example usage
+# Snapshot stores apply their retention on every write; this also trims them after changing max_files
+for snapshot_directory in (C2_SNAPSHOT_DIRECTORY, C1_SNAPSHOT_DIRECTORY):
+    deleted = apply_retention(snapshot_directory, max_snapshots=60)
+    print(f"{snapshot_directory}: {deleted} old snapshot(s) deleted.")
+
+# Legacy dated CSVs written before the snapshot store
 directory = "caselist_csv"  # Directory to clean up
-cleanup_old_files(directory, max_files=60)
+if os.path.isdir(directory):
+    cleanup_old_files(directory, max_files=60)
+
+# Drop HTTP cache entries that have not been fetched or revalidated for 30 days
+removed = get_http_cache().prune(max_age=30 * 24 * 3600)
+print(f"{HTTP_CACHE_DIRECTORY}: {removed} stale cache entr{'y' if removed == 1 else 'ies'} deleted.")